@@ -49,26 +49,17 @@ export default function DashboardScreen() {
 
       const companyId = companiesData.companies[0].id;
 
-      const [campaigns, buyers, reports, products] = await Promise.all([
-        fetch(`/api/campaigns?company_id=${companyId}`).then((res) =>
-          res.json(),
-        ),
-        fetch(`/api/potential-buyers?company_id=${companyId}`).then((res) =>
-          res.json(),
-        ),
-        fetch(`/api/market-reports?company_id=${companyId}`).then((res) =>
-          res.json(),
-        ),
-        fetch(`/api/products?company_id=${companyId}`).then((res) =>
-          res.json(),
-        ),
-      ]);
+      // List endpoints return one page at a time, so the counts come from
+      // the summary's totals rather than list lengths.
+      const summary = await fetch(
+        `/api/dashboard/summary?company_id=${companyId}&limit=1`,
+      ).then((res) => res.json());
 
       return {
-        campaigns: campaigns.campaigns?.length || 0,
-        buyers: buyers.buyers?.length || 0,
-        reports: reports.reports?.length || 0,
-        products: products.products?.length || 0,
+        campaigns: summary.campaigns?.total || 0,
+        buyers: summary.buyers?.total || 0,
+        reports: summary.reports?.total || 0,
+        products: summary.products?.total || 0,
       };
     },
     enabled: !!companiesData?.companies?.[0],
@@ -4,6 +4,7 @@ import { fileURLToPath } from 'node:url';
 import { Hono } from 'hono';
 import type { Handler } from 'hono/types';
 import updatedFetch from '../src/__create/fetch';
+import { withTiming } from '../src/app/api/utils/timing';
 
 const API_BASENAME = '/api';
 const api = new Hono();
@@ -89,15 +90,19 @@ async function registerRoutes() {
           if (route[method]) {
             const parts = getHonoPath(routeFile);
             const honoPath = `/${parts.map(({ pattern }) => pattern).join('/')}`;
+            // Timings are recorded per route pattern, e.g. "GET /api/jobs/:id"
+            const timingName = `${method} ${API_BASENAME}${honoPath}`;
             const handler: Handler = async (c) => {
               const params = c.req.param();
               if (import.meta.env.DEV) {
                 const updatedRoute = await import(
                   /* @vite-ignore */ `${routeFile}?update=${Date.now()}`
                 );
-                return await updatedRoute[method](c.req.raw, { params });
+                return await withTiming(timingName, () =>
+                  updatedRoute[method](c.req.raw, { params })
+                );
               }
-              return await route[method](c.req.raw, { params });
+              return await withTiming(timingName, () => route[method](c.req.raw, { params }));
             };
             const methodLowercase = method.toLowerCase();
             switch (methodLowercase) {
@@ -0,0 +1,166 @@
+import { AdmissionError } from "@/app/api/utils/admission";
+import {
+  generatePrediction,
+  insertPredictions,
+  predictionGenerators,
+} from "@/app/api/utils/ai-predictions";
+import { mapConcurrent } from "@/app/api/utils/concurrency";
+import { NDJSON_CONTENT_TYPE, toReadableStream } from "@/app/api/utils/ndjson";
+
+const MAX_BATCH_SIZE = 50;
+const DEFAULT_CONCURRENCY = parseInt(process.env.AI_BATCH_CONCURRENCY) || 4;
+const MAX_CONCURRENCY = 16;
+
+// Expand `{ prediction_types, periods, ...shared }` into one spec per
+// type × period pair; explicit `predictions` entries inherit the shared fields.
+const expandSpecs = (body) => {
+  const {
+    predictions,
+    prediction_types,
+    periods,
+    company_id,
+    concurrency,
+    ...shared
+  } = body;
+
+  if (Array.isArray(predictions)) {
+    return predictions.map((spec) => ({ ...shared, ...spec }));
+  }
+  if (Array.isArray(prediction_types) && Array.isArray(periods)) {
+    return prediction_types.flatMap((prediction_type) =>
+      periods.map((period) => ({ ...shared, prediction_type, period })),
+    );
+  }
+  return null;
+};
+
+const validateSpec = (spec) => {
+  if (!spec.prediction_type || !spec.period) {
+    return "prediction type and period are required";
+  }
+  if (!Object.hasOwn(predictionGenerators, spec.prediction_type)) {
+    return "Invalid prediction type";
+  }
+  return null;
+};
+
+// Generate a set of predictions for one company. Generations run with bounded
+// concurrency and each result is streamed back as an NDJSON line as soon as
+// it is ready; the successful ones are then saved with one multi-row INSERT
+// and a final summary line carries the stored rows.
+export async function POST(request) {
+  let body;
+  try {
+    body = await request.json();
+  } catch {
+    return Response.json({ error: "Invalid JSON body" }, { status: 400 });
+  }
+
+  const companyId = body.company_id;
+  const specs = expandSpecs(body);
+  if (!companyId || !specs) {
+    return Response.json(
+      {
+        error:
+          "Company ID and either predictions or prediction_types and periods are required",
+      },
+      { status: 400 },
+    );
+  }
+  if (specs.length === 0 || specs.length > MAX_BATCH_SIZE) {
+    return Response.json(
+      { error: `A batch must contain 1 to ${MAX_BATCH_SIZE} predictions` },
+      { status: 400 },
+    );
+  }
+  const invalid = specs
+    .map((spec, index) => ({ index, error: validateSpec(spec) }))
+    .filter(({ error }) => error);
+  if (invalid.length > 0) {
+    return Response.json(
+      { error: "Invalid prediction specs", details: invalid },
+      { status: 400 },
+    );
+  }
+
+  const concurrency = Math.min(
+    Math.max(parseInt(body.concurrency) || DEFAULT_CONCURRENCY, 1),
+    MAX_CONCURRENCY,
+  );
+
+  async function* run() {
+    const started = Date.now();
+    const generated = [];
+    let failed = 0;
+
+    for await (const { index, value, error } of mapConcurrent(
+      specs,
+      concurrency,
+      (spec) => generatePrediction(spec.prediction_type, spec, companyId),
+    )) {
+      const spec = specs[index];
+      if (error) {
+        failed += 1;
+        if (error instanceof AdmissionError) {
+          yield {
+            type: "error",
+            index,
+            prediction_type: spec.prediction_type,
+            period: spec.period,
+            error: error.message,
+            retry_after: error.retryAfter,
+          };
+          continue;
+        }
+        console.error("Error generating batch prediction:", error);
+        yield {
+          type: "error",
+          index,
+          prediction_type: spec.prediction_type,
+          period: spec.period,
+          error: "Failed to generate prediction",
+        };
+        continue;
+      }
+      generated.push({ index, spec, result: value.value });
+      yield {
+        type: "result",
+        index,
+        prediction_type: spec.prediction_type,
+        period: spec.period,
+        cache: value.cache,
+        elapsed_ms: Date.now() - started,
+        ...value.value,
+      };
+    }
+
+    let predictions = [];
+    if (generated.length > 0) {
+      generated.sort((a, b) => a.index - b.index);
+      try {
+        const rows = await insertPredictions(companyId, generated);
+        predictions = rows.map((row, i) => ({
+          index: generated[i].index,
+          ...row,
+        }));
+      } catch (error) {
+        console.error("Error saving batch predictions:", error);
+        yield { type: "error", error: "Failed to save predictions" };
+      }
+    }
+
+    yield {
+      type: "summary",
+      requested: specs.length,
+      generated: generated.length,
+      saved: predictions.length,
+      failed,
+      elapsed_ms: Date.now() - started,
+      predictions,
+    };
+  }
+
+  return new Response(toReadableStream(run()), {
+    headers: { "Content-Type": NDJSON_CONTENT_TYPE },
+  });
+}
@@ -0,0 +1,100 @@
+import sql from "@/app/api/utils/sql";
+
+const DEFAULT_TOP = 5;
+const MAX_TOP = 50;
+
+// The dashboard cards, keyed by the name used in the response. `aggregates`
+// are extra columns computed alongside the per-month counts. Campaign
+// metrics are read through to_jsonb because older databases lack them.
+const SECTIONS = {
+  campaigns: {
+    table: "campaigns",
+    aggregates: `,
+      SUM(
+        COALESCE((to_jsonb(t) ->> 'emails_sent')::numeric, 0) *
+        COALESCE(NULLIF((to_jsonb(t) ->> 'conversion_rate')::numeric, 0), 2.5) /
+        100
+      )::float AS estimated_deals`,
+    defaults: { estimated_deals: 0 },
+  },
+  buyers: { table: "potential_buyers", aggregates: "", defaults: {} },
+  reports: { table: "market_reports", aggregates: "", defaults: {} },
+  products: { table: "products", aggregates: "", defaults: {} },
+};
+
+// Counts per calendar month (index 0 = January) plus the section's extra
+// aggregates summed over every month.
+const loadStats = async (
+  name,
+  { table, aggregates, defaults },
+  companyId,
+) => {
+  const rows = await sql.prepared(
+    `dashboard_${name}_stats`,
+    `SELECT EXTRACT(MONTH FROM created_at)::int AS month,
+      COUNT(*)::int AS count${aggregates}
+    FROM ${table} t
+    WHERE company_id = $1
+    GROUP BY 1`,
+    [companyId],
+  );
+
+  const stats = { total: 0, by_month: Array(12).fill(0), ...defaults };
+  for (const { month, count, ...extra } of rows) {
+    stats.total += count;
+    if (month) stats.by_month[month - 1] += count;
+    for (const [key, value] of Object.entries(extra)) {
+      stats[key] += value || 0;
+    }
+  }
+  return stats;
+};
+
+const loadTop = (name, { table }, companyId, limit) =>
+  sql.prepared(
+    `dashboard_${name}_top`,
+    `SELECT * FROM ${table}
+    WHERE company_id = $1
+    ORDER BY created_at DESC, id DESC
+    LIMIT $2`,
+    [companyId, limit],
+  );
+
+export async function GET(request) {
+  try {
+    const { searchParams } = new URL(request.url);
+    const companyId = searchParams.get("company_id");
+
+    if (!companyId) {
+      return Response.json({ error: "Company ID required" }, { status: 400 });
+    }
+
+    const limit = Math.min(
+      Math.max(parseInt(searchParams.get("limit")) || DEFAULT_TOP, 1),
+      MAX_TOP,
+    );
+
+    // Every count and top-N query is issued at once rather than one section
+    // after another.
+    const sections = Object.entries(SECTIONS);
+    const results = await Promise.all(
+      sections.flatMap(([name, section]) => [
+        loadStats(name, section, companyId),
+        loadTop(name, section, companyId, limit),
+      ]),
+    );
+
+    const summary = { company_id: companyId, limit };
+    sections.forEach(([name], i) => {
+      summary[name] = { ...results[2 * i], items: results[2 * i + 1] };
+    });
+
+    return Response.json(summary);
+  } catch (error) {
+    console.error("Error fetching dashboard summary:", error);
+    return Response.json(
+      { error: "Failed to fetch dashboard summary" },
+      { status: 500 },
+    );
+  }
+}
@@ -1,1531 +1,119 @@
-export async function GET() {
-  try {
-    // GTIP/HS Kodları - Türkiye Gümrük Tarife İstatistik Pozisyonu
-    const gtipHierarchy = {
-      // Bölüm I: Canlı Hayvanlar ve Hayvansal Ürünler (01-05)
-      "01": {
-        name: "01 - Canlı Hayvanlar",
-        subcategories: {
-          "0101": {
-            name: "0101 - Canlı atlar, eşekler, katırlar",
-            products: ["010110", "010121", "010129", "010130"],
-          },
-          "0102": {
-            name: "0102 - Canlı sığırlar",
-            products: ["010210", "010221", "010229", "010290"],
-          },
-          "0103": {
-            name: "0103 - Canlı domuzlar",
-            products: ["010310", "010391", "010392"],
-          },
-          "0104": {
-            name: "0104 - Canlı koyun ve keçiler",
-            products: ["010410", "010420"],
-          },
-          "0105": {
-            name: "0105 - Canlı kümes hayvanları",
-            products: ["010511", "010512", "010513", "010594", "010599"],
-          },
-          "0106": {
-            name: "0106 - Diğer canlı hayvanlar",
-            products: [
-              "010611",
-              "010612",
-              "010613",
-              "010614",
-              "010619",
-              "010620",
-              "010631",
-              "010632",
-              "010633",
-              "010639",
-              "010641",
-              "010649",
-              "010690",
-            ],
-          },
-        },
-      },
-      "02": {
-        name: "02 - Et ve Yenilebilir Sakatat",
-        subcategories: {
-          "0201": {
-            name: "0201 - Sığır eti, taze veya soğutulmuş",
-            products: ["020110", "020120", "020130"],
-          },
-          "0202": {
-            name: "0202 - Sığır eti, dondurulmuş",
-            products: ["020210", "020220", "020230"],
-          },
-          "0203": {
-            name: "0203 - Domuz eti, taze, soğutulmuş veya dondurulmuş",
-            products: [
-              "020311",
-              "020312",
-              "020319",
-              "020321",
-              "020322",
-              "020329",
-            ],
-          },
-          "0204": {
-            name: "0204 - Koyun veya keçi eti",
-            products: [
-              "020410",
-              "020421",
-              "020422",
-              "020423",
-              "020430",
-              "020441",
-              "020442",
-              "020443",
-              "020450",
-            ],
-          },
-          "0205": {
-            name: "0205 - At, eşek, katır veya bardak eti",
-            products: ["020500"],
-          },
-          "0206": {
-            name: "0206 - Yenilebilir sakatat",
-            products: [
-              "020610",
-              "020621",
-              "020622",
-              "020629",
-              "020630",
-              "020641",
-              "020649",
-              "020680",
-              "020690",
-            ],
-          },
-          "0207": {
-            name: "0207 - Kümes hayvanları eti ve sakatat",
-            products: [
-              "020711",
-              "020712",
-              "020713",
-              "020714",
-              "020724",
-              "020725",
-              "020726",
-              "020727",
-              "020732",
-              "020733",
-              "020734",
-              "020735",
-              "020736",
-            ],
-          },
-          "0208": {
-            name: "0208 - Diğer et ve yenilebilir sakatat",
-            products: [
-              "020810",
-              "020821",
-              "020830",
-              "020840",
-              "020850",
-              "020860",
-              "020890",
-            ],
-          },
-          "0209": {
-            name: "0209 - Domuz yağı ve kümes hayvanları yağı",
-            products: ["020900"],
-          },
-          "0210": {
-            name: "0210 - Tuzlanmış, salamuralı, kurutulmuş veya tütsülenmiş et",
-            products: [
-              "021011",
-              "021012",
-              "021019",
-              "021020",
-              "021091",
-              "021092",
-              "021093",
-              "021099",
-            ],
-          },
-        },
-      },
-      "03": {
-        name: "03 - Balık ve Diğer Su Ürünleri",
-        subcategories: {
-          "0301": {
-            name: "0301 - Canlı balık",
-            products: [
-              "030111",
-              "030119",
-              "030191",
-              "030192",
-              "030193",
-              "030194",
-              "030195",
-              "030199",
-            ],
-          },
-          "0302": {
-            name: "0302 - Taze veya soğutulmuş balık",
-            products: [
-              "030211",
-              "030212",
-              "030213",
-              "030214",
-              "030219",
-              "030221",
-              "030222",
-              "030223",
-              "030224",
-              "030229",
-            ],
-          },
-          "0303": {
-            name: "0303 - Dondurulmuş balık",
-            products: [
-              "030311",
-              "030312",
-              "030313",
-              "030314",
-              "030319",
-              "030321",
-              "030322",
-              "030323",
-              "030324",
-              "030329",
-            ],
-          },
-          "0304": {
-            name: "0304 - Balık filetosu ve diğer balık etleri",
-            products: [
-              "030410",
-              "030420",
-              "030431",
-              "030432",
-              "030433",
-              "030439",
-              "030441",
-              "030442",
-              "030443",
-              "030444",
-              "030445",
-              "030446",
-              "030447",
-              "030448",
-              "030449",
-            ],
-          },
-          "0305": {
-            name: "0305 - Kurutulmuş, tuzlanmış veya salamuralı balık",
-            products: [
-              "030510",
-              "030520",
-              "030530",
-              "030541",
-              "030542",
-              "030549",
-              "030551",
-              "030559",
-              "030561",
-              "030562",
-              "030563",
-              "030569",
-              "030571",
-              "030572",
-              "030579",
-            ],
-          },
-          "0306": {
-            name: "0306 - Kabuklular",
-            products: [
-              "030611",
-              "030612",
-              "030613",
-              "030614",
-              "030615",
-              "030616",
-              "030617",
-              "030619",
-              "030621",
-              "030622",
-              "030623",
-              "030624",
-              "030625",
-              "030626",
-              "030627",
-              "030629",
-            ],
-          },
-          "0307": {
-            name: "0307 - Yumuşakçalar",
-            products: [
-              "030711",
-              "030712",
-              "030719",
-              "030721",
-              "030722",
-              "030729",
-              "030731",
-              "030732",
-              "030739",
-              "030741",
-              "030742",
-              "030749",
-              "030751",
-              "030752",
-              "030759",
-              "030760",
-              "030771",
-              "030772",
-              "030779",
-              "030781",
-              "030782",
-              "030783",
-              "030784",
-              "030787",
-              "030788",
-              "030789",
-              "030791",
-              "030792",
-              "030799",
-            ],
-          },
-          "0308": {
-            name: "0308 - Su omurgasızları",
-            products: [
-              "030811",
-              "030812",
-              "030819",
-              "030821",
-              "030822",
-              "030829",
-              "030830",
-              "030890",
-            ],
-          },
-        },
-      },
-      "04": {
-        name: "04 - Süt Ürünleri ve Yumurta",
-        subcategories: {
-          "0401": {
-            name: "0401 - Süt ve krema",
-            products: ["040110", "040120", "040130", "040140", "040150"],
-          },
-          "0402": {
-            name: "0402 - Süt ve krema, konsantre edilmiş",
-            products: ["040210", "040221", "040229", "040291", "040299"],
-          },
-          "0403": {
-            name: "0403 - Ayran, yoğurt ve diğer fermente süt ürünleri",
-            products: ["040310", "040390"],
-          },
-          "0404": {
-            name: "0404 - Peynir altı suyu ve diğer süt ürünleri",
-            products: ["040410", "040490"],
-          },
-          "0405": {
-            name: "0405 - Tereyağı ve diğer süt yağları",
-            products: ["040510", "040520", "040590"],
-          },
-          "0406": {
-            name: "0406 - Peynir ve lor",
-            products: ["040610", "040620", "040630", "040640", "040690"],
-          },
-          "0407": {
-            name: "0407 - Kümes hayvanları yumurtaları",
-            products: ["040700"],
-          },
-          "0408": {
-            name: "0408 - Kümes hayvanları yumurtaları, kabuksuz",
-            products: ["040811", "040819", "040891", "040899"],
-          },
-          "0409": { name: "0409 - Doğal bal", products: ["040900"] },
-          "0410": {
-            name: "0410 - Yenilebilir hayvansal ürünler",
-            products: ["041000"],
-          },
-        },
-      },
-      "05": {
-        name: "05 - Diğer Hayvansal Ürünler",
-        subcategories: {
-          "0501": {
-            name: "0501 - İnsan saçı, işlenmemiş",
-            products: ["050100"],
-          },
-          "0502": {
-            name: "0502 - Domuz kılları ve porsuk tüyleri",
-            products: ["050210", "050290"],
-          },
-          "0504": {
-            name: "0504 - Hayvan bağırsakları, mesaneleri",
-            products: ["050400"],
-          },
-          "0505": {
-            name: "0505 - Kuş derileri ve tüyleri",
-            products: ["050510", "050590"],
-          },
-          "0506": {
-            name: "0506 - Kemik ve boynuz çekirdeği",
-            products: ["050610", "050690"],
-          },
-          "0507": {
-            name: "0507 - Fildişi, boynuz, çanak, tırnak",
-            products: ["050710", "050790"],
-          },
-          "0508": {
-            name: "0508 - Mercan ve benzeri maddeler",
-            products: ["050800"],
-          },
-          "0510": {
-            name: "0510 - Ambergris, kastor, civet ve misk",
-            products: ["051000"],
-          },
-          "0511": {
-            name: "0511 - Hayvansal ürünler",
-            products: ["051110", "051191", "051199"],
-          },
-        },
-      },
+import { createHash } from "node:crypto";
+import {
+  fullTreeBody,
+  gtipVersion,
+  lookupCode,
+  searchCodes,
+  subtree,
+} from "@/app/api/utils/gtip-index";
+import { gtipHierarchy } from "@/app/api/utils/gtip-hierarchy";
+import { NDJSON_CONTENT_TYPE } from "@/app/api/utils/ndjson";
+import {
+  compressResponse,
+  precompressed,
+  wantsNdjson,
+} from "@/app/api/utils/respond";
+
+const MAX_SEARCH_LIMIT = 100;
+
+// The full tree is by far the largest response, so it is compressed once per
+// encoding rather than per request. NDJSON mode sends one chapter per line.
+const sendFullTree = precompressed(fullTreeBody);
+const sendFullTreeNdjson = precompressed(
+  Object.entries(gtipHierarchy)
+    .map(
+      ([code, chapter]) =>
+        `${JSON.stringify({ code: code.padStart(2, "0"), ...chapter })}\n`,
+    )
+    .join(""),
+);
+
+const sendJson = (body) => (request, init) => {
+  const response = new Response(body, init);
+  response.headers.set("Content-Length", String(Buffer.byteLength(body)));
+  return compressResponse(request, response);
+};
+
+// The hierarchy only changes on deploy, so every response is tagged with the
+// data version plus the query that shaped it and can be revalidated cheaply.
+const jsonWithETag = (
+  request,
+  send,
+  variant = "",
+  contentType = "application/json",
+) => {
+  const suffix = variant
+    ? `-${createHash("sha1").update(variant).digest("hex").slice(0, 12)}`
+    : "";
+  const etag = `"${gtipVersion}${suffix}"`;
+  const headers = {
+    ETag: etag,
+    "Cache-Control": "public, max-age=3600",
+    Vary: "Accept-Encoding",
+  };
 
-      // Bölüm II: Bitkisel Ürünler (06-14)
-      "06": {
-        name: "06 - Canlı Ağaçlar ve Diğer Bitkiler",
-        subcategories: {
-          "0601": {
-            name: "0601 - Soğanlar, yumrular, rizomlar",
-            products: ["060110", "060120"],
-          },
-          "0602": {
-            name: "0602 - Diğer canlı bitkiler",
-            products: ["060210", "060220", "060230", "060240", "060290"],
-          },
-          "0603": {
-            name: "0603 - Kesme çiçekler ve tomurcuklar",
-            products: ["060310", "060390"],
-          },
-          "0604": {
-            name: "0604 - Yapraklar, dallar ve diğer bitki kısımları",
-            products: ["060410", "060420", "060490"],
-          },
-        },
-      },
-      "07": {
-        name: "07 - Yenilebilir Sebzeler",
-        subcategories: {
-          "0701": {
-            name: "0701 - Patates, taze veya soğutulmuş",
-            products: ["070110", "070190"],
-          },
-          "0702": {
-            name: "0702 - Domates, taze veya soğutulmuş",
-            products: ["070200"],
-          },
-          "0703": {
-            name: "0703 - Soğan, sarımsak, pırasa",
-            products: ["070310", "070320", "070390"],
-          },
-          "0704": {
-            name: "0704 - Lahana, karnabahar, kelem",
-            products: ["070410", "070420", "070490"],
-          },
-          "0705": {
-            name: "0705 - Marul ve radika",
-            products: ["070511", "070519", "070521", "070529"],
-          },
-          "0706": {
-            name: "0706 - Havuç, şalgam, salata pancarı",
-            products: ["070610", "070690"],
-          },
-          "0707": { name: "0707 - Hıyar ve kornişon", products: ["070700"] },
-          "0708": {
-            name: "0708 - Baklagiller, taze veya soğutulmuş",
-            products: ["070810", "070820", "070890"],
-          },
-          "0709": {
-            name: "0709 - Diğer sebzeler, taze veya soğutulmuş",
-            products: [
-              "070910",
-              "070920",
-              "070930",
-              "070940",
-              "070951",
-              "070959",
-              "070960",
-              "070970",
-              "070993",
-              "070999",
-            ],
-          },
-          "0710": {
-            name: "0710 - Dondurulmuş sebzeler",
-            products: [
-              "071010",
-              "071021",
-              "071022",
-              "071029",
-              "071030",
-              "071040",
-              "071080",
-              "071090",
-            ],
-          },
-          "0711": {
-            name: "0711 - Geçici olarak korunmuş sebzeler",
-            products: [
-              "071110",
-              "071120",
-              "071130",
-              "071140",
-              "071151",
-              "071159",
-              "071190",
-            ],
-          },
-          "0712": {
-            name: "0712 - Kurutulmuş sebzeler",
-            products: [
-              "071220",
-              "071231",
-              "071232",
-              "071233",
-              "071239",
-              "071290",
-            ],
-          },
-          "0713": {
-            name: "0713 - Kuru baklagiller",
-            products: [
-              "071310",
-              "071320",
-              "071331",
-              "071332",
-              "071333",
-              "071339",
-              "071340",
-              "071350",
-              "071360",
-              "071390",
-            ],
-          },
-          "0714": {
-            name: "0714 - Manyok, tatlı patates",
-            products: ["071410", "071420", "071490"],
-          },
-        },
-      },
-      "08": {
-        name: "08 - Yenilebilir Meyveler",
-        subcategories: {
-          "0801": {
-            name: "0801 - Hindistan cevizi, Brezilya fındığı",
-            products: [
-              "080111",
-              "080112",
-              "080119",
-              "080121",
-              "080122",
-              "080131",
-              "080132",
-            ],
-          },
-          "0802": {
-            name: "0802 - Diğer kabuklu meyveler",
-            products: [
-              "080211",
-              "080212",
-              "080221",
-              "080222",
-              "080231",
-              "080232",
-              "080241",
-              "080242",
-              "080251",
-              "080252",
-              "080261",
-              "080262",
-              "080270",
-              "080280",
-              "080290",
-            ],
-          },
-          "0803": {
-            name: "0803 - Muz, taze veya kurutulmuş",
-            products: ["080300"],
-          },
-          "0804": {
-            name: "0804 - Hurma, incir, ananas, avokado",
-            products: ["080410", "080420", "080430", "080440", "080450"],
-          },
-          "0805": {
-            name: "0805 - Narenciye meyveleri",
-            products: [
-              "080510",
-              "080520",
-              "080521",
-              "080522",
-              "080529",
-              "080540",
-              "080550",
-              "080590",
-            ],
-          },
-          "0806": {
-            name: "0806 - Üzüm, taze veya kurutulmuş",
-            products: ["080610", "080620"],
-          },
-          "0807": {
-            name: "0807 - Kavun, karpuz",
-            products: ["080710", "080719", "080720"],
-          },
-          "0808": {
-            name: "0808 - Elma, armut ve ayva",
-            products: ["080810", "080830"],
-          },
-          "0809": {
-            name: "0809 - Kayısı, kiraz, şeftali, erik",
-            products: ["080910", "080921", "080929", "080930", "080940"],
-          },
-          "0810": {
-            name: "0810 - Diğer meyveler, taze",
-            products: [
-              "081010",
-              "081020",
-              "081030",
-              "081040",
-              "081050",
-              "081060",
-              "081070",
-              "081090",
-            ],
-          },
-          "0811": {
-            name: "0811 - Dondurulmuş meyveler",
-            products: ["081110", "081120", "081190"],
-          },
-          "0812": {
-            name: "0812 - Geçici olarak korunmuş meyveler",
-            products: ["081210", "081220", "081290"],
-          },
-          "0813": {
-            name: "0813 - Kurutulmuş meyveler",
-            products: [
-              "081310",
-              "081320",
-              "081330",
-              "081340",
-              "081350",
-              "081390",
-            ],
-          },
-          "0814": {
-            name: "0814 - Narenciye ve kavun kabukları",
-            products: ["081400"],
-          },
-        },
-      },
+  const ifNoneMatch = request.headers.get("if-none-match");
+  if (
+    ifNoneMatch &&
+    ifNoneMatch.split(",").some((tag) => tag.trim().replace(/^W\//, "") === etag)
+  ) {
+    return new Response(null, { status: 304, headers });
+  }
+
+  return send(request, {
+    headers: { ...headers, "Content-Type": contentType },
+  });
+};
+
+export async function GET(request) {
+  try {
+    const { searchParams } = new URL(request.url);
+    const code = searchParams.get("code");
+    const prefix = searchParams.get("prefix");
+    const query = searchParams.get("q");
 
-      // Bölüm III: Hayvansal ve Bitkisel Yağlar (15)
-      15: {
-        name: "15 - Hayvansal ve Bitkisel Yağlar",
-        subcategories: {
-          1501: {
-            name: "1501 - Domuz yağı",
-            products: ["150110", "150120", "150130"],
-          },
-          1502: {
-            name: "1502 - Sığır, koyun veya keçi yağı",
-            products: ["150200"],
-          },
-          1503: { name: "1503 - Domuz stearin ve yağ", products: ["150300"] },
-          1504: {
-            name: "1504 - Balık veya deniz memelilerinin yağları",
-            products: ["150410", "150420", "150430"],
-          },
-          1505: {
-            name: "1505 - Yün yağı ve bu yağdan elde edilen yağlı maddeler",
-            products: ["150500"],
-          },
-          1506: { name: "1506 - Diğer hayvansal yağlar", products: ["150600"] },
-          1507: { name: "1507 - Soya yağı", products: ["150710", "150790"] },
-          1508: {
-            name: "1508 - Yer fıstığı yağı",
-            products: ["150810", "150890"],
-          },
-          1509: { name: "1509 - Zeytinyağı", products: ["150910", "150990"] },
-          1510: {
-            name: "1510 - Zeytinden elde edilen diğer yağlar",
-            products: ["151000"],
-          },
-          1511: { name: "1511 - Palm yağı", products: ["151110", "151190"] },
-          1512: {
-            name: "1512 - Ayçiçeği, cartamus veya pamuk tohumu yağı",
-            products: ["151211", "151219", "151221", "151229"],
-          },
-          1513: {
-            name: "1513 - Hindistan cevizi, palm çekirdeği veya babassu yağı",
-            products: ["151311", "151319", "151321", "151329"],
-          },
-          1514: {
-            name: "1514 - Kolza, hardal yağı",
-            products: ["151411", "151419", "151491", "151499"],
-          },
-          1515: {
-            name: "1515 - Diğer sabit bitkisel yağlar",
-            products: [
-              "151511",
-              "151519",
-              "151521",
-              "151529",
-              "151530",
-              "151550",
-              "151560",
-              "151590",
-            ],
-          },
-          1516: {
-            name: "1516 - Hayvansal veya bitkisel yağlar, hidrojene edilmiş",
-            products: ["151610", "151620"],
-          },
-          1517: { name: "1517 - Margarin", products: ["151710", "151790"] },
-          1518: {
-            name: "1518 - Hayvansal veya bitkisel yağlar, kimyasal olarak değiştirilmiş",
-            products: ["151800"],
-          },
-          1520: { name: "1520 - Gliserin", products: ["152000"] },
-          1521: {
-            name: "1521 - Bitkisel mumlar",
-            products: ["152110", "152190"],
-          },
-          1522: { name: "1522 - Degras", products: ["152200"] },
-        },
-      },
+    // Validate/resolve a single code, e.g. ?code=84713000
+    if (code) {
+      return jsonWithETag(
+        request,
+        sendJson(JSON.stringify({ success: true, ...lookupCode(code) })),
+        `code:${code}`,
+      );
+    }
 
-      // Tekstil kategorileri (özellikle önemli)
-      50: {
-        name: "50 - İpek",
-        subcategories: {
-          5001: { name: "5001 - İpekböceği kozaları", products: ["500100"] },
-          5002: { name: "5002 - Ham ipek", products: ["500200"] },
-          5003: { name: "5003 - İpek atığı", products: ["500300"] },
-          5004: { name: "5004 - İpek ipliği", products: ["500400"] },
-          5005: {
-            name: "5005 - İpek ipliği, perakende satışa uygun",
-            products: ["500500"],
-          },
-          5006: { name: "5006 - İpek ipliği", products: ["500600"] },
-          5007: {
-            name: "5007 - İpek kumaşlar",
-            products: ["500710", "500720", "500790"],
-          },
-        },
-      },
-      61: {
-        name: "61 - Örülmüş Giyim Eşyası",
-        subcategories: {
-          6101: {
-            name: "6101 - Erkek paltolar (örme)",
-            products: ["610110", "610120", "610130", "610190"],
-          },
-          6102: {
-            name: "6102 - Kadın paltolar (örme)",
-            products: ["610210", "610220", "610230", "610290"],
-          },
-          6103: {
-            name: "6103 - Erkek takım elbiseler (örme)",
-            products: ["610310", "610320", "610330", "610390"],
-          },
-          6104: {
-            name: "6104 - Kadın takım elbiseler (örme)",
-            products: [
-              "610410",
-              "610420",
-              "610430",
-              "610440",
-              "610450",
-              "610460",
-              "610490",
-            ],
-          },
-          6105: {
-            name: "6105 - Erkek gömlekler (örme)",
-            products: ["610510", "610520", "610590"],
-          },
-          6106: {
-            name: "6106 - Kadın bluzlar (örme)",
-            products: ["610610", "610620", "610690"],
-          },
-          6107: {
-            name: "6107 - Erkek iç çamaşırları (örme)",
-            products: [
-              "610711",
-              "610712",
-              "610719",
-              "610721",
-              "610722",
-              "610729",
-              "610791",
-              "610792",
-              "610799",
-            ],
-          },
-          6108: {
-            name: "6108 - Kadın iç çamaşırları (örme)",
-            products: [
-              "610811",
-              "610819",
-              "610821",
-              "610822",
-              "610829",
-              "610831",
-              "610832",
-              "610839",
-              "610891",
-              "610892",
-              "610899",
-            ],
-          },
-          6109: {
-            name: "6109 - T-shirt, atlet (örme)",
-            products: ["610910", "610990"],
-          },
-          6110: {
-            name: "6110 - Süveter, hırka (örme)",
-            products: ["611010", "611020", "611030", "611090"],
-          },
-          6111: {
-            name: "6111 - Bebek giyim eşyası (örme)",
-            products: ["611110", "611120", "611130", "611190"],
-          },
-          6112: {
-            name: "6112 - Eşofman (örme)",
-            products: [
-              "611211",
-              "611212",
-              "611219",
-              "611220",
-              "611231",
-              "611239",
-              "611241",
-              "611249",
-              "611290",
-            ],
-          },
-          6113: {
-            name: "6113 - Giyim eşyası, impregneli (örme)",
-            products: ["611300"],
-          },
-          6114: {
-            name: "6114 - Diğer giyim eşyası (örme)",
-            products: ["611410", "611420", "611430", "611490"],
-          },
-          6115: {
-            name: "6115 - Çorap (örme)",
-            products: [
-              "611511",
-              "611512",
-              "611519",
-              "611520",
-              "611521",
-              "611529",
-              "611530",
-              "611591",
-              "611592",
-              "611593",
-              "611599",
-            ],
-          },
-          6116: {
-            name: "6116 - Eldiven (örme)",
-            products: ["611610", "611691", "611692", "611693", "611699"],
-          },
-          6117: {
-            name: "6117 - Diğer hazır aksesuar (örme)",
-            products: ["611710", "611720", "611780", "611790"],
-          },
-        },
-      },
-      62: {
-        name: "62 - Örülmemiş Giyim Eşyası",
-        subcategories: {
-          6201: {
-            name: "6201 - Erkek paltolar (dokuma)",
-            products: [
-              "620111",
-              "620112",
-              "620113",
-              "620119",
-              "620191",
-              "620192",
-              "620193",
-              "620199",
-            ],
-          },
-          6202: {
-            name: "6202 - Kadın paltolar (dokuma)",
-            products: [
-              "620211",
-              "620212",
-              "620213",
-              "620219",
-              "620291",
-              "620292",
-              "620293",
-              "620299",
-            ],
-          },
-          6203: {
-            name: "6203 - Erkek takım elbiseler (dokuma)",
-            products: [
-              "620311",
-              "620312",
-              "620319",
-              "620321",
-              "620322",
-              "620323",
-              "620329",
-              "620331",
-              "620332",
-              "620333",
-              "620339",
-              "620341",
-              "620342",
-              "620343",
-              "620349",
-            ],
-          },
-          6204: {
-            name: "6204 - Kadın takım elbiseler (dokuma)",
-            products: [
-              "620411",
-              "620412",
-              "620413",
-              "620419",
-              "620421",
-              "620422",
-              "620423",
-              "620429",
-              "620431",
-              "620432",
-              "620433",
-              "620439",
-              "620441",
-              "620442",
-              "620443",
-              "620444",
-              "620449",
-              "620451",
-              "620452",
-              "620453",
-              "620459",
-              "620461",
-              "620462",
-              "620463",
-              "620469",
-            ],
-          },
-          6205: {
-            name: "6205 - Erkek gömlekler (dokuma)",
-            products: ["620520", "620530", "620590"],
-          },
-          6206: {
-            name: "6206 - Kadın bluzlar (dokuma)",
-            products: ["620610", "620620", "620630", "620640", "620690"],
-          },
-          6207: {
-            name: "6207 - Erkek iç çamaşırları (dokuma)",
-            products: [
-              "620711",
-              "620719",
-              "620721",
-              "620722",
-              "620729",
-              "620791",
-              "620792",
-              "620799",
-            ],
-          },
-          6208: {
-            name: "6208 - Kadın iç çamaşırları (dokuma)",
-            products: [
-              "620811",
-              "620819",
-              "620821",
-              "620822",
-              "620829",
-              "620891",
-              "620892",
-              "620899",
-            ],
-          },
-          6209: {
-            name: "6209 - Bebek giyim eşyası (dokuma)",
-            products: ["620910", "620920", "620930", "620990"],
-          },
-          6210: {
-            name: "6210 - Giyim eşyası, emprenye edilmiş",
-            products: ["621010", "621020", "621030", "621040", "621050"],
-          },
-          6211: {
-            name: "6211 - Eşofman, kayak kıyafetleri",
-            products: [
-              "621111",
-              "621112",
-              "621120",
-              "621131",
-              "621132",
-              "621133",
-              "621139",
-              "621141",
-              "621142",
-              "621143",
-              "621149",
-            ],
-          },
-          6212: {
-            name: "6212 - Sutyen, korse, jartiyer",
-            products: ["621210", "621220", "621230", "621290"],
-          },
-          6213: {
-            name: "6213 - Mendil",
-            products: ["621310", "621320", "621390"],
-          },
-          6214: {
-            name: "6214 - Şal, eşarp, mantilla",
-            products: ["621410", "621420", "621430", "621490"],
-          },
-          6215: {
-            name: "6215 - Kravat",
-            products: ["621510", "621520", "621590"],
-          },
-          6216: { name: "6216 - Eldiven (dokuma)", products: ["621600"] },
-          6217: {
-            name: "6217 - Diğer hazır aksesuar (dokuma)",
-            products: ["621710", "621790"],
-          },
-        },
-      },
-      63: {
-        name: "63 - Diğer Hazır Tekstil Eşyası",
-        subcategories: {
-          6301: {
-            name: "6301 - Battaniye",
-            products: ["630110", "630120", "630130", "630140", "630190"],
-          },
-          6302: {
-            name: "6302 - Yatak takımları",
-            products: [
-              "630210",
-              "630221",
-              "630222",
-              "630229",
-              "630231",
-              "630232",
-              "630239",
-              "630240",
-              "630251",
-              "630253",
-              "630259",
-              "630260",
-              "630291",
-              "630293",
-              "630299",
-            ],
-          },
-          6303: {
-            name: "6303 - Perdeler",
-            products: [
-              "630311",
-              "630312",
-              "630319",
-              "630391",
-              "630392",
-              "630399",
-            ],
-          },
-          6304: {
-            name: "6304 - Diğer döşemelik eşya",
-            products: [
-              "630411",
-              "630419",
-              "630491",
-              "630492",
-              "630493",
-              "630499",
-            ],
-          },
-          6305: {
-            name: "6305 - Çuval ve torba",
-            products: [
-              "630510",
-              "630520",
-              "630531",
-              "630532",
-              "630533",
-              "630539",
-              "630590",
-            ],
-          },
-          6306: {
-            name: "6306 - Branda, tende, güneşlik",
-            products: [
-              "630612",
-              "630619",
-              "630622",
-              "630629",
-              "630630",
-              "630640",
-              "630691",
-              "630699",
-            ],
-          },
-          6307: {
-            name: "6307 - Diğer hazır eşya",
-            products: ["630710", "630720", "630790"],
-          },
-          6308: { name: "6308 - Takımlar", products: ["630800"] },
-          6309: {
-            name: "6309 - Kullanılmış giyim eşyası",
-            products: ["630900"],
-          },
-          6310: {
-            name: "6310 - Kullanılmış tekstil eşyası",
-            products: ["631010", "631090"],
-          },
-        },
-      },
+    // Only the chapter/heading/subheading under a prefix, e.g. ?prefix=8471
+    if (prefix) {
+      return jsonWithETag(
+        request,
+        sendJson(JSON.stringify({ success: true, gtipCodes: subtree(prefix) })),
+        `prefix:${prefix}`,
+      );
+    }
 
-      // Makine kategorileri (çok önemli)
-      84: {
-        name: "84 - Makineler ve Mekanik Cihazlar",
-        subcategories: {
-          8401: {
-            name: "8401 - Nükleer reaktörler",
-            products: ["840110", "840120", "840130", "840140"],
-          },
-          8402: {
-            name: "8402 - Buhar kazanları",
-            products: ["840211", "840212", "840219", "840220", "840290"],
-          },
-          8403: {
-            name: "8403 - Merkezi ısıtma kazanları",
-            products: ["840310", "840390"],
-          },
-          8404: {
-            name: "8404 - Yardımcı teçhizat",
-            products: ["840410", "840420", "840490"],
-          },
-          8405: {
-            name: "8405 - Gaz jeneratörleri",
-            products: ["840510", "840590"],
-          },
-          8406: {
-            name: "8406 - Buhar türbinleri",
-            products: ["840610", "840681", "840682", "840690"],
-          },
-          8407: {
-            name: "8407 - Pistonlu içten yanmalı motorlar",
-            products: [
-              "840710",
-              "840721",
-              "840729",
-              "840731",
-              "840732",
-              "840733",
-              "840734",
-              "840790",
-            ],
-          },
-          8408: {
-            name: "8408 - Sıkıştırma ateşlemeli motorlar",
-            products: ["840810", "840820", "840890"],
-          },
-          8409: {
-            name: "8409 - Motor parçaları",
-            products: ["840910", "840991", "840999"],
-          },
-          8410: {
-            name: "8410 - Hidraulik türbinler",
-            products: ["841011", "841012", "841013", "841090"],
-          },
-          8411: {
-            name: "8411 - Turbo-jet, turbo-prop motorlar",
-            products: [
-              "841111",
-              "841112",
-              "841121",
-              "841122",
-              "841181",
-              "841182",
-              "841191",
-              "841199",
-            ],
-          },
-          8412: {
-            name: "8412 - Diğer motorlar",
-            products: [
-              "841210",
-              "841221",
-              "841229",
-              "841231",
-              "841239",
-              "841280",
-              "841290",
-            ],
-          },
-          8413: {
-            name: "8413 - Sıvı pompalar",
-            products: [
-              "841311",
-              "841319",
-              "841320",
-              "841330",
-              "841340",
-              "841350",
-              "841360",
-              "841370",
-              "841381",
-              "841382",
-              "841391",
-              "841392",
-            ],
-          },
-          8414: {
-            name: "8414 - Hava veya vakum pompaları",
-            products: [
-              "841410",
-              "841420",
-              "841430",
-              "841440",
-              "841451",
-              "841459",
-              "841460",
-              "841480",
-              "841490",
-            ],
-          },
-          8415: {
-            name: "8415 - Klima cihazları",
-            products: [
-              "841510",
-              "841520",
-              "841581",
-              "841582",
-              "841583",
-              "841590",
-            ],
-          },
-          8416: {
-            name: "8416 - Fırın brülörleri",
-            products: ["841610", "841620", "841630", "841690"],
-          },
-          8417: {
-            name: "8417 - Endüstriyel fırınlar",
-            products: ["841710", "841720", "841780", "841790"],
-          },
-          8418: {
-            name: "8418 - Buzdolapları, dondurucular",
-            products: [
-              "841810",
-              "841821",
-              "841829",
-              "841830",
-              "841840",
-              "841850",
-              "841861",
-              "841869",
-              "841891",
-              "841899",
-            ],
-          },
-          8419: {
-            name: "8419 - Makineler, ısı değişimi ile çalışan",
-            products: [
-              "841911",
-              "841919",
-              "841920",
-              "841931",
-              "841932",
-              "841939",
-              "841940",
-              "841950",
-              "841960",
-              "841981",
-              "841989",
-              "841990",
-            ],
-          },
-          8420: {
-            name: "8420 - Kalenderleme makineleri",
-            products: ["842010", "842091", "842099"],
-          },
-          8421: {
-            name: "8421 - Santrifüj makineleri, filtreleme cihazları",
-            products: [
-              "842111",
-              "842112",
-              "842119",
-              "842121",
-              "842122",
-              "842123",
-              "842129",
-              "842131",
-              "842139",
-              "842191",
-              "842199",
-            ],
-          },
-          8422: {
-            name: "8422 - Bulaşık makineleri, paketleme makineleri",
-            products: ["842211", "842220", "842230", "842240", "842290"],
-          },
-          8423: {
-            name: "8423 - Tartma makineleri",
-            products: [
-              "842310",
-              "842320",
-              "842330",
-              "842381",
-              "842382",
-              "842389",
-              "842390",
-            ],
-          },
-          8424: {
-            name: "8424 - Sıvı veya toz püskürtme makineleri",
-            products: [
-              "842410",
-              "842420",
-              "842430",
-              "842481",
-              "842489",
-              "842490",
-            ],
-          },
-        },
-      },
-      85: {
-        name: "85 - Elektrikli Makine ve Cihazlar",
-        subcategories: {
-          8501: {
-            name: "8501 - Elektrik motorları ve jeneratörler",
-            products: [
-              "850110",
-              "850120",
-              "850131",
-              "850132",
-              "850133",
-              "850134",
-              "850140",
-              "850151",
-              "850152",
-              "850153",
-              "850161",
-              "850162",
-              "850163",
-              "850164",
-            ],
-          },
-          8502: {
-            name: "8502 - Elektrik üretim grupları",
-            products: [
-              "850211",
-              "850212",
-              "850213",
-              "850220",
-              "850231",
-              "850239",
-              "850240",
-            ],
-          },
-          8503: {
-            name: "8503 - 8501 ve 8502 pozisyonlarının parçaları",
-            products: ["850300"],
-          },
-          8504: {
-            name: "8504 - Elektrikli transformatörler",
-            products: [
-              "850410",
-              "850421",
-              "850422",
-              "850423",
-              "850431",
-              "850432",
-              "850433",
-              "850434",
-              "850440",
-              "850450",
-              "850490",
-            ],
-          },
-          8505: {
-            name: "8505 - Elektromıknatıslar",
-            products: ["850511", "850519", "850520", "850590"],
-          },
-          8506: {
-            name: "8506 - Birincil piller",
-            products: [
-              "850610",
-              "850630",
-              "850640",
-              "850650",
-              "850660",
-              "850680",
-              "850690",
-            ],
-          },
-          8507: {
-            name: "8507 - Akümülatörler",
-            products: [
-              "850710",
-              "850720",
-              "850730",
-              "850740",
-              "850750",
-              "850760",
-              "850780",
-              "850790",
-            ],
-          },
-          8508: {
-            name: "8508 - Elektrik süpürgeleri",
-            products: ["850811", "850819", "850860", "850870"],
-          },
-          8509: {
-            name: "8509 - Elektrikli ev aletleri",
-            products: ["850910", "850920", "850930", "850940", "850980"],
-          },
-          8510: {
-            name: "8510 - Tıraş makineleri",
-            products: ["851010", "851020", "851030", "851090"],
-          },
-          8511: {
-            name: "8511 - Elektrikli ateşleme ve marş takımları",
-            products: [
-              "851110",
-              "851120",
-              "851130",
-              "851140",
-              "851150",
-              "851180",
-              "851190",
-            ],
-          },
-          8512: {
-            name: "8512 - Elektrikli aydınlatma takımları",
-            products: ["851210", "851220", "851230", "851240", "851290"],
-          },
-          8513: {
-            name: "8513 - Portatif elektrikli lambalar",
-            products: ["851310", "851390"],
-          },
-          8514: {
-            name: "8514 - Endüstriyel elektrikli fırınlar",
-            products: ["851410", "851420", "851430", "851440", "851490"],
-          },
-          8515: {
-            name: "8515 - Elektrikli kaynak makineleri",
-            products: [
-              "851511",
-              "851519",
-              "851521",
-              "851529",
-              "851531",
-              "851539",
-              "851580",
-              "851590",
-            ],
-          },
-          8516: {
-            name: "8516 - Elektrikli ısıtıcılar",
-            products: [
-              "851610",
-              "851621",
-              "851629",
-              "851631",
-              "851632",
-              "851633",
-              "851640",
-              "851650",
-              "851660",
-              "851671",
-              "851672",
-              "851679",
-              "851680",
-              "851690",
-            ],
-          },
-          8517: {
-            name: "8517 - Telefon cihazları",
-            products: [
-              "851711",
-              "851712",
-              "851718",
-              "851761",
-              "851762",
-              "851769",
-              "851770",
-            ],
-          },
-          8518: {
-            name: "8518 - Mikrofon, hoparlör, kulaklık",
-            products: [
-              "851810",
-              "851821",
-              "851822",
-              "851829",
-              "851830",
-              "851840",
-              "851850",
-              "851890",
-            ],
-          },
-          8519: {
-            name: "8519 - Ses kayıt ve çalma cihazları",
-            products: ["851920", "851930", "851950", "851981", "851989"],
-          },
-          8520: {
-            name: "8520 - Manyetik ses kayıt cihazları",
-            products: [
-              "852010",
-              "852020",
-              "852032",
-              "852033",
-              "852039",
-              "852090",
-            ],
-          },
-          8521: {
-            name: "8521 - Video kayıt ve çalma cihazları",
-            products: ["852110", "852190"],
-          },
-          8522: {
-            name: "8522 - 8519-8521 pozisyonlarının parçaları",
-            products: ["852210", "852290"],
-          },
-          8523: {
-            name: "8523 - Kayıt edilmiş diskler, bantlar",
-            products: [
-              "852321",
-              "852329",
-              "852340",
-              "852351",
-              "852352",
-              "852359",
-              "852380",
-              "852392",
-              "852399",
-            ],
-          },
-        },
-      },
-    };
+    // Autocomplete over names or code prefixes, e.g. ?q=pamuk&limit=10
+    if (query) {
+      const limit = Math.min(
+        parseInt(searchParams.get("limit")) || 20,
+        MAX_SEARCH_LIMIT,
+      );
+      return jsonWithETag(
+        request,
+        sendJson(
+          JSON.stringify({ success: true, results: searchCodes(query, limit) }),
+        ),
+        `q:${query}:${limit}`,
+      );
+    }
 
-    return Response.json({
-      success: true,
-      gtipCodes: gtipHierarchy,
-    });
+    if (wantsNdjson(request)) {
+      return jsonWithETag(
+        request,
+        sendFullTreeNdjson,
+        "ndjson",
+        NDJSON_CONTENT_TYPE,
+      );
+    }
+    return jsonWithETag(request, sendFullTree);
   } catch (error) {
     console.error("GTIP codes error:", error);
     return Response.json(
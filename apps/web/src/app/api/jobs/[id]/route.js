@@ -0,0 +1,83 @@
+import {
+  cancelJob,
+  getJob,
+  isTerminal,
+  publicJob,
+  subscribeJob,
+} from "@/app/api/utils/jobs";
+
+const HEARTBEAT_MS = 15000;
+
+const wantsStream = (request) =>
+  new URL(request.url).searchParams.get("stream") === "true" ||
+  (request.headers.get("accept") || "").includes("text/event-stream");
+
+// Server-sent events: one `status` event per change, ending with the
+// terminal state.
+function streamJob(job) {
+  const encoder = new TextEncoder();
+  let cleanup = () => {};
+
+  const stream = new ReadableStream({
+    start(controller) {
+      const send = (state) => {
+        controller.enqueue(
+          encoder.encode(`event: status\ndata: ${JSON.stringify(state)}\n\n`),
+        );
+        if (isTerminal(state)) {
+          cleanup();
+          controller.close();
+        }
+      };
+      const heartbeat = setInterval(() => {
+        controller.enqueue(encoder.encode(": keep-alive\n\n"));
+      }, HEARTBEAT_MS);
+      const unsubscribe = subscribeJob(job.id, send);
+      cleanup = () => {
+        clearInterval(heartbeat);
+        unsubscribe();
+      };
+      send(publicJob(job));
+    },
+    cancel() {
+      cleanup();
+    },
+  });
+
+  return new Response(stream, {
+    headers: {
+      "Content-Type": "text/event-stream",
+      "Cache-Control": "no-cache",
+      Connection: "keep-alive",
+    },
+  });
+}
+
+export async function GET(request, { params }) {
+  const job = getJob(params.id);
+  if (!job) {
+    return Response.json({ error: "Job not found" }, { status: 404 });
+  }
+  if (wantsStream(request)) {
+    return streamJob(job);
+  }
+  return Response.json(
+    { job: publicJob(job) },
+    isTerminal(job) ? {} : { headers: { "Retry-After": "1" } },
+  );
+}
+
+export async function DELETE(request, { params }) {
+  const job = getJob(params.id);
+  if (!job) {
+    return Response.json({ error: "Job not found" }, { status: 404 });
+  }
+  if (isTerminal(job)) {
+    return Response.json(
+      { error: `Job already ${job.status}`, job: publicJob(job) },
+      { status: 409 },
+    );
+  }
+  cancelJob(job.id);
+  return Response.json({ job: publicJob(job) });
+}
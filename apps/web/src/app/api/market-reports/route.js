@@ -1,4 +1,25 @@
 import sql from "@/app/api/utils/sql";
+import {
+  fetchPage,
+  PaginationError,
+  parsePageParams,
+} from "@/app/api/utils/pagination";
+
+const REPORT_FIELDS = [
+  "id",
+  "company_id",
+  "report_title",
+  "report_type",
+  "country",
+  "product_category",
+  "total_imports",
+  "total_exports",
+  "average_unit_price",
+  "trend_direction",
+  "key_competitors",
+  "recommendations",
+  "created_at",
+];
 
 export async function GET(request) {
   try {
@@ -9,14 +30,23 @@ export async function GET(request) {
       return Response.json({ error: "Company ID required" }, { status: 400 });
     }
 
-    const reports = await sql`
-      SELECT * FROM market_reports 
-      WHERE company_id = ${companyId}
-      ORDER BY created_at DESC
-    `;
+    const page = await fetchPage(sql, {
+      table: "market_reports",
+      where: "WHERE company_id = $1",
+      values: [companyId],
+      statementName: "market_reports_by_company",
+      ...parsePageParams(searchParams, REPORT_FIELDS),
+    });
 
-    return Response.json({ reports });
+    return Response.json({
+      reports: page.rows,
+      next_cursor: page.next_cursor,
+      has_more: page.has_more,
+    });
   } catch (error) {
+    if (error instanceof PaginationError) {
+      return Response.json({ error: error.message }, { status: 400 });
+    }
     console.error("Error fetching market reports:", error);
     return Response.json(
       { error: "Failed to fetch market reports" },
@@ -0,0 +1,41 @@
+import { timingSafeEqual } from "node:crypto";
+import { admissionStats } from "@/app/api/utils/admission";
+import { aiCacheStats } from "@/app/api/utils/ai-cache";
+import { jobStats } from "@/app/api/utils/jobs";
+import { productIndexStats } from "@/app/api/utils/product-index";
+import { resetTimings, timingSnapshot } from "@/app/api/utils/timing";
+
+// In-process metrics for this server: latency histograms per route and per
+// phase since the last reset, plus the job queue, AI admission, AI cache and
+// product index gauges. Open in development; elsewhere requests must send
+// METRICS_TOKEN in an X-Metrics-Token header.
+const allowed = (request) => {
+  if (process.env.NODE_ENV === "development") return true;
+  const expected = process.env.METRICS_TOKEN;
+  const given = request.headers.get("x-metrics-token");
+  if (!expected || !given) return false;
+  const a = Buffer.from(given);
+  const b = Buffer.from(expected);
+  return a.length === b.length && timingSafeEqual(a, b);
+};
+
+const unauthorized = () =>
+  Response.json({ error: "Unauthorized" }, { status: 401 });
+
+export async function GET(request) {
+  if (!allowed(request)) return unauthorized();
+  return Response.json({
+    ...timingSnapshot(),
+    jobs: jobStats(),
+    ai_admission: admissionStats(),
+    ai_cache: aiCacheStats(),
+    product_index: productIndexStats(),
+  });
+}
+
+// Clear the histograms, e.g. before a benchmark run.
+export async function DELETE(request) {
+  if (!allowed(request)) return unauthorized();
+  resetTimings();
+  return Response.json({ reset: true });
+}
@@ -1,101 +1,61 @@
 import sql from "@/app/api/utils/sql";
-
+import {
+  fetchPage,
+  PaginationError,
+  parsePageParams,
+} from "@/app/api/utils/pagination";
+import {
+  insertNotification,
+  NotificationUserError,
+  notificationUserRejected,
+  publishNotification,
+  resolveUserId,
+  toNotification,
+  unreadCounts,
+} from "@/app/api/utils/notifications";
+
+const DEFAULT_LIMIT = 10;
+
+// Pages follow `next_cursor`; `offset` and `total` are kept for clients of
+// the original offset-based contract.
 export async function GET(request) {
   try {
-    // Mock user ID for now
-    const userId = 1;
-
     const { searchParams } = new URL(request.url);
-    const limit = parseInt(searchParams.get("limit")) || 10;
-    const offset = parseInt(searchParams.get("offset")) || 0;
+    const userId = await resolveUserId(searchParams.get("user_id"));
     const unreadOnly = searchParams.get("unread_only") === "true";
-
-    // Mock notifications data
-    const notifications = [
-      {
-        id: 1,
-        user_id: userId,
-        type: "market_alert",
-        title: "New Market Opportunity",
-        message:
-          "Germany textile market shows 15% growth potential for your products",
-        data: { country: "Germany", industry: "Textiles", growth: 15.2 },
-        read: false,
-        created_at: new Date(Date.now() - 2 * 60 * 60 * 1000), // 2 hours ago
-      },
-      {
-        id: 2,
-        user_id: userId,
-        type: "buyer_match",
-        title: "New Buyer Match",
-        message:
-          "Fashion retailer in UK shows interest in your cotton products",
-        data: {
-          buyer: "Fashion Plus Ltd",
-          country: "UK",
-          product: "Cotton T-shirts",
-        },
-        read: false,
-        created_at: new Date(Date.now() - 4 * 60 * 60 * 1000), // 4 hours ago
-      },
-      {
-        id: 3,
-        user_id: userId,
-        type: "campaign_update",
-        title: "Campaign Performance Update",
-        message:
-          "Your email campaign achieved 24% open rate, above industry average",
-        data: { campaign: "Q4 Outreach", open_rate: 24.5, industry_avg: 18.2 },
-        read: true,
-        created_at: new Date(Date.now() - 24 * 60 * 60 * 1000), // 1 day ago
-      },
-      {
-        id: 4,
-        user_id: userId,
-        type: "price_alert",
-        title: "Price Optimization Suggestion",
-        message:
-          "Consider adjusting prices for EU markets based on competitor analysis",
-        data: { market: "EU", suggested_change: -5.2, competitor_avg: 24.8 },
-        read: true,
-        created_at: new Date(Date.now() - 2 * 24 * 60 * 60 * 1000), // 2 days ago
-      },
-      {
-        id: 5,
-        user_id: userId,
-        type: "ai_insight",
-        title: "AI Market Prediction",
-        message:
-          "AI forecasts 22% increase in demand for sustainable textiles in Q1 2025",
-        data: {
-          trend: "sustainable_textiles",
-          predicted_growth: 22,
-          period: "Q1 2025",
-        },
-        read: true,
-        created_at: new Date(Date.now() - 3 * 24 * 60 * 60 * 1000), // 3 days ago
-      },
-    ];
-
-    // Filter and paginate
-    let filteredNotifications = notifications;
-    if (unreadOnly) {
-      filteredNotifications = notifications.filter((n) => !n.read);
-    }
-
-    const paginatedNotifications = filteredNotifications.slice(
-      offset,
-      offset + limit,
-    );
-    const unreadCount = notifications.filter((n) => !n.read).length;
+    const pageParams = parsePageParams(searchParams, [], DEFAULT_LIMIT);
+    const offset = Math.max(parseInt(searchParams.get("offset")) || 0, 0);
+
+    const [page, counts] = await Promise.all([
+      fetchPage(sql, {
+        table: "notifications",
+        where: unreadOnly
+          ? "WHERE user_id = $1 AND NOT is_read"
+          : "WHERE user_id = $1",
+        values: [userId],
+        statementName: unreadOnly
+          ? "notifications_unread_by_user"
+          : "notifications_by_user",
+        ...pageParams,
+        offset,
+      }),
+      unreadCounts(userId),
+    ]);
 
     return Response.json({
-      notifications: paginatedNotifications,
-      total: filteredNotifications.length,
-      unread_count: unreadCount,
-      has_more: offset + limit < filteredNotifications.length,
+      notifications: page.rows.map(toNotification),
+      total: unreadOnly ? counts.unread_count : counts.total,
+      unread_count: counts.unread_count,
+      next_cursor: page.next_cursor,
+      has_more: page.has_more,
     });
   } catch (error) {
+    if (error instanceof PaginationError) {
+      return Response.json({ error: error.message }, { status: 400 });
+    }
+    if (error instanceof NotificationUserError) {
+      return notificationUserRejected(error);
+    }
     console.error("GET /api/notifications error:", error);
     return Response.json({ error: "Internal Server Error" }, { status: 500 });
   }
@@ -103,26 +63,50 @@ export async function GET(request) {
 
 export async function PUT(request) {
   try {
-    // Mock user ID for now
-    const userId = 1;
-
     const body = await request.json();
-    const { notification_ids, mark_as_read } = body;
+    const { notification_ids, mark_as_read = true, mark_all } = body;
+    const userId = await resolveUserId(body.user_id);
 
-    if (!notification_ids || !Array.isArray(notification_ids)) {
+    if (!mark_all && !Array.isArray(notification_ids)) {
       return Response.json(
         { error: "notification_ids must be an array" },
         { status: 400 },
       );
     }
 
-    // Mock update - in real app would update database
-    console.log(
-      `Marking notifications ${notification_ids.join(", ")} as ${mark_as_read ? "read" : "unread"} for user ${userId}`,
-    );
+    // Rows already in the requested state are left alone, so the counter
+    // trigger only sees real changes.
+    const read = mark_as_read !== false;
+    const updated = mark_all
+      ? await sql`
+          UPDATE notifications
+          SET is_read = ${read}, read_at = ${read ? new Date() : null}
+          WHERE user_id = ${userId} AND is_read IS DISTINCT FROM ${read}
+          RETURNING id
+        `
+      : await sql`
+          UPDATE notifications
+          SET is_read = ${read}, read_at = ${read ? new Date() : null}
+          WHERE user_id = ${userId}
+            AND id = ANY(${notification_ids}::uuid[])
+            AND is_read IS DISTINCT FROM ${read}
+          RETURNING id
+        `;
+
+    const { unread_count } = await unreadCounts(userId);
+    if (updated.length > 0) {
+      publishNotification(userId, "unread", { unread_count });
+    }
 
-    return Response.json({ success: true, updated: notification_ids.length });
+    return Response.json({
+      success: true,
+      updated: updated.length,
+      unread_count,
+    });
   } catch (error) {
+    if (error instanceof NotificationUserError) {
+      return notificationUserRejected(error);
+    }
     console.error("PUT /api/notifications error:", error);
     return Response.json({ error: "Internal Server Error" }, { status: 500 });
   }
@@ -130,11 +114,9 @@ export async function PUT(request) {
 
 export async function POST(request) {
   try {
-    // Mock user ID for now
-    const userId = 1;
-
     const body = await request.json();
-    const { type, title, message, data } = body;
+    const { type, title, message } = body;
+    const userId = await resolveUserId(body.user_id);
 
     if (!type || !title || !message) {
       return Response.json(
@@ -143,22 +125,21 @@ export async function POST(request) {
       );
     }
 
-    const notification = {
-      id: Date.now(), // Mock ID
-      user_id: userId,
-      type,
-      title,
-      message,
-      data: data || {},
-      read: false,
-      created_at: new Date(),
-    };
-
-    // Mock creation - in real app would insert to database
-    console.log("Created notification:", notification);
+    const row = await insertNotification(userId, body);
+    const notification = toNotification(row);
+    const { unread_count } = await unreadCounts(userId);
+    publishNotification(
+      userId,
+      "notification",
+      { notification, unread_count },
+      row,
+    );
 
-    return Response.json({ notification });
+    return Response.json({ notification, unread_count });
   } catch (error) {
+    if (error instanceof NotificationUserError) {
+      return notificationUserRejected(error);
+    }
     console.error("POST /api/notifications error:", error);
     return Response.json({ error: "Internal Server Error" }, { status: 500 });
   }
@@ -0,0 +1,132 @@
+import sql from "@/app/api/utils/sql";
+import {
+  decodeCursor,
+  encodeCursor,
+  PaginationError,
+} from "@/app/api/utils/pagination";
+import {
+  NotificationUserError,
+  notificationUserRejected,
+  resolveUserId,
+  subscribeNotifications,
+  toNotification,
+  unreadCounts,
+} from "@/app/api/utils/notifications";
+
+const HEARTBEAT_MS = 15000;
+const REPLAY_LIMIT = 100;
+
+// Notifications stored after the last one a reconnecting client saw, oldest
+// first. One row more than REPLAY_LIMIT is read to tell whether the backlog
+// fits.
+const missedSince = (userId, cursor) => sql`
+  SELECT * FROM notifications
+  WHERE user_id = ${userId}
+    AND (created_at, id) > (
+      COALESCE(
+        (SELECT created_at FROM notifications WHERE id = ${cursor.id}),
+        ${cursor.createdAt}::timestamptz
+      ),
+      ${cursor.id}
+    )
+  ORDER BY created_at, id
+  LIMIT ${REPLAY_LIMIT + 1}
+`;
+
+const newestNotification = async (userId) => {
+  const [row] = await sql`
+    SELECT id, created_at FROM notifications
+    WHERE user_id = ${userId}
+    ORDER BY created_at DESC, id DESC
+    LIMIT 1
+  `;
+  return row;
+};
+
+// Server-sent events: an `unread` event with the current counts on connect,
+// then a `notification` event per new notification (its id is the keyset
+// cursor, so EventSource resumes from it via Last-Event-ID) and an `unread`
+// event whenever notifications are marked read or unread. A client that
+// missed more than REPLAY_LIMIT notifications gets a `reset` event instead
+// of the backlog and should refetch its list.
+export async function GET(request) {
+  let userId;
+  let cursor = null;
+  try {
+    const { searchParams } = new URL(request.url);
+    userId = await resolveUserId(searchParams.get("user_id"));
+    const lastEventId =
+      request.headers.get("last-event-id") ||
+      searchParams.get("last_event_id");
+    if (lastEventId) cursor = decodeCursor(lastEventId);
+  } catch (error) {
+    if (error instanceof PaginationError) {
+      return Response.json({ error: error.message }, { status: 400 });
+    }
+    if (error instanceof NotificationUserError) {
+      return notificationUserRejected(error);
+    }
+    throw error;
+  }
+
+  const encoder = new TextEncoder();
+  let cleanup = () => {};
+
+  const stream = new ReadableStream({
+    async start(controller) {
+      const write = (text) => {
+        try {
+          controller.enqueue(encoder.encode(text));
+        } catch {
+          cleanup();
+        }
+      };
+      const send = (event, payload, row) => {
+        const id = row ? `id: ${encodeCursor(row)}\n` : "";
+        write(`${id}event: ${event}\ndata: ${JSON.stringify(payload)}\n\n`);
+      };
+
+      // Subscribe before reading the backlog so nothing published meanwhile
+      // is lost; clients drop the occasional duplicate by notification id.
+      const unsubscribe = subscribeNotifications(userId, send);
+      const heartbeat = setInterval(
+        () => write(": keep-alive\n\n"),
+        HEARTBEAT_MS,
+      );
+      cleanup = () => {
+        clearInterval(heartbeat);
+        unsubscribe();
+      };
+
+      try {
+        const [counts, missed] = await Promise.all([
+          unreadCounts(userId),
+          cursor ? missedSince(userId, cursor) : [],
+        ]);
+        if (missed.length > REPLAY_LIMIT) {
+          send("reset", {}, await newestNotification(userId));
+        } else {
+          for (const row of missed) {
+            send("notification", { notification: toNotification(row) }, row);
+          }
+        }
+        send("unread", counts);
+      } catch (error) {
+        console.error("GET /api/notifications/stream error:", error);
+        cleanup();
+        controller.close();
+      }
+    },
+    cancel() {
+      cleanup();
+    },
+  });
+
+  return new Response(stream, {
+    headers: {
+      "Content-Type": "text/event-stream",
+      "Cache-Control": "no-cache",
+      Connection: "keep-alive",
+    },
+  });
+}
@@ -1,4 +1,16 @@
 import sql from "@/app/api/utils/sql";
+import { enqueueRequest, wantsAsync } from "@/app/api/utils/jobs";
+import { cachedGeneration } from "@/app/api/utils/ai-cache";
+import {
+  AdmissionError,
+  admissionRejected,
+  admitted,
+} from "@/app/api/utils/admission";
+import { integrationFetch, readCompletion } from "@/app/api/utils/integrations";
+import {
+  chapterCountrySummaries,
+  describeTradeSummary,
+} from "@/app/api/utils/trade-summary";
 
 export async function GET(request) {
   try {
@@ -50,6 +62,17 @@ export async function GET(request) {
 }
 
 export async function POST(request) {
+  if (wantsAsync(request)) {
+    return enqueueRequest(
+      "price-optimization",
+      request,
+      createPriceOptimization,
+    );
+  }
+  return createPriceOptimization(request);
+}
+
+async function createPriceOptimization(request) {
   try {
     const body = await request.json();
     const {
@@ -79,20 +102,26 @@ export async function POST(request) {
       return Response.json({ error: "Product not found" }, { status: 404 });
     }
 
-    // Get trade data for price context
-    const tradeData = await sql(
-      "SELECT * FROM trade_data WHERE hs_code = $1 AND country = $2 ORDER BY year DESC LIMIT 10",
-      [product.hs_code, target_market || "Global"],
+    // Get the product's HS chapter statistics in the target market for price context
+    const tradeSummaries = await chapterCountrySummaries(
+      sql,
+      product.hs_code,
+      target_market || "Global",
     );
 
     // Generate AI-powered price optimization
-    const optimizationResult = await generatePriceOptimization({
+    const inputs = {
       product,
       target_market: target_market || "Global",
       competitor_data: competitor_data || {},
       market_conditions: market_conditions || {},
-      trade_data: tradeData,
-    });
+      trade_summaries: tradeSummaries,
+    };
+    const { value: optimizationResult, cache } = await cachedGeneration(
+      "price-optimization",
+      inputs,
+      () => admitted(company_id, () => generatePriceOptimization(inputs)),
+    );
 
     // Save optimization to database
     const [optimization] = await sql(
@@ -139,12 +168,18 @@ export async function POST(request) {
       ],
     );
 
-    return Response.json({
-      optimization,
-      analysis_summary: optimizationResult.summary,
-      status: "success",
-    });
+    return Response.json(
+      {
+        optimization,
+        analysis_summary: optimizationResult.summary,
+        status: "success",
+      },
+      { headers: { "X-AI-Cache": cache } },
+    );
   } catch (error) {
+    if (error instanceof AdmissionError) {
+      return admissionRejected(error);
+    }
     console.error("Error creating price optimization:", error);
     return Response.json(
       { error: "Failed to create optimization" },
@@ -158,7 +193,7 @@ async function generatePriceOptimization({
   target_market,
   competitor_data,
   market_conditions,
-  trade_data,
+  trade_summaries,
 }) {
   try {
     const systemPrompt = `You are an expert pricing strategist specializing in international trade and market optimization. Analyze market conditions and provide optimal pricing recommendations with detailed strategic insights.`;
@@ -177,13 +212,7 @@ PRODUCT DETAILS:
 TARGET MARKET: ${target_market}
 
 MARKET DATA CONTEXT:
-${trade_data
-  .slice(0, 5)
-  .map(
-    (t) =>
-      `Year ${t.year}: Import Value $${t.import_value}M, Volume ${t.import_volume}K units, Growth ${t.growth_rate}%`,
-  )
-  .join("\n")}
+${trade_summaries.map(describeTradeSummary).join("\n")}
 
 COMPETITOR DATA: ${JSON.stringify(competitor_data)}
 MARKET CONDITIONS: ${JSON.stringify(market_conditions)}
@@ -214,7 +243,7 @@ Provide comprehensive pricing optimization analysis:
 Focus on actionable pricing strategies that maximize both competitiveness and profitability.
     `;
 
-    const response = await fetch("/integrations/chat-gpt/conversationgpt4", {
+    const response = await integrationFetch("/integrations/chat-gpt/conversationgpt4", {
       method: "POST",
       headers: { "Content-Type": "application/json" },
       body: JSON.stringify({
@@ -295,8 +324,7 @@ Focus on actionable pricing strategies that maximize both competitiveness and pr
       }),
     });
 
-    const aiResult = await response.json();
-    const analysis = JSON.parse(aiResult.choices[0].message.content);
+    const analysis = await readCompletion(response);
 
     return analysis;
   } catch (error) {
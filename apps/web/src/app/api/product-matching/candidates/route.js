@@ -0,0 +1,49 @@
+import sql from "@/app/api/utils/sql";
+import { searchProducts, similarProducts } from "@/app/api/utils/product-index";
+
+const DEFAULT_K = 10;
+const MAX_K = 50;
+
+// Ranked candidates from the local product index: the products most similar
+// to `product_id`, or matching the free-text `q`, within one company.
+export async function GET(request) {
+  try {
+    const { searchParams } = new URL(request.url);
+    const companyId = searchParams.get("company_id");
+    const productId = searchParams.get("product_id");
+    const query = searchParams.get("q");
+    const k = Math.min(
+      Math.max(parseInt(searchParams.get("k")) || DEFAULT_K, 1),
+      MAX_K,
+    );
+
+    if (!companyId || (!productId && !query)) {
+      return Response.json(
+        { error: "company_id and either product_id or q are required" },
+        { status: 400 },
+      );
+    }
+
+    let candidates;
+    if (productId) {
+      const [product] = await sql(
+        "SELECT * FROM products WHERE id = $1 AND company_id = $2",
+        [productId, companyId],
+      );
+      if (!product) {
+        return Response.json({ error: "Product not found" }, { status: 404 });
+      }
+      candidates = await similarProducts(product, k);
+    } else {
+      candidates = await searchProducts(companyId, query, k);
+    }
+
+    return Response.json({ candidates });
+  } catch (error) {
+    console.error("Error ranking product candidates:", error);
+    return Response.json(
+      { error: "Failed to rank candidates" },
+      { status: 500 },
+    );
+  }
+}
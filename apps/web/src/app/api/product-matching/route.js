@@ -1,4 +1,39 @@
 import sql from "@/app/api/utils/sql";
+import { enqueueRequest, wantsAsync } from "@/app/api/utils/jobs";
+import { cachedGeneration } from "@/app/api/utils/ai-cache";
+import {
+  AdmissionError,
+  admissionRejected,
+  admitted,
+} from "@/app/api/utils/admission";
+import { integrationFetch, readCompletion } from "@/app/api/utils/integrations";
+import { insertMany } from "@/app/api/utils/bulk-insert";
+import { similarProducts } from "@/app/api/utils/product-index";
+import {
+  chapterMarketSummaries,
+  describeTradeSummary,
+} from "@/app/api/utils/trade-summary";
+
+// Candidate set the AI sees instead of the whole catalogue
+const CANDIDATE_PRODUCTS = 8;
+const CANDIDATE_MARKETS = 8;
+
+const MATCH_INSERT_COLUMNS = [
+  "company_id",
+  "product_id",
+  "target_market",
+  "match_score",
+  "market_size",
+  "competition_level",
+  "entry_barriers",
+  "growth_potential",
+  "cultural_fit",
+  "regulatory_complexity",
+  "key_advantages",
+  "risk_factors",
+  "recommendations",
+  "data_sources",
+];
 
 export async function GET(request) {
   try {
@@ -45,6 +80,13 @@ export async function GET(request) {
 }
 
 export async function POST(request) {
+  if (wantsAsync(request)) {
+    return enqueueRequest("product-matching", request, createProductMatches);
+  }
+  return createProductMatches(request);
+}
+
+async function createProductMatches(request) {
   try {
     const body = await request.json();
     const { company_id, product_id, target_markets } = body;
@@ -68,70 +110,85 @@ export async function POST(request) {
       return Response.json({ error: "Product not found" }, { status: 404 });
     }
 
-    // Get existing trade data for context
-    const tradeData = await sql(
-      "SELECT * FROM trade_data WHERE hs_code = $1 ORDER BY year DESC LIMIT 50",
-      [product.hs_code],
-    );
+    // The largest import markets for the product's HS chapter for context,
+    // and its closest products in the company's catalogue from the local
+    // index
+    const [tradeSummaries, similar] = await Promise.all([
+      chapterMarketSummaries(sql, product.hs_code),
+      similarProducts(product, CANDIDATE_PRODUCTS),
+    ]);
+    const markets =
+      target_markets?.length > 0
+        ? target_markets
+        : await candidateMarkets(company_id, similar, tradeSummaries);
 
     // Generate AI-powered product-market matches
-    const matchResults = await generateProductMatches({
+    const inputs = {
       product,
-      target_markets: target_markets || [],
-      trade_data: tradeData,
-    });
+      similar_products: similar,
+      target_markets: markets,
+      trade_summaries: tradeSummaries,
+    };
+    const { value: matchResults, cache } = await cachedGeneration(
+      "product-matching",
+      inputs,
+      () => admitted(company_id, () => generateProductMatches(inputs)),
+    );
 
-    // Save matches to database
-    const savedMatches = [];
-    for (const match of matchResults.matches) {
-      const [savedMatch] = await sql(
-        `INSERT INTO product_matches (
-          company_id, product_id, target_market, match_score, 
-          market_size, competition_level, entry_barriers, 
-          growth_potential, cultural_fit, regulatory_complexity,
-          key_advantages, risk_factors, recommendations,
-          data_sources, created_at
-        ) VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, $13, $14, CURRENT_TIMESTAMP)
-        ON CONFLICT (company_id, product_id, target_market) 
-        DO UPDATE SET 
-          match_score = EXCLUDED.match_score,
-          market_size = EXCLUDED.market_size,
-          competition_level = EXCLUDED.competition_level,
-          entry_barriers = EXCLUDED.entry_barriers,
-          growth_potential = EXCLUDED.growth_potential,
-          cultural_fit = EXCLUDED.cultural_fit,
-          regulatory_complexity = EXCLUDED.regulatory_complexity,
-          key_advantages = EXCLUDED.key_advantages,
-          risk_factors = EXCLUDED.risk_factors,
-          recommendations = EXCLUDED.recommendations,
-          updated_at = CURRENT_TIMESTAMP
-        RETURNING *`,
-        [
-          company_id,
-          product_id,
-          match.target_market,
-          match.match_score,
-          match.market_size,
-          match.competition_level,
-          match.entry_barriers,
-          match.growth_potential,
-          match.cultural_fit,
-          match.regulatory_complexity,
-          match.key_advantages,
-          match.risk_factors,
-          match.recommendations,
-          "AI Analysis, Trade Statistics, Market Intelligence",
-        ],
-      );
-      savedMatches.push(savedMatch);
-    }
+    // Save all matches in one upsert so they commit together. A statement
+    // cannot update the same row twice, so keep one match per market.
+    const matchesByMarket = new Map(
+      matchResults.matches.map((match) => [match.target_market, match]),
+    );
+    const savedMatches = await insertMany(
+      sql,
+      "product_matches",
+      MATCH_INSERT_COLUMNS,
+      [...matchesByMarket.values()].map((match) => [
+        company_id,
+        product_id,
+        match.target_market,
+        match.match_score,
+        match.market_size,
+        match.competition_level,
+        match.entry_barriers,
+        match.growth_potential,
+        match.cultural_fit,
+        match.regulatory_complexity,
+        match.key_advantages,
+        match.risk_factors,
+        match.recommendations,
+        "AI Analysis, Trade Statistics, Market Intelligence",
+      ]),
+      `ON CONFLICT (company_id, product_id, target_market)
+      DO UPDATE SET
+        match_score = EXCLUDED.match_score,
+        market_size = EXCLUDED.market_size,
+        competition_level = EXCLUDED.competition_level,
+        entry_barriers = EXCLUDED.entry_barriers,
+        growth_potential = EXCLUDED.growth_potential,
+        cultural_fit = EXCLUDED.cultural_fit,
+        regulatory_complexity = EXCLUDED.regulatory_complexity,
+        key_advantages = EXCLUDED.key_advantages,
+        risk_factors = EXCLUDED.risk_factors,
+        recommendations = EXCLUDED.recommendations,
+        updated_at = CURRENT_TIMESTAMP
+      RETURNING *`,
+    );
 
-    return Response.json({
-      matches: savedMatches,
-      analysis_summary: matchResults.summary,
-      status: "success",
-    });
+    return Response.json(
+      {
+        matches: savedMatches,
+        analysis_summary: matchResults.summary,
+        candidates: { products: similar, markets },
+        status: "success",
+      },
+      { headers: { "X-AI-Cache": cache } },
+    );
   } catch (error) {
+    if (error instanceof AdmissionError) {
+      return admissionRejected(error);
+    }
     console.error("Error creating product matches:", error);
     return Response.json(
       { error: "Failed to create matches" },
@@ -140,7 +197,50 @@ export async function POST(request) {
   }
 }
 
-async function generateProductMatches({ product, target_markets, trade_data }) {
+/**
+ * Markets to evaluate when the caller names none: those already matched for
+ * similar products, ranked by similarity times match score, then the
+ * chapter's largest import markets.
+ */
+async function candidateMarkets(companyId, similar, tradeSummaries) {
+  const scores = new Map();
+  if (similar.length > 0) {
+    const similarity = new Map(similar.map((p) => [p.id, p.similarity]));
+    const matches = await sql(
+      `SELECT product_id, target_market, match_score
+       FROM product_matches
+       WHERE company_id = $1 AND product_id = ANY($2::uuid[])`,
+      [companyId, [...similarity.keys()]],
+    );
+    for (const match of matches) {
+      const score =
+        similarity.get(match.product_id) * Number(match.match_score || 0);
+      scores.set(
+        match.target_market,
+        (scores.get(match.target_market) || 0) + score,
+      );
+    }
+  }
+
+  const ranked = [...scores]
+    .sort((a, b) => b[1] - a[1])
+    .map(([market]) => market);
+  for (const summary of tradeSummaries) {
+    if (!ranked.includes(summary.country)) ranked.push(summary.country);
+  }
+  return ranked.slice(0, CANDIDATE_MARKETS);
+}
+
+const describeSimilarProduct = (p) =>
+  `- ${p.product_name} (HS ${p.hs_code || "n/a"}, ` +
+  `${p.category || "uncategorized"}), similarity ${p.similarity}`;
+
+async function generateProductMatches({
+  product,
+  similar_products,
+  target_markets,
+  trade_summaries,
+}) {
   try {
     const systemPrompt = `You are an expert international trade analyst specializing in product-market matching. Analyze products and identify the best target markets with detailed scoring and insights.`;
 
@@ -156,13 +256,10 @@ PRODUCT DETAILS:
 - Technical Specs: ${product.technical_specs || "Standard specifications"}
 
 TRADE DATA CONTEXT:
-${trade_data
-  .slice(0, 10)
-  .map(
-    (t) =>
-      `${t.country}: Import Value $${t.import_value}M, Growth ${t.growth_rate}%`,
-  )
-  .join("\n")}
+${trade_summaries.map(describeTradeSummary).join("\n")}
+
+SIMILAR PRODUCTS IN THE CATALOGUE:
+${similar_products.length > 0 ? similar_products.map(describeSimilarProduct).join("\n") : "None"}
 
 TARGET MARKETS TO EVALUATE: ${target_markets.length > 0 ? target_markets.join(", ") : "All major markets (US, Germany, UK, France, Italy, Japan, China, Canada, Australia, Netherlands)"}
 
@@ -186,7 +283,7 @@ Provide comprehensive market matching analysis with:
 Focus on data-driven insights and practical business recommendations.
     `;
 
-    const response = await fetch("/integrations/chat-gpt/conversationgpt4", {
+    const response = await integrationFetch("/integrations/chat-gpt/conversationgpt4", {
       method: "POST",
       headers: { "Content-Type": "application/json" },
       body: JSON.stringify({
@@ -273,8 +370,7 @@ Focus on data-driven insights and practical business recommendations.
       }),
     });
 
-    const aiResult = await response.json();
-    const analysis = JSON.parse(aiResult.choices[0].message.content);
+    const analysis = await readCompletion(response);
 
     return analysis;
   } catch (error) {
@@ -0,0 +1,103 @@
+import sql from "@/app/api/utils/sql";
+import { isNdjson, readNdjson } from "@/app/api/utils/ndjson";
+import { isUuid } from "@/app/api/utils/pagination";
+import {
+  insertProductBatch,
+  normalizeProductRow,
+  PRODUCT_IMPORT_BATCH_SIZE,
+  ProductRowError,
+  readCsv,
+} from "@/app/api/utils/product-import";
+import { invalidateProductIndex } from "@/app/api/utils/product-index";
+
+const isCsv = (contentType) => /text\/csv/.test(contentType || "");
+
+// Import a product catalogue for one company from a streamed NDJSON or CSV
+// body. Rows are inserted in multi-row batches inside a single transaction;
+// invalid rows are skipped and reported by line.
+export async function POST(request) {
+  try {
+    const { searchParams } = new URL(request.url);
+    const companyId = searchParams.get("company_id");
+    const contentType = request.headers.get("content-type");
+    const format =
+      searchParams.get("format") ||
+      (isCsv(contentType) ? "csv" : isNdjson(contentType) ? "ndjson" : null);
+
+    if (!companyId) {
+      return Response.json({ error: "Company ID required" }, { status: 400 });
+    }
+    if (!isUuid(companyId)) {
+      return Response.json(
+        { error: "Company ID must be a UUID" },
+        { status: 400 },
+      );
+    }
+    if (format !== "csv" && format !== "ndjson") {
+      return Response.json(
+        { error: "Send text/csv or application/x-ndjson" },
+        { status: 415 },
+      );
+    }
+    if (!request.body) {
+      return Response.json({ error: "Request body required" }, { status: 400 });
+    }
+
+    const records =
+      format === "csv" ? readCsv(request.body) : readNdjson(request.body);
+
+    const summary = await sql.withTransaction(async (query) => {
+      const [company] = await query("SELECT id FROM companies WHERE id = $1", [
+        companyId,
+      ]);
+      if (!company) return null;
+
+      let inserted = 0;
+      let received = 0;
+      const errors = [];
+      let batch = [];
+
+      const flush = async () => {
+        const result = await insertProductBatch(query, companyId, batch);
+        inserted += result.inserted;
+        errors.push(...result.errors);
+        batch = [];
+      };
+
+      for await (const record of records) {
+        received += 1;
+        if (record.error) {
+          errors.push({ line: record.line, error: record.error });
+          continue;
+        }
+        try {
+          batch.push({
+            line: record.line,
+            values: normalizeProductRow(record.value),
+          });
+        } catch (error) {
+          if (!(error instanceof ProductRowError)) throw error;
+          errors.push({ line: record.line, error: error.message });
+          continue;
+        }
+        if (batch.length >= PRODUCT_IMPORT_BATCH_SIZE) await flush();
+      }
+      await flush();
+
+      errors.sort((a, b) => a.line - b.line);
+      return { received, inserted, failed: errors.length, errors };
+    });
+
+    if (!summary) {
+      return Response.json({ error: "Company not found" }, { status: 404 });
+    }
+    if (summary.inserted > 0) invalidateProductIndex(companyId);
+    return Response.json(summary);
+  } catch (error) {
+    console.error("Error importing products:", error);
+    return Response.json(
+      { error: "Failed to import products" },
+      { status: 500 },
+    );
+  }
+}
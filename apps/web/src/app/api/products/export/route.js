@@ -0,0 +1,95 @@
+import Papa from "papaparse";
+import sql from "@/app/api/utils/sql";
+import { NDJSON_CONTENT_TYPE, toReadableStream } from "@/app/api/utils/ndjson";
+import { isUuid, streamPages } from "@/app/api/utils/pagination";
+import { PRODUCT_IMPORT_COLUMNS } from "@/app/api/utils/product-import";
+import { compressResponse } from "@/app/api/utils/respond";
+
+const EXPORT_PAGE_SIZE = 1000;
+const EXPORT_FIELDS = ["id", ...PRODUCT_IMPORT_COLUMNS, "created_at"];
+
+// The company's products in batches of EXPORT_PAGE_SIZE rows, read a page
+// at a time.
+async function* productPages(companyId) {
+  let batch = [];
+  const rows = streamPages(sql, {
+    table: "products",
+    where: "WHERE company_id = $1",
+    values: [companyId],
+    limit: EXPORT_PAGE_SIZE,
+    fields: EXPORT_FIELDS,
+  });
+  for await (const row of rows) {
+    batch.push(row);
+    if (batch.length === EXPORT_PAGE_SIZE) {
+      yield batch;
+      batch = [];
+    }
+  }
+  if (batch.length > 0) yield batch;
+}
+
+async function* ndjsonLines(companyId) {
+  for await (const rows of productPages(companyId)) {
+    yield rows.map((row) => `${JSON.stringify(row)}\n`).join("");
+  }
+}
+
+// The CSV layout matches what /api/products/bulk accepts.
+async function* csvLines(companyId) {
+  yield `${Papa.unparse([EXPORT_FIELDS])}\r\n`;
+  for await (const rows of productPages(companyId)) {
+    const records = rows.map((row) => ({
+      ...row,
+      certifications: row.certifications?.join(";") ?? null,
+    }));
+    yield `${Papa.unparse(records, { header: false, columns: EXPORT_FIELDS })}\r\n`;
+  }
+}
+
+// Stream a company's full catalogue as NDJSON (default) or CSV.
+export async function GET(request) {
+  const { searchParams } = new URL(request.url);
+  const companyId = searchParams.get("company_id");
+  const format = searchParams.get("format") || "ndjson";
+
+  if (!companyId) {
+    return Response.json({ error: "Company ID required" }, { status: 400 });
+  }
+  // The id also names the download, so it must be safe in a header.
+  if (!isUuid(companyId)) {
+    return Response.json(
+      { error: "Company ID must be a UUID" },
+      { status: 400 },
+    );
+  }
+  if (format !== "csv" && format !== "ndjson") {
+    return Response.json(
+      { error: "Format must be csv or ndjson" },
+      { status: 400 },
+    );
+  }
+
+  const lines = format === "csv" ? csvLines(companyId) : ndjsonLines(companyId);
+  const stream = toReadableStream(
+    (async function* () {
+      try {
+        yield* lines;
+      } catch (error) {
+        console.error("Error exporting products:", error);
+        throw error;
+      }
+    })(),
+  );
+
+  return compressResponse(
+    request,
+    new Response(stream, {
+      headers: {
+        "Content-Type":
+          format === "csv" ? "text/csv; charset=utf-8" : NDJSON_CONTENT_TYPE,
+        "Content-Disposition": `attachment; filename="products-${companyId}.${format}"`,
+      },
+    }),
+  );
+}
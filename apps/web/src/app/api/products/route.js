@@ -1,4 +1,35 @@
 import sql from "@/app/api/utils/sql";
+import {
+  fetchPage,
+  PaginationError,
+  parsePageParams,
+  streamPages,
+} from "@/app/api/utils/pagination";
+import { indexProduct } from "@/app/api/utils/product-index";
+import {
+  jsonListResponse,
+  ndjsonResponse,
+  wantsNdjson,
+} from "@/app/api/utils/respond";
+
+const PRODUCT_FIELDS = [
+  "id",
+  "company_id",
+  "product_name",
+  "hs_code",
+  "category",
+  "material",
+  "technical_specs",
+  "unit_price",
+  "currency",
+  "description",
+  "image_url",
+  "min_order_quantity",
+  "production_capacity",
+  "certifications",
+  "created_at",
+  "updated_at",
+];
 
 export async function GET(request) {
   try {
@@ -9,14 +40,28 @@ export async function GET(request) {
       return Response.json({ error: "Company ID required" }, { status: 400 });
     }
 
-    const products = await sql`
-      SELECT * FROM products 
-      WHERE company_id = ${companyId}
-      ORDER BY created_at DESC
-    `;
+    const options = {
+      table: "products",
+      where: "WHERE company_id = $1",
+      values: [companyId],
+      statementName: "products_by_company",
+      ...parsePageParams(searchParams, PRODUCT_FIELDS),
+    };
+
+    // NDJSON streams every row from the cursor on, a page at a time
+    if (wantsNdjson(request)) {
+      return ndjsonResponse(request, streamPages(sql, options), "products");
+    }
 
-    return Response.json({ products });
+    const page = await fetchPage(sql, options);
+    return jsonListResponse(request, "products", page.rows, {
+      next_cursor: page.next_cursor,
+      has_more: page.has_more,
+    });
   } catch (error) {
+    if (error instanceof PaginationError) {
+      return Response.json({ error: error.message }, { status: 400 });
+    }
     console.error("Error fetching products:", error);
     return Response.json(
       { error: "Failed to fetch products" },
@@ -50,6 +95,8 @@ export async function POST(request) {
       ) RETURNING *
     `;
 
+    indexProduct(result[0]);
+
     return Response.json({ product: result[0] });
   } catch (error) {
     console.error("Error creating product:", error);
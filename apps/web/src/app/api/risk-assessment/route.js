@@ -1,4 +1,39 @@
 import sql from "@/app/api/utils/sql";
+import { enqueueRequest, wantsAsync } from "@/app/api/utils/jobs";
+import { cachedGeneration } from "@/app/api/utils/ai-cache";
+import {
+  AdmissionError,
+  admissionRejected,
+  admitted,
+} from "@/app/api/utils/admission";
+import { integrationFetch, readCompletion } from "@/app/api/utils/integrations";
+import {
+  fetchPage,
+  PaginationError,
+  parsePageParams,
+} from "@/app/api/utils/pagination";
+
+const ASSESSMENT_FIELDS = [
+  "id",
+  "company_id",
+  "target_market",
+  "product_category",
+  "risk_type",
+  "overall_risk_score",
+  "political_risk",
+  "economic_risk",
+  "regulatory_risk",
+  "currency_risk",
+  "market_risk",
+  "operational_risk",
+  "risk_factors",
+  "mitigation_strategies",
+  "recommendations",
+  "confidence_score",
+  "data_sources",
+  "created_at",
+  "updated_at",
+];
 
 export async function GET(request) {
   try {
@@ -30,13 +65,22 @@ export async function GET(request) {
       values.push(riskType);
     }
 
-    const assessments = await sql(
-      `SELECT * FROM risk_assessments ${whereClause} ORDER BY created_at DESC`,
+    const page = await fetchPage(sql, {
+      table: "risk_assessments",
+      where: whereClause,
       values,
-    );
+      ...parsePageParams(searchParams, ASSESSMENT_FIELDS),
+    });
 
-    return Response.json({ assessments });
+    return Response.json({
+      assessments: page.rows,
+      next_cursor: page.next_cursor,
+      has_more: page.has_more,
+    });
   } catch (error) {
+    if (error instanceof PaginationError) {
+      return Response.json({ error: error.message }, { status: 400 });
+    }
     console.error("Error fetching risk assessments:", error);
     return Response.json(
       { error: "Failed to fetch assessments" },
@@ -46,6 +90,13 @@ export async function GET(request) {
 }
 
 export async function POST(request) {
+  if (wantsAsync(request)) {
+    return enqueueRequest("risk-assessment", request, createRiskAssessment);
+  }
+  return createRiskAssessment(request);
+}
+
+async function createRiskAssessment(request) {
   try {
     const body = await request.json();
     const { company_id, target_market, product_category, assessment_type } =
@@ -61,11 +112,16 @@ export async function POST(request) {
     }
 
     // Generate AI-powered risk assessment
-    const riskResult = await generateRiskAssessment({
+    const inputs = {
       target_market,
       product_category: product_category || "General",
       assessment_type: assessment_type || "comprehensive",
-    });
+    };
+    const { value: riskResult, cache } = await cachedGeneration(
+      "risk-assessment",
+      inputs,
+      () => admitted(company_id, () => generateRiskAssessment(inputs)),
+    );
 
     // Save assessment to database
     const [assessment] = await sql(
@@ -111,12 +167,18 @@ export async function POST(request) {
       ],
     );
 
-    return Response.json({
-      assessment,
-      analysis_summary: riskResult.summary,
-      status: "success",
-    });
+    return Response.json(
+      {
+        assessment,
+        analysis_summary: riskResult.summary,
+        status: "success",
+      },
+      { headers: { "X-AI-Cache": cache } },
+    );
   } catch (error) {
+    if (error instanceof AdmissionError) {
+      return admissionRejected(error);
+    }
     console.error("Error creating risk assessment:", error);
     return Response.json(
       { error: "Failed to create assessment" },
@@ -169,7 +231,7 @@ Analyze all major risk categories and provide detailed assessment:
 Provide actionable insights with risk scores (0.0-1.0) and mitigation strategies.
     `;
 
-    const response = await fetch("/integrations/chat-gpt/conversationgpt4", {
+    const response = await integrationFetch("/integrations/chat-gpt/conversationgpt4", {
       method: "POST",
       headers: { "Content-Type": "application/json" },
       body: JSON.stringify({
@@ -254,8 +316,7 @@ Provide actionable insights with risk scores (0.0-1.0) and mitigation strategies
       }),
     });
 
-    const aiResult = await response.json();
-    const analysis = JSON.parse(aiResult.choices[0].message.content);
+    const analysis = await readCompletion(response);
 
     return analysis;
   } catch (error) {
@@ -1,4 +1,21 @@
 import sql from "@/app/api/utils/sql";
+import {
+  fetchPage,
+  PaginationError,
+  parsePageParams,
+} from "@/app/api/utils/pagination";
+
+const MARKET_FIELDS = [
+  "id",
+  "product_id",
+  "country",
+  "market_potential",
+  "import_volume",
+  "average_price",
+  "growth_rate",
+  "competition_level",
+  "created_at",
+];
 
 export async function GET(request) {
   try {
@@ -9,16 +26,24 @@ export async function GET(request) {
       return Response.json({ error: "Company ID required" }, { status: 400 });
     }
 
-    const markets = await sql`
-      SELECT * FROM target_markets 
-      WHERE product_id IN (
-        SELECT id FROM products WHERE company_id = ${companyId}
-      )
-      ORDER BY created_at DESC
-    `;
+    const page = await fetchPage(sql, {
+      table: "target_markets",
+      where:
+        "WHERE product_id IN (SELECT id FROM products WHERE company_id = $1)",
+      values: [companyId],
+      statementName: "target_markets_by_company",
+      ...parsePageParams(searchParams, MARKET_FIELDS),
+    });
 
-    return Response.json({ markets });
+    return Response.json({
+      markets: page.rows,
+      next_cursor: page.next_cursor,
+      has_more: page.has_more,
+    });
   } catch (error) {
+    if (error instanceof PaginationError) {
+      return Response.json({ error: error.message }, { status: 400 });
+    }
     console.error("Error fetching target markets:", error);
     return Response.json(
       { error: "Failed to fetch target markets" },
@@ -1,4 +1,56 @@
 import sql from "@/app/api/utils/sql";
+import { enqueueRequest, wantsAsync } from "@/app/api/utils/jobs";
+import { cachedGeneration } from "@/app/api/utils/ai-cache";
+import {
+  AdmissionError,
+  admissionRejected,
+  admitted,
+} from "@/app/api/utils/admission";
+import { integrationFetch, readCompletion } from "@/app/api/utils/integrations";
+import { insertMany } from "@/app/api/utils/bulk-insert";
+import {
+  describeTradeSummary,
+  latestTradeSummaries,
+} from "@/app/api/utils/trade-summary";
+import {
+  fetchPage,
+  PaginationError,
+  parsePageParams,
+} from "@/app/api/utils/pagination";
+
+const TREND_FIELDS = [
+  "id",
+  "company_id",
+  "trend_type",
+  "timeframe",
+  "market_scope",
+  "trend_strength",
+  "growth_rate",
+  "confidence_score",
+  "trend_description",
+  "key_indicators",
+  "impact_assessment",
+  "opportunities",
+  "recommendations",
+  "data_sources",
+  "created_at",
+];
+
+const TREND_INSERT_COLUMNS = [
+  "company_id",
+  "trend_type",
+  "timeframe",
+  "market_scope",
+  "trend_strength",
+  "growth_rate",
+  "confidence_score",
+  "trend_description",
+  "key_indicators",
+  "impact_assessment",
+  "opportunities",
+  "recommendations",
+  "data_sources",
+];
 
 export async function GET(request) {
   try {
@@ -30,19 +82,35 @@ export async function GET(request) {
       values.push(timeframe);
     }
 
-    const trends = await sql(
-      `SELECT * FROM trend_detections ${whereClause} ORDER BY created_at DESC`,
+    const page = await fetchPage(sql, {
+      table: "trend_detections",
+      where: whereClause,
       values,
-    );
+      ...parsePageParams(searchParams, TREND_FIELDS),
+    });
 
-    return Response.json({ trends });
+    return Response.json({
+      trends: page.rows,
+      next_cursor: page.next_cursor,
+      has_more: page.has_more,
+    });
   } catch (error) {
+    if (error instanceof PaginationError) {
+      return Response.json({ error: error.message }, { status: 400 });
+    }
     console.error("Error fetching trend detections:", error);
     return Response.json({ error: "Failed to fetch trends" }, { status: 500 });
   }
 }
 
 export async function POST(request) {
+  if (wantsAsync(request)) {
+    return enqueueRequest("trend-detection", request, createTrendDetection);
+  }
+  return createTrendDetection(request);
+}
+
+async function createTrendDetection(request) {
   try {
     const body = await request.json();
     const { company_id, analysis_scope, timeframe, focus_areas } = body;
@@ -56,13 +124,11 @@ export async function POST(request) {
       );
     }
 
-    // Get relevant trade data for trend analysis
-    const tradeData = await sql(
-      "SELECT * FROM trade_data ORDER BY year DESC, country LIMIT 500",
-    );
+    // Get the latest per chapter/country trade statistics for trend analysis
+    const tradeSummaries = await latestTradeSummaries(sql);
 
     // Generate AI-powered trend detection
-    const trendResult = await generateTrendDetection({
+    const inputs = {
       analysis_scope: analysis_scope || "global",
       timeframe: timeframe || "12_months",
       focus_areas: focus_areas || [
@@ -70,45 +136,49 @@ export async function POST(request) {
         "emerging_products",
         "trade_patterns",
       ],
-      trade_data: tradeData,
-    });
+      trade_summaries: tradeSummaries,
+    };
+    const { value: trendResult, cache } = await cachedGeneration(
+      "trend-detection",
+      inputs,
+      () => admitted(company_id, () => generateTrendDetection(inputs)),
+    );
 
-    // Save trends to database
-    const savedTrends = [];
-    for (const trend of trendResult.trends) {
-      const [savedTrend] = await sql(
-        `INSERT INTO trend_detections (
-          company_id, trend_type, timeframe, market_scope,
-          trend_strength, growth_rate, confidence_score,
-          trend_description, key_indicators, impact_assessment,
-          opportunities, recommendations, data_sources, created_at
-        ) VALUES ($1, $2, $3, $4, $5, $6, $7, $8, $9, $10, $11, $12, $13, CURRENT_TIMESTAMP)
-        RETURNING *`,
-        [
-          company_id,
-          trend.trend_type,
-          timeframe || "12_months",
-          analysis_scope || "global",
-          trend.trend_strength,
-          trend.growth_rate,
-          trend.confidence_score,
-          trend.description,
-          trend.key_indicators,
-          trend.impact_assessment,
-          trend.opportunities,
-          trend.recommendations,
-          "AI Trend Analysis, Trade Statistics, Market Intelligence",
-        ],
-      );
-      savedTrends.push(savedTrend);
-    }
+    // Save all trends of the analysis in one statement so they commit together
+    const savedTrends = await insertMany(
+      sql,
+      "trend_detections",
+      TREND_INSERT_COLUMNS,
+      trendResult.trends.map((trend) => [
+        company_id,
+        trend.trend_type,
+        timeframe || "12_months",
+        analysis_scope || "global",
+        trend.trend_strength,
+        trend.growth_rate,
+        trend.confidence_score,
+        trend.description,
+        trend.key_indicators,
+        trend.impact_assessment,
+        trend.opportunities,
+        trend.recommendations,
+        "AI Trend Analysis, Trade Statistics, Market Intelligence",
+      ]),
+      "RETURNING *",
+    );
 
-    return Response.json({
-      trends: savedTrends,
-      analysis_summary: trendResult.summary,
-      status: "success",
-    });
+    return Response.json(
+      {
+        trends: savedTrends,
+        analysis_summary: trendResult.summary,
+        status: "success",
+      },
+      { headers: { "X-AI-Cache": cache } },
+    );
   } catch (error) {
+    if (error instanceof AdmissionError) {
+      return admissionRejected(error);
+    }
     console.error("Error creating trend detection:", error);
     return Response.json(
       { error: "Failed to create trend analysis" },
@@ -121,7 +191,7 @@ async function generateTrendDetection({
   analysis_scope,
   timeframe,
   focus_areas,
-  trade_data,
+  trade_summaries,
 }) {
   try {
     const systemPrompt = `You are an expert trend analyst specializing in international trade patterns, emerging markets, and global commerce trends. Identify and analyze significant market trends with data-driven insights.`;
@@ -134,14 +204,8 @@ ANALYSIS PARAMETERS:
 - Timeframe: ${timeframe}
 - Focus Areas: ${focus_areas.join(", ")}
 
-TRADE DATA SAMPLE:
-${trade_data
-  .slice(0, 20)
-  .map(
-    (t) =>
-      `${t.country} - ${t.product_category}: $${t.import_value}M imports, $${t.export_value}M exports, ${t.growth_rate}% growth (${t.year})`,
-  )
-  .join("\n")}
+TRADE SUMMARY (largest import markets by HS chapter, latest year):
+${trade_summaries.map(describeTradeSummary).join("\n")}
 
 Identify and analyze significant trends:
 
@@ -172,7 +236,7 @@ Identify and analyze significant trends:
 Provide actionable insights with trend strength ratings and confidence scores.
     `;
 
-    const response = await fetch("/integrations/chat-gpt/conversationgpt4", {
+    const response = await integrationFetch("/integrations/chat-gpt/conversationgpt4", {
       method: "POST",
       headers: { "Content-Type": "application/json" },
       body: JSON.stringify({
@@ -255,8 +319,7 @@ Provide actionable insights with trend strength ratings and confidence scores.
       }),
     });
 
-    const aiResult = await response.json();
-    const analysis = JSON.parse(aiResult.choices[0].message.content);
+    const analysis = await readCompletion(response);
 
     return analysis;
   } catch (error) {
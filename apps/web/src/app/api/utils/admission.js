@@ -0,0 +1,216 @@
+import { currentJobSignal } from "@/app/api/utils/jobs";
+import { timed } from "@/app/api/utils/timing";
+
+// Admission control for AI generations. At most AI_MAX_CONCURRENCY
+// integration calls run at once, and at most AI_COMPANY_CONCURRENCY of them
+// for any one company. Callers beyond that wait in a per-company queue, and
+// free slots go to the waiting companies in turn, so a company that floods
+// the service only ever delays its own requests. A company whose queue is
+// full, or whose request waits longer than AI_QUEUE_TIMEOUT_MS, is turned
+// away with an AdmissionError, which routes answer with 429 and Retry-After.
+const globalLimit = parseInt(process.env.AI_MAX_CONCURRENCY) || 8;
+const companyLimit = parseInt(process.env.AI_COMPANY_CONCURRENCY) || 2;
+const companyQueueLimit = parseInt(process.env.AI_COMPANY_QUEUE_LIMIT) || 10;
+const maxWaitMs = parseInt(process.env.AI_QUEUE_TIMEOUT_MS) || 30000;
+
+// Weight of the newest sample in the moving average of generation time,
+// which Retry-After estimates are based on.
+const EWMA_WEIGHT = 0.2;
+
+export class AdmissionError extends Error {
+  constructor(message, retryAfterSeconds) {
+    super(message);
+    this.retryAfter = retryAfterSeconds;
+  }
+}
+
+// companyId -> { running, waiting: [{ grant, reject, leave, queuedAt }] };
+// idle companies are dropped.
+const tenants = new Map();
+// Companies with waiters, in the order they are next offered a slot.
+const ready = [];
+let running = 0;
+let averageMs = 1000;
+const totals = { admitted: 0, waited: 0, rejected: 0, timed_out: 0 };
+
+const tenantFor = (companyId) => {
+  let tenant = tenants.get(companyId);
+  if (!tenant) {
+    tenant = { running: 0, waiting: [] };
+    tenants.set(companyId, tenant);
+  }
+  return tenant;
+};
+
+const dropIfIdle = (companyId, tenant) => {
+  if (tenant.running === 0 && tenant.waiting.length === 0) {
+    tenants.delete(companyId);
+  }
+};
+
+// Seconds until a company with `queued` requests ahead of it can expect a
+// slot.
+const retryAfter = (queued) =>
+  Math.max(1, Math.ceil(((queued / companyLimit + 1) * averageMs) / 1000));
+
+function start(companyId, tenant) {
+  running += 1;
+  tenant.running += 1;
+  totals.admitted += 1;
+  const startedAt = Date.now();
+  let released = false;
+
+  return () => {
+    if (released) return;
+    released = true;
+    running -= 1;
+    tenant.running -= 1;
+    averageMs += EWMA_WEIGHT * (Date.now() - startedAt - averageMs);
+    dispatch();
+    dropIfIdle(companyId, tenant);
+  };
+}
+
+// Offer free slots to waiting companies round-robin, skipping those already
+// at their own limit.
+function dispatch() {
+  let skipped = 0;
+  while (running < globalLimit && ready.length > skipped) {
+    const companyId = ready.shift();
+    const tenant = tenants.get(companyId);
+    if (tenant.running >= companyLimit) {
+      ready.push(companyId);
+      skipped += 1;
+      continue;
+    }
+    const waiter = tenant.waiting.shift();
+    waiter.leave();
+    if (tenant.waiting.length > 0) ready.push(companyId);
+    waiter.grant(start(companyId, tenant));
+    skipped = 0;
+  }
+}
+
+/**
+ * Wait for a generation slot for `companyId`. Resolves to a release function
+ * that must be called once the generation is done; rejects with an
+ * AdmissionError when the company's queue is full or the wait times out, and
+ * with the signal's reason when `signal` aborts first.
+ */
+export function acquireSlot(companyId, signal) {
+  if (signal?.aborted) return Promise.reject(signal.reason);
+  const tenant = tenantFor(companyId);
+  if (
+    running < globalLimit &&
+    tenant.running < companyLimit &&
+    tenant.waiting.length === 0
+  ) {
+    return Promise.resolve(start(companyId, tenant));
+  }
+
+  if (tenant.waiting.length >= companyQueueLimit) {
+    totals.rejected += 1;
+    dropIfIdle(companyId, tenant);
+    return Promise.reject(
+      new AdmissionError(
+        "Too many AI generations in progress for this company",
+        retryAfter(tenant.waiting.length),
+      ),
+    );
+  }
+
+  totals.waited += 1;
+  return new Promise((grant, reject) => {
+    const waiter = { grant, reject, queuedAt: Date.now() };
+
+    // Give up the queued place without being granted a slot.
+    const abandon = (error) => {
+      waiter.leave();
+      tenant.waiting.splice(tenant.waiting.indexOf(waiter), 1);
+      if (tenant.waiting.length === 0) {
+        ready.splice(ready.indexOf(companyId), 1);
+      }
+      dropIfIdle(companyId, tenant);
+      reject(error);
+    };
+    const timer = setTimeout(() => {
+      totals.timed_out += 1;
+      abandon(
+        new AdmissionError(
+          "Timed out waiting for an AI generation slot",
+          retryAfter(tenant.waiting.length - 1),
+        ),
+      );
+    }, maxWaitMs);
+    const onAbort = () => abandon(signal.reason);
+    signal?.addEventListener("abort", onAbort, { once: true });
+    waiter.leave = () => {
+      clearTimeout(timer);
+      signal?.removeEventListener("abort", onAbort);
+    };
+
+    if (tenant.waiting.length === 0) ready.push(companyId);
+    tenant.waiting.push(waiter);
+  });
+}
+
+/**
+ * Run `fn` holding one of `companyId`'s generation slots. The wait is timed
+ * as the request's "queue" phase, and is abandoned when `signal` (by default
+ * the running job's) aborts.
+ */
+export async function admitted(companyId, fn, signal = currentJobSignal()) {
+  // Ids arrive as numbers from JSON bodies and strings from query strings.
+  const release = await timed("queue", () =>
+    acquireSlot(String(companyId || "anonymous"), signal),
+  );
+  try {
+    return await fn();
+  } finally {
+    release();
+  }
+}
+
+export const admissionRejected = (error) =>
+  Response.json(
+    { error: error.message, retry_after: error.retryAfter },
+    { status: 429, headers: { "Retry-After": String(error.retryAfter) } },
+  );
+
+// Per-company figures are reported as aggregates, so the metrics do not
+// reveal which companies are active.
+export function admissionStats() {
+  let queued = 0;
+  let waitingCompanies = 0;
+  let maxRunning = 0;
+  let maxQueued = 0;
+  let oldestWaitMs = 0;
+  for (const tenant of tenants.values()) {
+    queued += tenant.waiting.length;
+    if (tenant.waiting.length > 0) {
+      waitingCompanies += 1;
+      oldestWaitMs = Math.max(
+        oldestWaitMs,
+        Date.now() - tenant.waiting[0].queuedAt,
+      );
+    }
+    maxRunning = Math.max(maxRunning, tenant.running);
+    maxQueued = Math.max(maxQueued, tenant.waiting.length);
+  }
+  return {
+    running,
+    queued,
+    limit: globalLimit,
+    company_limit: companyLimit,
+    company_queue_limit: companyQueueLimit,
+    average_generation_ms: Math.round(averageMs),
+    ...totals,
+    companies: {
+      active: tenants.size,
+      waiting: waitingCompanies,
+      max_running: maxRunning,
+      max_queued: maxQueued,
+      oldest_wait_ms: oldestWaitMs,
+    },
+  };
+}
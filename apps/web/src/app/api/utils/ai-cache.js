@@ -0,0 +1,151 @@
+import { createHash } from "node:crypto";
+import { currentJobSignal, runWithJobSignal } from "@/app/api/utils/jobs";
+
+// Content-addressed cache for AI generations. Results are keyed on a hash of
+// the inputs (identifiers normalized, see IDENTIFIER_KEYS), kept for a TTL
+// with LRU eviction, and concurrent requests for the same key share a single
+// in-flight generation.
+const ttlMs = parseInt(process.env.AI_CACHE_TTL_MS) || 15 * 60 * 1000;
+const maxEntries = parseInt(process.env.AI_CACHE_MAX_ENTRIES) || 500;
+
+// Map iteration order doubles as recency order: oldest entry first.
+const entries = new Map();
+const inFlight = new Map();
+
+// Top-level inputs that name a market, code or period, where case and
+// spacing carry no meaning. Every other value (product details, market_data)
+// reaches the prompt as sent, so it is hashed as given.
+const IDENTIFIER_KEYS = new Set([
+  "target_market",
+  "hs_code",
+  "period",
+  "timeframe",
+  "analysis_scope",
+  "assessment_type",
+]);
+
+const normalizeIdentifier = (value) =>
+  typeof value === "string"
+    ? value.trim().replace(/\s+/g, " ").toLowerCase()
+    : canonical(value);
+
+// Object keys sorted at every level so property order does not matter.
+const canonical = (value) => {
+  if (Array.isArray(value)) {
+    return value.map(canonical);
+  }
+  if (value && typeof value === "object" && !(value instanceof Date)) {
+    const result = {};
+    for (const key of Object.keys(value).sort()) {
+      result[key] = canonical(value[key]);
+    }
+    return result;
+  }
+  return value;
+};
+
+const normalize = (inputs) => {
+  const result = {};
+  for (const key of Object.keys(inputs).sort()) {
+    const value = inputs[key];
+    if (value !== undefined && value !== null && value !== "") {
+      result[key] = IDENTIFIER_KEYS.has(key)
+        ? normalizeIdentifier(value)
+        : canonical(value);
+    }
+  }
+  return result;
+};
+
+export const cacheKey = (namespace, inputs) =>
+  `${namespace}:${createHash("sha256")
+    .update(JSON.stringify(normalize(inputs ?? {})))
+    .digest("hex")}`;
+
+const readEntry = (key) => {
+  const entry = entries.get(key);
+  if (!entry) return undefined;
+  entries.delete(key);
+  if (entry.expiresAt <= Date.now()) return undefined;
+  entries.set(key, entry);
+  return entry.value;
+};
+
+const writeEntry = (key, value) => {
+  entries.delete(key);
+  entries.set(key, { value, expiresAt: Date.now() + ttlMs });
+  while (entries.size > maxEntries) {
+    entries.delete(entries.keys().next().value);
+  }
+};
+
+// Wait for `promise`, giving up with the signal's reason once `signal`
+// aborts.
+const untilAborted = (promise, signal) => {
+  if (!signal) return promise;
+  signal.throwIfAborted();
+  return new Promise((resolve, reject) => {
+    const onAbort = () => reject(signal.reason);
+    signal.addEventListener("abort", onAbort, { once: true });
+    promise
+      .then(resolve, reject)
+      .finally(() => signal.removeEventListener("abort", onAbort));
+  });
+};
+
+/**
+ * Return the cached result for `inputs`, or run `generate` once and cache it.
+ * Resolves to `{ value, cache }` where `cache` is "hit", "shared" (joined an
+ * in-flight generation) or "miss". Failed generations are not cached.
+ *
+ * The generation runs under its own abort signal rather than the signal of
+ * the job that started it. A cancelled job stops waiting straight away, and
+ * the generation is only aborted once no caller is waiting for it.
+ */
+export async function cachedGeneration(namespace, inputs, generate) {
+  const key = cacheKey(namespace, inputs);
+
+  const cached = readEntry(key);
+  if (cached !== undefined) {
+    return { value: structuredClone(cached), cache: "hit" };
+  }
+
+  let flight = inFlight.get(key);
+  const cache = flight ? "shared" : "miss";
+  if (!flight) {
+    const controller = new AbortController();
+    flight = { controller, waiters: 0 };
+    flight.promise = (async () => {
+      try {
+        const value = await runWithJobSignal(controller.signal, generate);
+        writeEntry(key, value);
+        return value;
+      } finally {
+        inFlight.delete(key);
+      }
+    })();
+    // Failures reach the callers still waiting; don't report them as
+    // unhandled when every caller has given up.
+    flight.promise.catch(() => {});
+    inFlight.set(key, flight);
+  }
+
+  const signal = currentJobSignal();
+  flight.waiters += 1;
+  try {
+    const value = await untilAborted(flight.promise, signal);
+    return { value: structuredClone(value), cache };
+  } finally {
+    flight.waiters -= 1;
+    if (flight.waiters === 0 && signal?.aborted) {
+      flight.controller.abort(signal.reason);
+    }
+  }
+}
+
+export const aiCacheStats = () => ({
+  entries: entries.size,
+  in_flight: inFlight.size,
+  max_entries: maxEntries,
+  ttl_ms: ttlMs,
+});
@@ -0,0 +1,404 @@
+import { randomUUID } from "node:crypto";
+import sql from "@/app/api/utils/sql";
+import { cachedGeneration } from "@/app/api/utils/ai-cache";
+import { admitted } from "@/app/api/utils/admission";
+import { insertMany } from "@/app/api/utils/bulk-insert";
+import { integrationFetch, readCompletion } from "@/app/api/utils/integrations";
+
+// Prediction generators shared by /api/ai-predictions and its batch variant.
+
+export const predictionGenerators = {
+  market_forecast: generateMarketForecast,
+  price_trend: generatePriceTrend,
+  demand_prediction: generateDemandPrediction,
+};
+
+export const PREDICTION_INPUT_FIELDS = [
+  "target_market",
+  "product_category",
+  "hs_code",
+  "period",
+  "market_data",
+];
+
+const PREDICTION_COLUMNS = [
+  "company_id",
+  "prediction_type",
+  "target_market",
+  "product_category",
+  "hs_code",
+  "period",
+  "confidence_score",
+  "prediction_data",
+  "key_insights",
+  "recommendations",
+  "data_sources",
+];
+
+/**
+ * Generate one prediction, reusing cached results for identical inputs.
+ * Fresh generations wait for one of `companyId`'s admission slots.
+ * Resolves to `{ value, cache }` as returned by cachedGeneration.
+ */
+export function generatePrediction(predictionType, spec, companyId) {
+  const inputs = {};
+  for (const field of PREDICTION_INPUT_FIELDS) inputs[field] = spec[field];
+  return cachedGeneration(`ai-predictions:${predictionType}`, inputs, () =>
+    admitted(companyId, () => predictionGenerators[predictionType](inputs)),
+  );
+}
+
+/**
+ * Save generated predictions for one company with a single multi-row
+ * INSERT. `entries` are `{ spec, result }` pairs; rows come back in the same
+ * order. RETURNING does not promise VALUES order, so ids are assigned here
+ * and the rows matched back on them.
+ */
+export async function insertPredictions(companyId, entries) {
+  const ids = entries.map(() => randomUUID());
+  const rows = await insertMany(
+    sql,
+    "ai_predictions",
+    ["id", ...PREDICTION_COLUMNS],
+    entries.map(({ spec, result }, i) => [
+      ids[i],
+      companyId,
+      spec.prediction_type,
+      spec.target_market,
+      spec.product_category,
+      spec.hs_code,
+      spec.period,
+      result.confidence_score,
+      JSON.stringify(result.prediction_data),
+      result.key_insights,
+      result.recommendations,
+      result.data_sources,
+    ]),
+    "RETURNING *",
+  );
+  const byId = new Map(rows.map((row) => [row.id, row]));
+  return ids.map((id) => byId.get(id));
+}
+
+async function generateMarketForecast({
+  target_market,
+  product_category,
+  hs_code,
+  period,
+  market_data,
+}) {
+  try {
+    const systemPrompt = `You are an expert trade analyst specializing in global market forecasting. Analyze the provided data and generate accurate market predictions.`;
+
+    const userPrompt = `
+Generate a comprehensive market forecast for:
+- Target Market: ${target_market || "Global"}
+- Product Category: ${product_category || "General"}
+- HS Code: ${hs_code || "Not specified"}
+- Forecast Period: ${period}
+- Current Market Data: ${JSON.stringify(market_data || {})}
+
+Please provide:
+1. Market size predictions (growth percentage, value estimates)
+2. Key growth drivers and risks
+3. Competitive landscape changes
+4. Consumer demand trends
+5. Economic factors impact
+6. Seasonal variations
+7. Confidence level (0-100%)
+
+Format your response as structured analysis with specific numerical predictions where possible.
+    `;
+
+    const response = await integrationFetch("/integrations/chat-gpt/conversationgpt4", {
+      method: "POST",
+      headers: { "Content-Type": "application/json" },
+      body: JSON.stringify({
+        messages: [
+          { role: "system", content: systemPrompt },
+          { role: "user", content: userPrompt },
+        ],
+        json_schema: {
+          name: "market_forecast",
+          schema: {
+            type: "object",
+            properties: {
+              market_size_change: { type: "number" },
+              growth_percentage: { type: "number" },
+              estimated_value: { type: "number" },
+              confidence_score: { type: "number" },
+              growth_drivers: {
+                type: "array",
+                items: { type: "string" },
+              },
+              risks: {
+                type: "array",
+                items: { type: "string" },
+              },
+              seasonal_trends: {
+                type: "object",
+                properties: {
+                  high_season: { type: "string" },
+                  low_season: { type: "string" },
+                  seasonal_variance: { type: "number" },
+                },
+                required: ["high_season", "low_season", "seasonal_variance"],
+                additionalProperties: false,
+              },
+              key_insights: {
+                type: "array",
+                items: { type: "string" },
+              },
+              recommendations: {
+                type: "array",
+                items: { type: "string" },
+              },
+            },
+            required: [
+              "market_size_change",
+              "growth_percentage",
+              "estimated_value",
+              "confidence_score",
+              "growth_drivers",
+              "risks",
+              "seasonal_trends",
+              "key_insights",
+              "recommendations",
+            ],
+            additionalProperties: false,
+          },
+        },
+      }),
+    });
+
+    const prediction = await readCompletion(response);
+
+    return {
+      confidence_score: prediction.confidence_score / 100,
+      prediction_data: {
+        market_size_change: prediction.market_size_change,
+        growth_percentage: prediction.growth_percentage,
+        estimated_value: prediction.estimated_value,
+        seasonal_trends: prediction.seasonal_trends,
+      },
+      key_insights: prediction.key_insights,
+      recommendations: prediction.recommendations,
+      data_sources: "AI Analysis, Trade Statistics, Market Intelligence",
+    };
+  } catch (error) {
+    console.error("Error generating market forecast:", error);
+    throw error;
+  }
+}
+
+async function generatePriceTrend({
+  target_market,
+  product_category,
+  hs_code,
+  period,
+  market_data,
+}) {
+  try {
+    const systemPrompt = `You are a pricing analyst expert in global trade. Analyze market conditions and predict price trends with high accuracy.`;
+
+    const userPrompt = `
+Analyze price trends for:
+- Target Market: ${target_market || "Global"}
+- Product Category: ${product_category || "General"}
+- HS Code: ${hs_code || "Not specified"}
+- Analysis Period: ${period}
+- Market Data: ${JSON.stringify(market_data || {})}
+
+Provide detailed price analysis including:
+1. Price direction (increase/decrease/stable)
+2. Expected percentage change
+3. Price volatility assessment
+4. Cost factor analysis (raw materials, shipping, regulations)
+5. Competitive pricing impact
+6. Currency exchange effects
+7. Confidence level
+    `;
+
+    const response = await integrationFetch("/integrations/chat-gpt/conversationgpt4", {
+      method: "POST",
+      headers: { "Content-Type": "application/json" },
+      body: JSON.stringify({
+        messages: [
+          { role: "system", content: systemPrompt },
+          { role: "user", content: userPrompt },
+        ],
+        json_schema: {
+          name: "price_trend",
+          schema: {
+            type: "object",
+            properties: {
+              price_direction: { type: "string" },
+              percentage_change: { type: "number" },
+              volatility_level: { type: "string" },
+              confidence_score: { type: "number" },
+              cost_factors: {
+                type: "array",
+                items: { type: "string" },
+              },
+              price_drivers: {
+                type: "array",
+                items: { type: "string" },
+              },
+              key_insights: {
+                type: "array",
+                items: { type: "string" },
+              },
+              recommendations: {
+                type: "array",
+                items: { type: "string" },
+              },
+            },
+            required: [
+              "price_direction",
+              "percentage_change",
+              "volatility_level",
+              "confidence_score",
+              "cost_factors",
+              "price_drivers",
+              "key_insights",
+              "recommendations",
+            ],
+            additionalProperties: false,
+          },
+        },
+      }),
+    });
+
+    const prediction = await readCompletion(response);
+
+    return {
+      confidence_score: prediction.confidence_score / 100,
+      prediction_data: {
+        price_direction: prediction.price_direction,
+        percentage_change: prediction.percentage_change,
+        volatility_level: prediction.volatility_level,
+        cost_factors: prediction.cost_factors,
+      },
+      key_insights: prediction.key_insights,
+      recommendations: prediction.recommendations,
+      data_sources: "AI Price Analysis, Market Data, Economic Indicators",
+    };
+  } catch (error) {
+    console.error("Error generating price trend:", error);
+    throw error;
+  }
+}
+
+async function generateDemandPrediction({
+  target_market,
+  product_category,
+  hs_code,
+  period,
+  market_data,
+}) {
+  try {
+    const systemPrompt = `You are a demand forecasting specialist with expertise in international trade patterns and consumer behavior analysis.`;
+
+    const userPrompt = `
+Predict demand patterns for:
+- Target Market: ${target_market || "Global"}
+- Product Category: ${product_category || "General"}
+- HS Code: ${hs_code || "Not specified"}
+- Forecast Period: ${period}
+- Available Data: ${JSON.stringify(market_data || {})}
+
+Analyze:
+1. Demand growth/decline predictions
+2. Consumer behavior shifts
+3. Market saturation levels
+4. Import/export volume forecasts
+5. Seasonal demand patterns
+6. Economic impact on demand
+7. Competitive substitution risks
+    `;
+
+    const response = await integrationFetch("/integrations/chat-gpt/conversationgpt4", {
+      method: "POST",
+      headers: { "Content-Type": "application/json" },
+      body: JSON.stringify({
+        messages: [
+          { role: "system", content: systemPrompt },
+          { role: "user", content: userPrompt },
+        ],
+        json_schema: {
+          name: "demand_prediction",
+          schema: {
+            type: "object",
+            properties: {
+              demand_direction: { type: "string" },
+              volume_change_percentage: { type: "number" },
+              market_saturation: { type: "string" },
+              confidence_score: { type: "number" },
+              demand_drivers: {
+                type: "array",
+                items: { type: "string" },
+              },
+              consumer_trends: {
+                type: "array",
+                items: { type: "string" },
+              },
+              seasonal_patterns: {
+                type: "object",
+                properties: {
+                  peak_months: {
+                    type: "array",
+                    items: { type: "string" },
+                  },
+                  low_months: {
+                    type: "array",
+                    items: { type: "string" },
+                  },
+                },
+                required: ["peak_months", "low_months"],
+                additionalProperties: false,
+              },
+              key_insights: {
+                type: "array",
+                items: { type: "string" },
+              },
+              recommendations: {
+                type: "array",
+                items: { type: "string" },
+              },
+            },
+            required: [
+              "demand_direction",
+              "volume_change_percentage",
+              "market_saturation",
+              "confidence_score",
+              "demand_drivers",
+              "consumer_trends",
+              "seasonal_patterns",
+              "key_insights",
+              "recommendations",
+            ],
+            additionalProperties: false,
+          },
+        },
+      }),
+    });
+
+    const prediction = await readCompletion(response);
+
+    return {
+      confidence_score: prediction.confidence_score / 100,
+      prediction_data: {
+        demand_direction: prediction.demand_direction,
+        volume_change_percentage: prediction.volume_change_percentage,
+        market_saturation: prediction.market_saturation,
+        seasonal_patterns: prediction.seasonal_patterns,
+      },
+      key_insights: prediction.key_insights,
+      recommendations: prediction.recommendations,
+      data_sources: "AI Demand Analysis, Consumer Data, Trade Statistics",
+    };
+  } catch (error) {
+    console.error("Error generating demand prediction:", error);
+    throw error;
+  }
+}
@@ -0,0 +1,56 @@
+// Multi-row INSERT helpers. Writing a whole result set in one statement costs
+// one round trip instead of one per row, and the rows commit or fail together.
+
+// Postgres accepts at most 65535 bind parameters per statement.
+const MAX_BIND_PARAMETERS = 65535;
+
+/**
+ * Build one `INSERT INTO table (columns) VALUES (...), (...)` statement.
+ * `rows` are arrays of values in `columns` order; `suffix` is appended as
+ * is, e.g. an ON CONFLICT or RETURNING clause.
+ */
+export function buildInsert(table, columns, rows, suffix = "") {
+  const values = [];
+  const tuples = rows.map((row) => {
+    const placeholders = row.map((value) => {
+      values.push(value);
+      return `$${values.length}`;
+    });
+    return `(${placeholders.join(", ")})`;
+  });
+
+  const text = `INSERT INTO ${table} (${columns.join(", ")})
+    VALUES ${tuples.join(", ")}
+    ${suffix}`;
+  return { text: text.trim(), values };
+}
+
+/**
+ * Insert `rows` atomically and return the rows produced by `suffix`'s
+ * RETURNING clause. Postgres does not promise they come back in input order;
+ * callers that need to match them up should supply a key such as the id.
+ * Everything goes in one statement unless it would exceed the bind parameter
+ * limit, in which case the chunks are sent as a single transaction.
+ */
+export async function insertMany(sql, table, columns, rows, suffix = "") {
+  if (rows.length === 0) return [];
+
+  const rowsPerStatement = Math.floor(MAX_BIND_PARAMETERS / columns.length);
+  if (rows.length <= rowsPerStatement) {
+    const { text, values } = buildInsert(table, columns, rows, suffix);
+    return sql(text, values);
+  }
+
+  const statements = [];
+  for (let i = 0; i < rows.length; i += rowsPerStatement) {
+    const { text, values } = buildInsert(
+      table,
+      columns,
+      rows.slice(i, i + rowsPerStatement),
+      suffix,
+    );
+    statements.push(sql(text, values));
+  }
+  const results = await sql.transaction(statements);
+  return results.flat();
+}
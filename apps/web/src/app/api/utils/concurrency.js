@@ -0,0 +1,42 @@
+// Bounded-concurrency helpers for fanning out slow calls (AI generations,
+// external APIs) without starting them all at once.
+
+/**
+ * Run `fn(item, index)` over `items` with at most `limit` calls in flight and
+ * yield `{ index, value }` or `{ index, error }` in completion order.
+ */
+export async function* mapConcurrent(items, limit, fn) {
+  const settled = [];
+  let wake = null;
+  let next = 0;
+  let running = 0;
+
+  const launch = () => {
+    while (running < limit && next < items.length) {
+      const index = next++;
+      running += 1;
+      Promise.resolve()
+        .then(() => fn(items[index], index))
+        .then(
+          (value) => settled.push({ index, value }),
+          (error) => settled.push({ index, error }),
+        )
+        .finally(() => {
+          running -= 1;
+          wake?.();
+        });
+    }
+  };
+
+  launch();
+  while (running > 0 || settled.length > 0) {
+    if (settled.length === 0) {
+      await new Promise((resolve) => (wake = resolve));
+      wake = null;
+    }
+    while (settled.length > 0) {
+      yield settled.shift();
+    }
+    launch();
+  }
+}
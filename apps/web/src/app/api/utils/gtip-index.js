@@ -0,0 +1,158 @@
+import { createHash } from "node:crypto";
+import { gtipHierarchy } from "@/app/api/utils/gtip-hierarchy";
+
+// The GTIP/HS hierarchy is static, so it is indexed once at module load:
+// chapters (2 digits), headings (4) and subheadings (6) by code, plus a
+// folded name list for text search.
+
+export const foldText = (text) =>
+  String(text)
+    .toLocaleLowerCase("tr")
+    .replace(/ı/g, "i")
+    .normalize("NFD")
+    .replace(/\p{Diacritic}/gu, "");
+
+export const normalizeCode = (code) => String(code ?? "").replace(/\D/g, "");
+
+const chapters = new Map();
+const headings = new Map();
+const subheadings = new Map();
+const searchEntries = [];
+
+for (const [rawChapterCode, chapter] of Object.entries(gtipHierarchy)) {
+  const chapterCode = rawChapterCode.padStart(2, "0");
+  chapters.set(chapterCode, { code: chapterCode, name: chapter.name });
+  searchEntries.push({
+    code: chapterCode,
+    level: "chapter",
+    name: chapter.name,
+    folded: foldText(chapter.name),
+  });
+
+  for (const [rawHeadingCode, heading] of Object.entries(
+    chapter.subcategories,
+  )) {
+    const headingCode = rawHeadingCode.padStart(4, "0");
+    headings.set(headingCode, {
+      code: headingCode,
+      chapter: chapterCode,
+      name: heading.name,
+      products: heading.products,
+    });
+    searchEntries.push({
+      code: headingCode,
+      level: "heading",
+      name: heading.name,
+      folded: foldText(heading.name),
+    });
+
+    for (const product of heading.products) {
+      subheadings.set(product, {
+        code: product,
+        heading: headingCode,
+        chapter: chapterCode,
+      });
+    }
+  }
+}
+
+/**
+ * Resolve a (possibly longer, e.g. 8-digit national) code against the
+ * hierarchy. `valid` is true when its 6-digit subheading is known.
+ */
+export function lookupCode(code) {
+  const digits = normalizeCode(code);
+  const chapter = chapters.get(digits.slice(0, 2)) || null;
+  const heading = digits.length >= 4 ? headings.get(digits.slice(0, 4)) : null;
+  const subheading =
+    digits.length >= 6 ? subheadings.get(digits.slice(0, 6)) : null;
+
+  return {
+    code: digits,
+    valid: Boolean(subheading),
+    chapter: chapter,
+    heading: heading
+      ? { code: heading.code, name: heading.name }
+      : null,
+    subheading: subheading ? subheading.code : null,
+  };
+}
+
+/**
+ * Return the part of the hierarchy under a chapter, heading or subheading
+ * prefix, in the same shape as the full tree.
+ */
+export function subtree(prefix) {
+  const digits = normalizeCode(prefix);
+  if (digits.length < 2) return {};
+
+  const chapterKey = Object.keys(gtipHierarchy).find(
+    (key) => key.padStart(2, "0") === digits.slice(0, 2),
+  );
+  if (!chapterKey) return {};
+
+  const chapter = gtipHierarchy[chapterKey];
+  if (digits.length === 2) return { [chapterKey]: chapter };
+
+  const subcategories = {};
+  for (const [key, heading] of Object.entries(chapter.subcategories)) {
+    const headingCode = key.padStart(4, "0");
+    if (!headingCode.startsWith(digits.slice(0, 4))) continue;
+
+    const products = heading.products.filter((product) =>
+      product.startsWith(digits.slice(0, 6)),
+    );
+    if (products.length > 0) {
+      subcategories[key] = { name: heading.name, products };
+    }
+  }
+
+  if (Object.keys(subcategories).length === 0) return {};
+  return { [chapterKey]: { name: chapter.name, subcategories } };
+}
+
+/**
+ * Case- and accent-insensitive search over chapter and heading names, or a
+ * code prefix when the query is numeric.
+ */
+export function searchCodes(query, limit = 20) {
+  const digits = normalizeCode(query);
+  if (digits && digits === String(query).trim()) {
+    const results = [];
+    for (const entry of searchEntries) {
+      if (entry.code.startsWith(digits) || digits.startsWith(entry.code)) {
+        results.push({ code: entry.code, level: entry.level, name: entry.name });
+      }
+    }
+    for (const code of subheadings.keys()) {
+      if (results.length >= limit) break;
+      if (code.startsWith(digits)) {
+        const heading = headings.get(code.slice(0, 4));
+        results.push({ code, level: "subheading", name: heading.name });
+      }
+    }
+    return results.slice(0, limit);
+  }
+
+  const terms = foldText(query).split(/\s+/).filter(Boolean);
+  if (terms.length === 0) return [];
+
+  const results = [];
+  for (const entry of searchEntries) {
+    if (terms.every((term) => entry.folded.includes(term))) {
+      results.push({ code: entry.code, level: entry.level, name: entry.name });
+      if (results.length >= limit) break;
+    }
+  }
+  return results;
+}
+
+// The full tree is serialized once; its hash doubles as the data version.
+export const fullTreeBody = JSON.stringify({
+  success: true,
+  gtipCodes: gtipHierarchy,
+});
+export const gtipVersion = createHash("sha1")
+  .update(fullTreeBody)
+  .digest("hex")
+  .slice(0, 16);
@@ -0,0 +1,19 @@
+import { currentJobSignal } from "@/app/api/utils/jobs";
+import { timed } from "@/app/api/utils/timing";
+
+// fetch() for the /integrations/* endpoints used by the AI routes. Calls
+// made while running as a background job pick up the job's abort signal,
+// so cancelling the job also cancels the in-flight integration request.
+// The call is timed as the request's "ai" phase.
+export const integrationFetch = (path, init = {}) =>
+  timed("ai", () =>
+    fetch(path, { ...init, signal: init.signal ?? currentJobSignal() }),
+  );
+
+// Read a chat completion and parse the JSON document in its message, timed
+// as the request's "json" phase.
+export const readCompletion = (response) =>
+  timed("json", async () => {
+    const aiResult = await response.json();
+    return JSON.parse(aiResult.choices[0].message.content);
+  });
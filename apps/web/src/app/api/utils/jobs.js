@@ -0,0 +1,233 @@
+import { AsyncLocalStorage } from "node:async_hooks";
+import { randomUUID } from "node:crypto";
+import { withTiming } from "@/app/api/utils/timing";
+
+// In-process job queue for the AI-backed POST endpoints. A request opts in
+// with `?async=true` or `Prefer: respond-async` and gets 202 with a job id;
+// a bounded pool of workers then runs the normal handler, retrying server
+// errors and admission 429s with backoff. Jobs live in memory and are
+// forgotten JOB_TTL_MS after they finish.
+const concurrency = parseInt(process.env.JOB_CONCURRENCY) || 4;
+const maxAttempts = parseInt(process.env.JOB_MAX_ATTEMPTS) || 3;
+const retryDelayMs = parseInt(process.env.JOB_RETRY_DELAY_MS) || 1000;
+const queueLimit = parseInt(process.env.JOB_QUEUE_LIMIT) || 1000;
+const jobTtlMs = parseInt(process.env.JOB_TTL_MS) || 60 * 60 * 1000;
+
+const TERMINAL = new Set(["succeeded", "failed", "cancelled"]);
+
+const jobs = new Map();
+const queue = [];
+let running = 0;
+
+// Lets code running inside a job (e.g. integration fetches) see its signal.
+const jobContext = new AsyncLocalStorage();
+export const currentJobSignal = () => jobContext.getStore()?.signal;
+// Run `fn` as if inside a job with `signal`, e.g. work shared by several
+// callers that must outlive any one job's cancellation.
+export const runWithJobSignal = (signal, fn) => jobContext.run({ signal }, fn);
+
+class RetryableJobError extends Error {}
+
+// A Retry-After header (seconds or an HTTP date) in milliseconds, or null.
+const retryAfterMs = (header) => {
+  if (!header) return null;
+  const ms = /^\d+$/.test(header)
+    ? Number(header) * 1000
+    : Date.parse(header) - Date.now();
+  return Number.isFinite(ms) ? Math.max(ms, 0) : null;
+};
+
+export const isTerminal = (job) => TERMINAL.has(job.status);
+
+export const publicJob = (job) => ({
+  id: job.id,
+  type: job.type,
+  status: job.status,
+  attempts: job.attempts,
+  max_attempts: maxAttempts,
+  created_at: job.created_at,
+  started_at: job.started_at,
+  finished_at: job.finished_at,
+  result_status: job.result_status,
+  result: job.result,
+  error: job.error,
+});
+
+const update = (job, changes) => {
+  Object.assign(job, changes);
+  for (const listener of job.listeners) listener(publicJob(job));
+  if (isTerminal(job)) {
+    job.listeners.clear();
+    setTimeout(() => jobs.delete(job.id), jobTtlMs).unref?.();
+  }
+};
+
+const drain = () => {
+  while (running < concurrency && queue.length > 0) {
+    const job = queue.shift();
+    if (job.status !== "queued") continue;
+    running += 1;
+    execute(job).finally(() => {
+      running -= 1;
+      drain();
+    });
+  }
+};
+
+async function execute(job) {
+  const controller = new AbortController();
+  job.controller = controller;
+  update(job, {
+    status: "running",
+    attempts: job.attempts + 1,
+    started_at: job.started_at ?? new Date().toISOString(),
+  });
+
+  try {
+    // Each attempt is timed on its own, not as part of the submitting request
+    const { status, body } = await withTiming(`JOB ${job.type}`, () =>
+      jobContext.run({ signal: controller.signal }, () =>
+        job.run(controller.signal),
+      ),
+    );
+    if (job.status === "cancelled") return;
+    update(job, {
+      status: status < 400 ? "succeeded" : "failed",
+      result_status: status,
+      result: body,
+      error: status < 400 ? null : body?.error ?? null,
+      finished_at: new Date().toISOString(),
+    });
+  } catch (error) {
+    if (job.status === "cancelled") return;
+    if (error instanceof RetryableJobError && job.attempts < maxAttempts) {
+      update(job, { status: "retrying", error: error.message });
+      const delay =
+        error.retryAfterMs ?? retryDelayMs * 2 ** (job.attempts - 1);
+      setTimeout(() => {
+        if (job.status !== "retrying") return;
+        update(job, { status: "queued" });
+        queue.push(job);
+        drain();
+      }, delay).unref?.();
+      return;
+    }
+    console.error(`Job ${job.id} (${job.type}) failed:`, error);
+    update(job, {
+      status: "failed",
+      result_status: error.status ?? 500,
+      result: error.body ?? null,
+      error: error.message,
+      finished_at: new Date().toISOString(),
+    });
+  } finally {
+    job.controller = null;
+  }
+}
+
+/**
+ * Queue `run(signal)`, which resolves to `{ status, body }` or throws.
+ * Returns the job, or null when the queue is full.
+ */
+export function enqueueJob(type, run) {
+  if (queue.length >= queueLimit) return null;
+
+  const job = {
+    id: randomUUID(),
+    type,
+    status: "queued",
+    attempts: 0,
+    created_at: new Date().toISOString(),
+    started_at: null,
+    finished_at: null,
+    result_status: null,
+    result: null,
+    error: null,
+    run,
+    controller: null,
+    listeners: new Set(),
+  };
+  jobs.set(job.id, job);
+  queue.push(job);
+  drain();
+  return job;
+}
+
+export const getJob = (id) => jobs.get(id) || null;
+
+/**
+ * Cancel a job that has not finished. Queued and retrying jobs never run
+ * again; a running job's signal is aborted and its result discarded.
+ */
+export function cancelJob(id) {
+  const job = jobs.get(id);
+  if (!job || isTerminal(job)) return job || null;
+  job.controller?.abort();
+  update(job, { status: "cancelled", finished_at: new Date().toISOString() });
+  return job;
+}
+
+/** Call `listener(publicJob)` on every status change until the job ends. */
+export function subscribeJob(id, listener) {
+  const job = jobs.get(id);
+  if (!job || isTerminal(job)) return () => {};
+  job.listeners.add(listener);
+  return () => job.listeners.delete(listener);
+}
+
+export const jobStats = () => ({
+  jobs: jobs.size,
+  queued: queue.length,
+  running,
+  concurrency,
+});
+
+export const wantsAsync = (request) =>
+  new URL(request.url).searchParams.get("async") === "true" ||
+  /respond-async/i.test(request.headers.get("prefer") || "");
+
+/**
+ * Answer 202 now and run `handler` (a route handler taking a Request) as a
+ * job. The body is read up front so every attempt gets a fresh Request; 5xx
+ * and 429 responses are retried, after their Retry-After when they send one,
+ * and anything else is the job's final result.
+ */
+export async function enqueueRequest(type, request, handler) {
+  const body = await request.text();
+
+  const job = enqueueJob(type, async (signal) => {
+    const response = await handler(
+      new Request(request.url, {
+        method: request.method,
+        headers: request.headers,
+        body,
+        signal,
+      }),
+    );
+    const payload = await response.json().catch(() => null);
+    if (response.status >= 500 || response.status === 429) {
+      const error = new RetryableJobError(
+        payload?.error || `Handler responded with ${response.status}`,
+      );
+      error.status = response.status;
+      error.body = payload;
+      error.retryAfterMs = retryAfterMs(response.headers.get("retry-after"));
+      throw error;
+    }
+    return { status: response.status, body: payload };
+  });
+
+  if (!job) {
+    return Response.json(
+      { error: "Job queue is full" },
+      { status: 503, headers: { "Retry-After": "5" } },
+    );
+  }
+  return Response.json(
+    { job: publicJob(job) },
+    {
+      status: 202,
+      headers: { Location: `/api/jobs/${job.id}`, "Retry-After": "1" },
+    },
+  );
+}
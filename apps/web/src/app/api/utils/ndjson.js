@@ -0,0 +1,75 @@
+// Newline-delimited JSON helpers for streaming request and response bodies.
+
+export const NDJSON_CONTENT_TYPE = "application/x-ndjson";
+
+export const isNdjson = (contentType) =>
+  /application\/(x-)?ndjson/.test(contentType || "");
+
+/**
+ * Iterate over the lines of a web ReadableStream without buffering the whole
+ * body. Yields `{ line, text }` with 1-based line numbers; blank lines are
+ * skipped but still counted.
+ */
+export async function* readLines(body) {
+  const decoder = new TextDecoder();
+  let buffered = "";
+  let line = 0;
+
+  for await (const chunk of body) {
+    buffered += decoder.decode(chunk, { stream: true });
+    let newline;
+    while ((newline = buffered.indexOf("\n")) !== -1) {
+      const text = buffered.slice(0, newline).replace(/\r$/, "");
+      buffered = buffered.slice(newline + 1);
+      line += 1;
+      if (text.trim()) yield { line, text };
+    }
+  }
+
+  buffered += decoder.decode();
+  if (buffered.trim()) yield { line: line + 1, text: buffered };
+}
+
+/**
+ * Parse an NDJSON body line by line. Yields `{ line, value }`, or
+ * `{ line, error }` for lines that are not valid JSON.
+ */
+export async function* readNdjson(body) {
+  for await (const { line, text } of readLines(body)) {
+    try {
+      yield { line, value: JSON.parse(text) };
+    } catch {
+      yield { line, error: "Invalid JSON" };
+    }
+  }
+}
+
+/**
+ * Build a streaming response body from an async iterable of strings or
+ * objects (objects are written as one JSON line each). Chunks are pulled
+ * only as fast as the client reads them.
+ */
+export function toReadableStream(iterable) {
+  const encoder = new TextEncoder();
+  const iterator = iterable[Symbol.asyncIterator]();
+
+  return new ReadableStream({
+    async pull(controller) {
+      try {
+        const { value, done } = await iterator.next();
+        if (done) {
+          controller.close();
+          return;
+        }
+        const text =
+          typeof value === "string" ? value : `${JSON.stringify(value)}\n`;
+        controller.enqueue(encoder.encode(text));
+      } catch (error) {
+        controller.error(error);
+      }
+    },
+    async cancel() {
+      await iterator.return?.();
+    },
+  });
+}
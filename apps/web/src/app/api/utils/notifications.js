@@ -0,0 +1,122 @@
+import { auth } from "@/auth";
+import sql from "@/app/api/utils/sql";
+
+// Notifications are stored per user and belong to the signed-in user. In
+// development, requests may instead name any user with `user_id` (as the
+// test scripts do), and otherwise act as the session user or the sample
+// user seeded by database-schema.sql.
+export const DEFAULT_USER_ID = "00000000-0000-0000-0000-000000000001";
+
+const UUID_PATTERN =
+  /^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$/i;
+
+// The severity column is constrained; anything else is the notification's
+// kind (market_alert, buyer_match, ...) and is kept in `category`.
+const SEVERITIES = ["info", "success", "warning", "error"];
+
+export class NotificationUserError extends Error {
+  constructor(message, status = 400) {
+    super(message);
+    this.status = status;
+  }
+}
+
+/**
+ * The id of the user a notification request acts for. `requested` is the
+ * client's `user_id`; outside development it may only name the session user.
+ */
+export async function resolveUserId(requested) {
+  const session = await auth();
+  const sessionUserId = session?.user?.id;
+
+  let userId;
+  if (process.env.NODE_ENV === "development") {
+    userId = requested || sessionUserId || DEFAULT_USER_ID;
+  } else if (!sessionUserId) {
+    throw new NotificationUserError("Unauthorized", 401);
+  } else if (requested && requested !== sessionUserId) {
+    throw new NotificationUserError("Forbidden", 403);
+  } else {
+    userId = sessionUserId;
+  }
+
+  if (!UUID_PATTERN.test(userId)) {
+    throw new NotificationUserError("user_id must be a UUID");
+  }
+  return userId;
+}
+
+export const notificationUserRejected = (error) =>
+  Response.json({ error: error.message }, { status: error.status });
+
+export const toNotification = (row) => ({
+  id: row.id,
+  user_id: row.user_id,
+  type: row.category || row.type,
+  severity: row.type,
+  title: row.title,
+  message: row.message,
+  link_url: row.link_url,
+  data: row.data || {},
+  read: row.is_read,
+  read_at: row.read_at,
+  created_at: row.created_at,
+});
+
+export async function unreadCounts(userId) {
+  const [counter] = await sql`
+    SELECT total_count, unread_count
+    FROM notification_counters
+    WHERE user_id = ${userId}
+  `;
+  return {
+    total: counter?.total_count ?? 0,
+    unread_count: counter?.unread_count ?? 0,
+  };
+}
+
+export async function insertNotification(userId, fields) {
+  const { type, severity, title, message, link_url, data } = fields;
+  const [row] = await sql`
+    INSERT INTO notifications (
+      user_id, type, category, title, message, link_url, data
+    ) VALUES (
+      ${userId},
+      ${SEVERITIES.includes(severity) ? severity : "info"},
+      ${type},
+      ${title},
+      ${message},
+      ${link_url || null},
+      ${JSON.stringify(data || {})}
+    ) RETURNING *
+  `;
+  return row;
+}
+
+// In-process delivery to the open /api/notifications/stream connections.
+// Each listener gets `(event, payload, row)`; `row` is the stored
+// notification for "notification" events.
+const subscribers = new Map();
+
+export function subscribeNotifications(userId, listener) {
+  if (!subscribers.has(userId)) subscribers.set(userId, new Set());
+  subscribers.get(userId).add(listener);
+  return () => {
+    const listeners = subscribers.get(userId);
+    listeners?.delete(listener);
+    if (listeners?.size === 0) subscribers.delete(userId);
+  };
+}
+
+export function publishNotification(userId, event, payload, row = null) {
+  for (const listener of subscribers.get(userId) || []) {
+    try {
+      listener(event, payload, row);
+    } catch (error) {
+      console.error("Notification listener failed:", error);
+    }
+  }
+}
+
+export const subscriberCount = () =>
+  [...subscribers.values()].reduce((total, set) => total + set.size, 0);
@@ -0,0 +1,147 @@
+// Keyset pagination over (created_at, id) for the company-scoped list
+// endpoints, plus `fields=` projection. Pages are ordered newest first and
+// a page's `next_cursor` points at its last row. Requests without `limit`
+// get the first DEFAULT_PAGE_SIZE rows; no list response is ever larger than
+// MAX_PAGE_SIZE rows, so clients follow `next_cursor` for the rest.
+
+export const DEFAULT_PAGE_SIZE = 100;
+export const MAX_PAGE_SIZE = 500;
+
+const UUID_PATTERN =
+  /^[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}$/i;
+
+export const isUuid = (value) =>
+  typeof value === "string" && UUID_PATTERN.test(value);
+
+export class PaginationError extends Error {}
+
+export const encodeCursor = (row) =>
+  Buffer.from(
+    JSON.stringify([new Date(row.created_at).toISOString(), row.id]),
+  ).toString("base64url");
+
+export const decodeCursor = (cursor) => {
+  try {
+    const [createdAt, id] = JSON.parse(
+      Buffer.from(cursor, "base64url").toString("utf8"),
+    );
+    if (
+      typeof createdAt !== "string" ||
+      !Number.isFinite(Date.parse(createdAt)) ||
+      !isUuid(id)
+    ) {
+      throw new Error();
+    }
+    return { createdAt, id };
+  } catch {
+    throw new PaginationError("Invalid cursor");
+  }
+};
+
+/**
+ * Read `limit`, `cursor` and `fields` from the query string. `limit` falls
+ * back to `defaultLimit` and is capped at MAX_PAGE_SIZE. `allowedFields`
+ * whitelists the projectable columns; id and created_at are always selected
+ * because the next cursor is built from them.
+ */
+export function parsePageParams(
+  searchParams,
+  allowedFields,
+  defaultLimit = DEFAULT_PAGE_SIZE,
+) {
+  const limit = Math.min(
+    Math.max(parseInt(searchParams.get("limit")) || defaultLimit, 1),
+    MAX_PAGE_SIZE,
+  );
+  const cursorParam = searchParams.get("cursor");
+  const cursor = cursorParam ? decodeCursor(cursorParam) : null;
+
+  let fields = null;
+  const fieldsParam = searchParams.get("fields");
+  if (fieldsParam) {
+    const requested = fieldsParam
+      .split(",")
+      .map((field) => field.trim())
+      .filter(Boolean);
+    const unknown = requested.filter((field) => !allowedFields.includes(field));
+    if (unknown.length > 0) {
+      throw new PaginationError(`Unknown fields: ${unknown.join(", ")}`);
+    }
+    fields = [...new Set(["id", "created_at", ...requested])];
+  }
+
+  return { limit, cursor, fields };
+}
+
+/**
+ * Fetch one page of `table` rows matching `where` (which uses $1..$n for
+ * `values`). The cursor row's exact created_at is looked up by id so that
+ * microsecond timestamps survive the round trip through a JS Date.
+ *
+ * `offset` skips rows after the cursor, for endpoints that kept an offset
+ * parameter from before keyset pagination. Default projections go through a named
+ * prepared statement when `statementName` is given.
+ */
+export async function fetchPage(
+  sql,
+  { table, where, values, limit, cursor, fields, statementName, offset = 0 },
+) {
+  const params = [...values];
+  let clause = where;
+
+  if (cursor) {
+    params.push(cursor.id, cursor.createdAt);
+    const idParam = `$${params.length - 1}`;
+    const createdAtParam = `$${params.length}`;
+    clause += ` AND (created_at, id) < (COALESCE((SELECT created_at FROM ${table} WHERE id = ${idParam}), ${createdAtParam}::timestamptz), ${idParam})`;
+  }
+
+  params.push(limit + 1);
+  let text = `SELECT ${fields ? fields.join(", ") : "*"} FROM ${table} ${clause} ORDER BY created_at DESC, id DESC LIMIT $${params.length}`;
+  if (offset > 0) {
+    params.push(offset);
+    text += ` OFFSET $${params.length}`;
+  }
+
+  // One prepared statement per query shape, e.g. products_by_company_after
+  const statement = [
+    statementName,
+    cursor && "after",
+    offset > 0 && "offset",
+  ]
+    .filter(Boolean)
+    .join("_");
+
+  const rows =
+    statementName && !fields
+      ? await sql.prepared(statement, text, params)
+      : await sql(text, params);
+
+  const hasMore = rows.length > limit;
+  const page = hasMore ? rows.slice(0, limit) : rows;
+  return {
+    rows: page,
+    next_cursor: hasMore ? encodeCursor(page[page.length - 1]) : null,
+    has_more: hasMore,
+  };
+}
+
+/**
+ * Every row from `cursor` onwards, fetched `limit` rows at a time with
+ * fetchPage(); only one page is held at a time.
+ */
+export async function* streamPages(
+  sql,
+  { cursor, limit = MAX_PAGE_SIZE, ...options },
+) {
+  let next = cursor;
+  do {
+    const page = await fetchPage(sql, {
+      ...options,
+      limit,
+      cursor: next,
+    });
+    yield* page.rows;
+    next = page.next_cursor ? decodeCursor(page.next_cursor) : null;
+  } while (next);
+}
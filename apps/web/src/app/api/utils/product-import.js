@@ -0,0 +1,162 @@
+import { Readable } from "node:stream";
+import Papa from "papaparse";
+import { buildInsert } from "@/app/api/utils/bulk-insert";
+
+// Row validation and batched inserts for catalogue imports
+// (/api/products/bulk).
+
+export const PRODUCT_IMPORT_COLUMNS = [
+  "product_name",
+  "hs_code",
+  "category",
+  "material",
+  "technical_specs",
+  "unit_price",
+  "currency",
+  "description",
+  "image_url",
+  "min_order_quantity",
+  "production_capacity",
+  "certifications",
+];
+
+export const PRODUCT_IMPORT_BATCH_SIZE =
+  parseInt(process.env.PRODUCT_IMPORT_BATCH_SIZE) || 500;
+
+export class ProductRowError extends Error {}
+
+const isBlank = (value) =>
+  value === undefined || value === null || String(value).trim() === "";
+
+const toText = (value) => (isBlank(value) ? null : String(value).trim());
+
+const toNumber = (value, column, { integer = false } = {}) => {
+  if (isBlank(value)) return null;
+  const number = Number(value);
+  if (!Number.isFinite(number) || number < 0) {
+    throw new ProductRowError(`${column} must be a non-negative number`);
+  }
+  if (integer && !Number.isInteger(number)) {
+    throw new ProductRowError(`${column} must be an integer`);
+  }
+  return number;
+};
+
+// CSV cells carry lists as "CE;ISO 9001"; NDJSON rows may use arrays.
+const toTextArray = (value) => {
+  if (isBlank(value)) return null;
+  const items = Array.isArray(value) ? value : String(value).split(/[;|]/);
+  const cleaned = items.map((item) => String(item).trim()).filter(Boolean);
+  return cleaned.length > 0 ? cleaned : null;
+};
+
+const lineBreaks = (fields) =>
+  fields.reduce((count, field) => count + field.split("\n").length - 1, 0);
+
+/**
+ * Read a streamed CSV body whose first record is the header. Yields
+ * `{ line, value }` per data record, where `line` is the physical line the
+ * record starts on (the header is line 1), so quoted fields spanning several
+ * lines and blank lines do not shift the numbers reported back.
+ */
+export async function* readCsv(body) {
+  const records = Readable.fromWeb(body).pipe(
+    Papa.parse(Papa.NODE_STREAM_INPUT, { header: false }),
+  );
+  let header = null;
+  let line = 1;
+  for await (const fields of records) {
+    const start = line;
+    line += 1 + lineBreaks(fields);
+    if (fields.length === 1 && fields[0] === "") continue;
+    if (!header) {
+      header = fields;
+      continue;
+    }
+    yield {
+      line: start,
+      value: Object.fromEntries(header.map((column, i) => [column, fields[i]])),
+    };
+  }
+}
+
+/**
+ * Validate one imported record and return its values in
+ * PRODUCT_IMPORT_COLUMNS order. Throws ProductRowError with a message
+ * suitable for the per-row error report.
+ */
+export function normalizeProductRow(raw) {
+  if (!raw || typeof raw !== "object" || Array.isArray(raw)) {
+    throw new ProductRowError("Row must be an object");
+  }
+  const productName = toText(raw.product_name);
+  if (!productName) {
+    throw new ProductRowError("product_name is required");
+  }
+
+  return [
+    productName,
+    toText(raw.hs_code),
+    toText(raw.category),
+    toText(raw.material),
+    toText(raw.technical_specs),
+    toNumber(raw.unit_price, "unit_price"),
+    toText(raw.currency) || "USD",
+    toText(raw.description),
+    toText(raw.image_url),
+    toNumber(raw.min_order_quantity, "min_order_quantity", { integer: true }),
+    toText(raw.production_capacity),
+    toTextArray(raw.certifications),
+  ];
+}
+
+// One multi-row INSERT for the whole batch.
+const insertRows = (query, companyId, rows) => {
+  const { text, values } = buildInsert(
+    "products",
+    ["company_id", ...PRODUCT_IMPORT_COLUMNS],
+    rows.map((row) => [companyId, ...row]),
+    "RETURNING id",
+  );
+  return query(text, values);
+};
+
+/**
+ * Insert `batch` ([{ line, values }]) inside the caller's transaction. The
+ * batch goes in as one statement under a savepoint; if it fails, it is rolled
+ * back and retried row by row so that only the offending rows are rejected.
+ * Returns `{ inserted, errors: [{ line, error }] }`.
+ */
+export async function insertProductBatch(query, companyId, batch) {
+  if (batch.length === 0) return { inserted: 0, errors: [] };
+
+  await query("SAVEPOINT product_batch");
+  try {
+    const ids = await insertRows(
+      query,
+      companyId,
+      batch.map((row) => row.values),
+    );
+    await query("RELEASE SAVEPOINT product_batch");
+    return { inserted: ids.length, errors: [] };
+  } catch {
+    await query("ROLLBACK TO SAVEPOINT product_batch");
+    await query("RELEASE SAVEPOINT product_batch");
+  }
+
+  let inserted = 0;
+  const errors = [];
+  for (const row of batch) {
+    await query("SAVEPOINT product_row");
+    try {
+      await insertRows(query, companyId, [row.values]);
+      await query("RELEASE SAVEPOINT product_row");
+      inserted += 1;
+    } catch (error) {
+      await query("ROLLBACK TO SAVEPOINT product_row");
+      await query("RELEASE SAVEPOINT product_row");
+      errors.push({ line: row.line, error: error.message });
+    }
+  }
+  return { inserted, errors };
+}
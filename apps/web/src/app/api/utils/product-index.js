@@ -0,0 +1,284 @@
+import sql from "@/app/api/utils/sql";
+import {
+  foldText,
+  lookupCode,
+  normalizeCode,
+} from "@/app/api/utils/gtip-index";
+import { timed } from "@/app/api/utils/timing";
+
+// In-process TF-IDF index over each company's product catalogue, used to
+// pick a small candidate set of similar products before an AI call instead
+// of sending the whole catalogue.
+//
+// A company's index is loaded from the database on first use and kept up to
+// date by indexProduct() on insert. Bulk imports invalidate it, and every
+// REFRESH_MS it catches up on rows inserted by other server processes. Only
+// inserts are tracked: rows deleted or edited outside this process stay as
+// they were until the index is invalidated or evicted and rebuilt.
+// Documents are built from the product's text fields and its HS code
+// hierarchy (chapter, heading and subheading codes and names), so products
+// in the same heading match even when their names share no words.
+
+const REFRESH_MS = 60 * 1000;
+// Rows are re-read this far behind the newest one seen, since a long import
+// transaction commits rows stamped with its start time.
+const REFRESH_LOOKBACK_MS = 15 * 60 * 1000;
+const MAX_COMPANIES = 200;
+
+const INDEXED_COLUMNS = [
+  "id",
+  "company_id",
+  "product_name",
+  "category",
+  "material",
+  "description",
+  "technical_specs",
+  "hs_code",
+  "created_at",
+].join(", ");
+
+const FIELD_WEIGHTS = {
+  product_name: 3,
+  category: 2,
+  material: 2,
+  description: 1,
+  technical_specs: 1,
+};
+
+// English and Turkish, already folded
+const STOPWORDS = new Set([
+  ...["and", "for", "the", "with", "from", "of", "in", "or", "to", "by", "on"],
+  ...["ve", "ile", "icin", "veya", "bir", "bu", "da", "de"],
+]);
+
+const words = (text) =>
+  foldText(text || "")
+    .split(/[^\p{L}\p{N}]+/u)
+    .filter((w) => w.length > 1 && !STOPWORDS.has(w) && !/^\d+$/.test(w));
+
+/**
+ * Weighted term frequencies for a product: its text fields, plus `hs:` code
+ * tokens and the names of its chapter and heading.
+ */
+export function productTerms(product) {
+  const terms = new Map();
+  const add = (term, weight) =>
+    terms.set(term, (terms.get(term) || 0) + weight);
+
+  for (const [field, weight] of Object.entries(FIELD_WEIGHTS)) {
+    for (const word of words(product[field])) add(word, weight);
+  }
+
+  const digits = normalizeCode(product.hs_code);
+  if (digits.length >= 2) {
+    add(`hs:${digits.slice(0, 2)}`, 1);
+    if (digits.length >= 4) add(`hs:${digits.slice(0, 4)}`, 2);
+    if (digits.length >= 6) add(`hs:${digits.slice(0, 6)}`, 3);
+    const { chapter, heading } = lookupCode(digits);
+    for (const word of words(chapter?.name)) add(word, 1);
+    for (const word of words(heading?.name)) add(word, 1);
+  }
+  return terms;
+}
+
+const termWeight = (tf, idf) => (1 + Math.log(tf)) * idf;
+
+// Document norms depend on every term's idf, so they are cached and only
+// recomputed once the catalogue has grown or shrunk by this fraction.
+const NORM_DRIFT = 0.1;
+
+class CatalogueIndex {
+  constructor() {
+    this.docs = new Map();
+    this.postings = new Map();
+    this.normsSize = 0;
+    this.refreshedAt = Date.now();
+    this.newestCreatedAt = 0;
+  }
+
+  idf(term) {
+    const df = this.postings.get(term)?.size || 0;
+    return Math.log((this.docs.size + 1) / (df + 1)) + 1;
+  }
+
+  norm(terms) {
+    let sum = 0;
+    for (const [term, tf] of terms) sum += termWeight(tf, this.idf(term)) ** 2;
+    return Math.sqrt(sum);
+  }
+
+  refreshNorms() {
+    const drift = Math.abs(this.docs.size - this.normsSize);
+    if (drift <= this.normsSize * NORM_DRIFT) return;
+    for (const doc of this.docs.values()) doc.norm = this.norm(doc.terms);
+    this.normsSize = this.docs.size;
+  }
+
+  add(product) {
+    this.remove(product.id);
+    const terms = productTerms(product);
+    this.docs.set(product.id, {
+      product: {
+        id: product.id,
+        product_name: product.product_name,
+        category: product.category,
+        hs_code: product.hs_code,
+      },
+      terms,
+    });
+    for (const [term, tf] of terms) {
+      if (!this.postings.has(term)) this.postings.set(term, new Map());
+      this.postings.get(term).set(product.id, tf);
+    }
+    this.docs.get(product.id).norm = this.norm(terms);
+    const createdAt = new Date(product.created_at).getTime();
+    if (createdAt > this.newestCreatedAt) this.newestCreatedAt = createdAt;
+  }
+
+  remove(id) {
+    const doc = this.docs.get(id);
+    if (!doc) return;
+    for (const term of doc.terms.keys()) {
+      const posting = this.postings.get(term);
+      posting.delete(id);
+      if (posting.size === 0) this.postings.delete(term);
+    }
+    this.docs.delete(id);
+  }
+
+  // Cosine similarity between `terms` and every document sharing a term with
+  // it; the k best, excluding `excludeId`.
+  search(terms, k, excludeId) {
+    this.refreshNorms();
+    const queryNorm = this.norm(terms);
+    const dots = new Map();
+    for (const [term, tf] of terms) {
+      const idf = this.idf(term);
+      const weight = termWeight(tf, idf);
+      for (const [id, docTf] of this.postings.get(term) || []) {
+        dots.set(id, (dots.get(id) || 0) + weight * termWeight(docTf, idf));
+      }
+    }
+    dots.delete(excludeId);
+
+    const scored = [];
+    for (const [id, dot] of dots) {
+      scored.push([id, dot / (queryNorm * this.docs.get(id).norm)]);
+    }
+    scored.sort((a, b) => b[1] - a[1]);
+    return scored.slice(0, k).map(([id, similarity]) => ({
+      ...this.docs.get(id).product,
+      similarity: Math.round(similarity * 1000) / 1000,
+    }));
+  }
+}
+
+// companyId -> CatalogueIndex, least recently used first.
+const indexes = new Map();
+const loading = new Map();
+// companyId -> number of invalidations; a load that started before the
+// latest one is dropped instead of stored.
+const generations = new Map();
+async function loadIndex(companyId) {
+  const index = new CatalogueIndex();
+  const rows = await sql(
+    `SELECT ${INDEXED_COLUMNS} FROM products WHERE company_id = $1`,
+    [companyId],
+  );
+  for (const row of rows) index.add(row);
+  return index;
+}
+
+async function refreshIndex(companyId, index) {
+  index.refreshedAt = Date.now();
+  const rows = await sql(
+    `SELECT ${INDEXED_COLUMNS} FROM products
+     WHERE company_id = $1 AND created_at > $2`,
+    [companyId, new Date(index.newestCreatedAt - REFRESH_LOOKBACK_MS)],
+  );
+  for (const row of rows) {
+    if (!index.docs.has(row.id)) index.add(row);
+  }
+}
+
+// Load a company's index and store it, unless the company was invalidated
+// while the load ran, in which case it resolves to null.
+function startLoad(companyId) {
+  const generation = generations.get(companyId) || 0;
+  const load = loadIndex(companyId)
+    .then((index) => {
+      if ((generations.get(companyId) || 0) !== generation) return null;
+      indexes.set(companyId, index);
+      if (indexes.size > MAX_COMPANIES) {
+        indexes.delete(indexes.keys().next().value);
+      }
+      return index;
+    })
+    .finally(() => {
+      if (loading.get(companyId) === load) loading.delete(companyId);
+    });
+  loading.set(companyId, load);
+  return load;
+}
+
+async function companyIndex(companyId) {
+  let index = indexes.get(companyId);
+  if (index) {
+    indexes.delete(companyId);
+    indexes.set(companyId, index);
+    if (Date.now() - index.refreshedAt > REFRESH_MS) {
+      await refreshIndex(companyId, index);
+    }
+    return index;
+  }
+  while (!index) {
+    index = await (loading.get(companyId) ?? startLoad(companyId));
+  }
+  return index;
+}
+
+/**
+ * The `k` products of `product`'s company most similar to it, best first,
+ * each as `{ id, product_name, category, hs_code, similarity }`.
+ */
+export async function similarProducts(product, k = 10) {
+  const index = await companyIndex(product.company_id);
+  return timed("index", () =>
+    index.search(productTerms(product), k, product.id),
+  );
+}
+
+// Free-text search over a company's catalogue, ranked the same way. A
+// numeric word in the query (e.g. "6109.10") is read as an HS code.
+export async function searchProducts(companyId, text, k = 10) {
+  const index = await companyIndex(companyId);
+  const hsCode = text.split(/\s+/).find((word) => /^[\d.]{2,}$/.test(word));
+  return timed("index", () =>
+    index.search(productTerms({ product_name: text, hs_code: hsCode }), k),
+  );
+}
+
+// Add a newly inserted (or updated) product to its company's index, if that
+// index is loaded; otherwise it is picked up when the index is built.
+export function indexProduct(product) {
+  indexes.get(product.company_id)?.add(product);
+}
+
+// Drop a company's index so the next query rebuilds it, e.g. after a bulk
+// import. A load already in flight may predate the change, so it is
+// discarded too.
+export function invalidateProductIndex(companyId) {
+  generations.set(companyId, (generations.get(companyId) || 0) + 1);
+  indexes.delete(companyId);
+  loading.delete(companyId);
+}
+
+export function productIndexStats() {
+  let products = 0;
+  let terms = 0;
+  for (const index of indexes.values()) {
+    products += index.docs.size;
+    terms += index.postings.size;
+  }
+  return { companies: indexes.size, products, terms };
+}
@@ -0,0 +1,194 @@
+import { pipeline, Readable } from "node:stream";
+import zlib from "node:zlib";
+import { NDJSON_CONTENT_TYPE, toReadableStream } from "@/app/api/utils/ndjson";
+
+// Response helpers for the large list endpoints: negotiated gzip/brotli
+// compression, JSON serialized row by row instead of as one string, and an
+// NDJSON mode for clients that want to process rows as they arrive.
+
+// Bodies of known length below this go out as is; compression framing would
+// cost more than it saves.
+const MIN_COMPRESS_BYTES = 1024;
+// Serialized rows are sent in chunks of about this size.
+const CHUNK_BYTES = 16 * 1024;
+
+const COMPRESSIBLE = /^(application\/(json|x-ndjson)|text\/(plain|csv))/;
+
+// Brotli's default quality (11) is too slow for per-request use.
+const encoders = {
+  br: () =>
+    zlib.createBrotliCompress({
+      params: { [zlib.constants.BROTLI_PARAM_QUALITY]: 5 },
+    }),
+  gzip: () => zlib.createGzip({ level: 6 }),
+};
+
+/**
+ * Pick "br" or "gzip" from the request's Accept-Encoding by q-value,
+ * preferring brotli on ties, or null when neither is acceptable.
+ */
+export function negotiateEncoding(request) {
+  const header = request.headers.get("accept-encoding");
+  if (!header) return null;
+
+  const weights = {};
+  for (const part of header.split(",")) {
+    const [name, ...params] = part.trim().toLowerCase().split(";");
+    const q = params.find((param) => param.trim().startsWith("q="));
+    weights[name] = q ? parseFloat(q.trim().slice(2)) || 0 : 1;
+  }
+  const weight = (encoding) => weights[encoding] ?? weights["*"] ?? 0;
+
+  const best = ["br", "gzip"].reduce((a, b) => (weight(b) > weight(a) ? b : a));
+  return weight(best) > 0 ? best : null;
+}
+
+const varyOnEncoding = (headers) => {
+  if (!/accept-encoding/i.test(headers.get("vary") || "")) {
+    headers.append("Vary", "Accept-Encoding");
+  }
+};
+
+// An encoded body is no longer byte-identical to the original, so a strong
+// ETag is weakened, as nginx does.
+const setEncoding = (headers, encoding) => {
+  headers.set("Content-Encoding", encoding);
+  headers.delete("Content-Length");
+  const etag = headers.get("etag");
+  if (etag && !etag.startsWith("W/")) headers.set("ETag", `W/${etag}`);
+};
+
+export const wantsNdjson = (request) =>
+  new URL(request.url).searchParams.get("format") === "ndjson" ||
+  (request.headers.get("accept") || "").includes(NDJSON_CONTENT_TYPE);
+
+/**
+ * Compress `response`'s body with the encoding the client prefers, as a
+ * stream. Responses that are already encoded, small or not text pass through
+ * unchanged.
+ */
+export function compressResponse(request, response) {
+  const headers = new Headers(response.headers);
+  varyOnEncoding(headers);
+
+  const length = headers.get("content-length");
+  const encoding = negotiateEncoding(request);
+  if (
+    !response.body ||
+    !encoding ||
+    headers.has("content-encoding") ||
+    !COMPRESSIBLE.test(headers.get("content-type") || "") ||
+    (length !== null && Number(length) < MIN_COMPRESS_BYTES)
+  ) {
+    return new Response(response.body, {
+      status: response.status,
+      statusText: response.statusText,
+      headers,
+    });
+  }
+
+  const body = pipeline(
+    Readable.fromWeb(response.body),
+    encoders[encoding](),
+    (error) => {
+      if (error) console.error("Response compression failed:", error);
+    },
+  );
+  setEncoding(headers, encoding);
+  return new Response(Readable.toWeb(body), {
+    status: response.status,
+    statusText: response.statusText,
+    headers,
+  });
+}
+
+/**
+ * Compress a static body once per encoding and serve the variant the client
+ * accepts. `text` is encoded on first use and kept.
+ */
+export function precompressed(text) {
+  const variants = {};
+  const compress = {
+    br: () => zlib.brotliCompressSync(text),
+    gzip: () => zlib.gzipSync(text, { level: 9 }),
+  };
+
+  return (request, init = {}) => {
+    const headers = new Headers(init.headers);
+    varyOnEncoding(headers);
+    const encoding =
+      Buffer.byteLength(text) >= MIN_COMPRESS_BYTES
+        ? negotiateEncoding(request)
+        : null;
+    if (!encoding) return new Response(text, { ...init, headers });
+
+    variants[encoding] ??= compress[encoding]();
+    setEncoding(headers, encoding);
+    return new Response(variants[encoding], { ...init, headers });
+  };
+}
+
+/**
+ * Serialize `{ [key]: rows, ...rest }` without building the whole string.
+ * `rows` may be an array or an async iterable of rows.
+ */
+export async function* jsonChunks(key, rows, rest = {}) {
+  let chunk = `{${JSON.stringify(key)}:[`;
+  let first = true;
+  for await (const row of rows) {
+    chunk += (first ? "" : ",") + JSON.stringify(row);
+    first = false;
+    if (chunk.length >= CHUNK_BYTES) {
+      yield chunk;
+      chunk = "";
+    }
+  }
+  const tail = JSON.stringify(rest);
+  yield `${chunk}]${tail === "{}" ? "" : `,${tail.slice(1, -1)}`}}`;
+}
+
+async function* ndjsonChunks(rows) {
+  let chunk = "";
+  for await (const row of rows) {
+    chunk += `${JSON.stringify(row)}\n`;
+    if (chunk.length >= CHUNK_BYTES) {
+      yield chunk;
+      chunk = "";
+    }
+  }
+  if (chunk) yield chunk;
+}
+
+// Errors after the headers are sent can only abort the body, so log them.
+async function* logged(chunks, label) {
+  try {
+    yield* chunks;
+  } catch (error) {
+    console.error(`Error streaming ${label}:`, error);
+    throw error;
+  }
+}
+
+/**
+ * A JSON list response `{ [key]: rows, ...rest }`, serialized row by row and
+ * compressed when the client allows it.
+ */
+export const jsonListResponse = (request, key, rows, rest) =>
+  compressResponse(
+    request,
+    new Response(toReadableStream(logged(jsonChunks(key, rows, rest), key)), {
+      headers: { "Content-Type": "application/json" },
+    }),
+  );
+
+/**
+ * One JSON row per line from an async iterable, pulled as the client reads
+ * and compressed when the client allows it.
+ */
+export const ndjsonResponse = (request, rows, label = "rows") =>
+  compressResponse(
+    request,
+    new Response(toReadableStream(logged(ndjsonChunks(rows), label)), {
+      headers: { "Content-Type": NDJSON_CONTENT_TYPE },
+    }),
+  );
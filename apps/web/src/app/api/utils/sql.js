@@ -1,27 +1,167 @@
-import { neon } from "@neondatabase/serverless";
+import { Client, neon, neonConfig, Pool } from "@neondatabase/serverless";
+import ws from "ws";
+import { timed } from "@/app/api/utils/timing";
 
-const NullishQueryFunction = () => {
+neonConfig.webSocketConstructor = ws;
+
+// HTTP queries are timed as the request's "db" phase, including the body read.
+neonConfig.fetchFunction = (url, init) =>
+  timed("db", async () => {
+    const response = await fetch(url, init);
+    return new Response(await response.arrayBuffer(), response);
+  });
+
+// Local mode points the driver at a Neon-compatible proxy in front of a plain
+// Postgres (testsprite_tests/local_db.py), so the API can run without network.
+if (process.env.DATABASE_MODE === "local") {
+  const httpEndpoint =
+    process.env.LOCAL_DATABASE_HTTP_ENDPOINT || "http://localhost:4444/sql";
+  const wsProxy = process.env.LOCAL_DATABASE_WS_PROXY || "localhost:5433/v1";
+
+  neonConfig.fetchEndpoint = () => httpEndpoint;
+  neonConfig.wsProxy = () => wsProxy;
+  neonConfig.useSecureWebSocket = false;
+  neonConfig.pipelineTLS = false;
+  neonConfig.pipelineConnect = false;
+}
+
+const poolSize = parseInt(process.env.DATABASE_POOL_SIZE) || 0;
+const poolIdleTimeout =
+  parseInt(process.env.DATABASE_POOL_IDLE_TIMEOUT_MS) || 30000;
+
+const missingConnectionString = () => {
   throw new Error(
     "No database connection string was provided to `neon()`. Perhaps process.env.DATABASE_URL has not been set",
   );
 };
-NullishQueryFunction.transaction = () => {
-  throw new Error(
-    "No database connection string was provided to `neon()`. Perhaps process.env.DATABASE_URL has not been set",
-  );
+
+const NullishQueryFunction = missingConnectionString;
+NullishQueryFunction.transaction = missingConnectionString;
+NullishQueryFunction.prepared = missingConnectionString;
+NullishQueryFunction.withTransaction = missingConnectionString;
+
+const isTemplateCall = (value) => Array.isArray(value) && "raw" in value;
+
+// Turn a tagged template call into a parameterised query.
+const toQuery = (strings, values) => {
+  let text = strings[0];
+  for (let i = 1; i < strings.length; i++) {
+    text += `$${i}${strings[i]}`;
+  }
+  return { text, values };
 };
 
-// Force fresh connections by adding cache buster to connection string
-const createFreshConnection = () => {
-  if (!process.env.DATABASE_URL) return NullishQueryFunction;
+// Run `fn(query)` inside BEGIN/COMMIT on a single client, rolling back if it
+// throws. Unlike sql.transaction([...]) the callback sees each result before
+// issuing the next statement, so it can use savepoints.
+const runInTransaction = async (client, fn) => {
+  const query = (text, values = []) =>
+    timed("db", () => client.query(text, values)).then((res) => res.rows);
+  try {
+    await client.query("BEGIN");
+    const result = await fn(query);
+    await client.query("COMMIT");
+    return result;
+  } catch (error) {
+    await client.query("ROLLBACK").catch(() => {});
+    throw error;
+  }
+};
+
+// HTTP mode: one stateless request per query. Statements cannot be prepared
+// over HTTP, so `prepared` falls back to a plain parameterised query.
+const createHttpConnection = (connectionString) => {
+  const sql = neon(connectionString);
+  sql.prepared = (_name, text, values = []) => sql(text, values);
+  // Interactive transactions need a session, so open a WebSocket client.
+  sql.withTransaction = async (fn) => {
+    const client = new Client(connectionString);
+    await client.connect();
+    try {
+      return await runInTransaction(client, fn);
+    } finally {
+      await client.end();
+    }
+  };
+  return sql;
+};
+
+// Pool mode (DATABASE_POOL_SIZE > 0): WebSocket connections are kept open and
+// reused, and `prepared` statements are parsed once per connection.
+const createPooledConnection = (connectionString) => {
+  const pool = new Pool({
+    connectionString,
+    max: poolSize,
+    idleTimeoutMillis: poolIdleTimeout,
+  });
+  pool.on("error", (error) => {
+    console.error("Idle database client error:", error);
+  });
+
+  // Queries are lazy, like neon()'s, so they can be collected into
+  // sql.transaction([...]) before anything is sent.
+  const lazyQuery = (query) => {
+    let result;
+    const run = () =>
+      (result ??= timed("db", () => pool.query(query)).then((res) => res.rows));
+    return {
+      query,
+      then: (onFulfilled, onRejected) => run().then(onFulfilled, onRejected),
+      catch: (onRejected) => run().catch(onRejected),
+      finally: (onFinally) => run().finally(onFinally),
+    };
+  };
+
+  const sql = (stringsOrText, ...rest) =>
+    lazyQuery(
+      isTemplateCall(stringsOrText)
+        ? toQuery(stringsOrText, rest)
+        : { text: stringsOrText, values: rest[0] || [] },
+    );
 
-  const baseUrl = process.env.DATABASE_URL;
-  const separator = baseUrl.includes("?") ? "&" : "?";
-  const cacheBuster = `${separator}_cb=${Date.now()}`;
+  sql.prepared = (name, text, values = []) => lazyQuery({ name, text, values });
+
+  sql.transaction = (queries) =>
+    timed("db", async () => {
+      const client = await pool.connect();
+      try {
+        await client.query("BEGIN");
+        const results = [];
+        for (const { query } of queries) {
+          const res = await client.query(query);
+          results.push(res.rows);
+        }
+        await client.query("COMMIT");
+        return results;
+      } catch (error) {
+        await client.query("ROLLBACK").catch(() => {});
+        throw error;
+      } finally {
+        client.release();
+      }
+    });
+
+  sql.withTransaction = async (fn) => {
+    const client = await pool.connect();
+    try {
+      return await runInTransaction(client, fn);
+    } finally {
+      client.release();
+    }
+  };
+
+  sql.pool = pool;
+  return sql;
+};
+
+const createConnection = () => {
+  if (!process.env.DATABASE_URL) return NullishQueryFunction;
 
-  return neon(baseUrl + cacheBuster);
+  return poolSize > 0
+    ? createPooledConnection(process.env.DATABASE_URL)
+    : createHttpConnection(process.env.DATABASE_URL);
 };
 
-const sql = createFreshConnection();
+const sql = createConnection();
 
 export default sql;
@@ -0,0 +1,139 @@
+import { AsyncLocalStorage } from "node:async_hooks";
+import { performance } from "node:perf_hooks";
+
+// Per-request phase timings. Every API handler runs inside withTiming(), and
+// the sql helper and integration calls wrap their work in timed(). Each
+// response gets a Server-Timing header, and each request is added to the
+// in-process histograms served by /api/metrics.
+//
+// A phase's duration is the sum of its calls, so concurrent queries can add
+// up to more than the request's total.
+
+// Upper bounds in milliseconds; the last bucket catches everything slower.
+export const HISTOGRAM_BUCKETS_MS = [
+  5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000, 60000,
+];
+
+const timingContext = new AsyncLocalStorage();
+const histograms = new Map();
+let since = new Date().toISOString();
+
+const newHistogram = () => ({
+  count: 0,
+  sum_ms: 0,
+  max_ms: 0,
+  buckets: Array(HISTOGRAM_BUCKETS_MS.length + 1).fill(0),
+});
+
+const observe = (histogram, ms) => {
+  histogram.count += 1;
+  histogram.sum_ms += ms;
+  histogram.max_ms = Math.max(histogram.max_ms, ms);
+  let bucket = HISTOGRAM_BUCKETS_MS.findIndex((bound) => ms <= bound);
+  if (bucket === -1) bucket = HISTOGRAM_BUCKETS_MS.length;
+  histogram.buckets[bucket] += 1;
+};
+
+const record = (route, total, phases) => {
+  let entry = histograms.get(route);
+  if (!entry) {
+    entry = { total: newHistogram(), phases: {} };
+    histograms.set(route, entry);
+  }
+  observe(entry.total, total);
+  for (const [phase, { ms }] of Object.entries(phases)) {
+    entry.phases[phase] ??= newHistogram();
+    observe(entry.phases[phase], ms);
+  }
+};
+
+const serverTiming = (total, phases) =>
+  [
+    ...Object.entries(phases).map(
+      ([phase, { ms, calls }]) =>
+        `${phase};dur=${ms.toFixed(1)};desc="${calls} call${calls === 1 ? "" : "s"}"`,
+    ),
+    `total;dur=${total.toFixed(1)}`,
+  ].join(", ");
+
+// fetch() responses have immutable headers, so copy those before adding one.
+const withHeader = (response, name, value) => {
+  try {
+    response.headers.append(name, value);
+    return response;
+  } catch {
+    const copy = new Response(response.body, response);
+    copy.headers.append(name, value);
+    return copy;
+  }
+};
+
+/**
+ * Time `fn()` as phase `phase` of the current request. Outside a request, or
+ * after the request has been recorded, it just runs `fn`.
+ */
+export async function timed(phase, fn) {
+  const timing = timingContext.getStore();
+  if (!timing || timing.done) return fn();
+
+  const start = performance.now();
+  try {
+    return await fn();
+  } finally {
+    const entry = (timing.phases[phase] ??= { ms: 0, calls: 0 });
+    entry.ms += performance.now() - start;
+    entry.calls += 1;
+  }
+}
+
+/**
+ * Run `fn()` as one request to `route` (e.g. "GET /api/products") and record
+ * its timings. A Response result gets a Server-Timing header; for streamed
+ * bodies the timings cover the handler up to the first byte.
+ */
+export async function withTiming(route, fn) {
+  const timing = { phases: {}, done: false };
+  const start = performance.now();
+  let result;
+  try {
+    result = await timingContext.run(timing, fn);
+    return result instanceof Response
+      ? withHeader(
+          result,
+          "Server-Timing",
+          serverTiming(performance.now() - start, timing.phases),
+        )
+      : result;
+  } finally {
+    timing.done = true;
+    record(route, performance.now() - start, timing.phases);
+  }
+}
+
+const summarize = ({ count, sum_ms, max_ms, buckets }) => ({
+  count,
+  mean_ms: count > 0 ? Number((sum_ms / count).toFixed(2)) : null,
+  max_ms: Number(max_ms.toFixed(2)),
+  buckets: [...HISTOGRAM_BUCKETS_MS, "+Inf"].map((le, i) => ({
+    le,
+    count: buckets[i],
+  })),
+});
+
+export function timingSnapshot() {
+  const routes = {};
+  for (const [route, { total, phases }] of histograms) {
+    routes[route] = {
+      total: summarize(total),
+      phases: Object.fromEntries(
+        Object.entries(phases).map(([phase, h]) => [phase, summarize(h)]),
+      ),
+    };
+  }
+  return { since, routes };
+}
+
+export function resetTimings() {
+  histograms.clear();
+  since = new Date().toISOString();
+}
@@ -0,0 +1,60 @@
+import { lookupCode, normalizeCode } from "@/app/api/utils/gtip-index";
+
+// Reads from trade_data_summary, the per HS chapter / country / year view
+// over the trigger-maintained trade_data_rollups (see database-schema.sql).
+// The analysis routes send these compact rows to the AI instead of raw
+// trade_data, so prompt size no longer grows with trade history.
+
+export const hsChapter = (hsCode) => normalizeCode(hsCode).slice(0, 2);
+
+// The largest import markets across all chapters in the latest year on file.
+export const latestTradeSummaries = (sql, limit = 40) =>
+  sql(
+    `SELECT * FROM trade_data_summary
+     WHERE year = (SELECT MAX(year) FROM trade_data_rollups)
+     ORDER BY import_value DESC
+     LIMIT $1`,
+    [limit],
+  );
+
+// Year-by-year statistics for one chapter in one country, newest first.
+export const chapterCountrySummaries = (sql, hsCode, country, limit = 5) =>
+  sql(
+    `SELECT * FROM trade_data_summary
+     WHERE hs_chapter = $1 AND country = $2
+     ORDER BY year DESC
+     LIMIT $3`,
+    [hsChapter(hsCode), country, limit],
+  );
+
+// The largest import markets for one chapter in its latest year on file.
+export const chapterMarketSummaries = (sql, hsCode, limit = 10) =>
+  sql(
+    `SELECT * FROM trade_data_summary
+     WHERE hs_chapter = $1
+       AND year = (SELECT MAX(year) FROM trade_data_rollups WHERE hs_chapter = $1)
+     ORDER BY import_value DESC
+     LIMIT $2`,
+    [hsChapter(hsCode), limit],
+  );
+
+const formatNumber = (value) =>
+  value === null || value === undefined ? "n/a" : Number(value).toString();
+
+const formatPercent = (value) =>
+  value === null || value === undefined ? "n/a" : `${formatNumber(value)}%`;
+
+export const chapterLabel = (chapter) =>
+  `HS ${chapter} ${lookupCode(chapter).chapter?.name || ""}`.trim();
+
+// One prompt line per summary row. YoY import growth is n/a without a prior
+// year on file; the average of the reported growth_rate values is a separate
+// figure and is labelled as such.
+export const describeTradeSummary = (row) =>
+  `${row.country} - ${chapterLabel(row.hs_chapter)} (${row.year}): ` +
+  `$${formatNumber(row.import_value)}M imports, ` +
+  `$${formatNumber(row.export_value)}M exports, ` +
+  `YoY import growth ${formatPercent(row.import_growth_pct)}, ` +
+  `avg reported growth rate ${formatPercent(row.avg_growth_rate)}, ` +
+  `avg unit value ${formatNumber(row.avg_unit_value)} ` +
+  `(sd ${formatNumber(row.unit_value_stddev)})`;
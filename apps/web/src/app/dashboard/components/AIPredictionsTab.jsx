@@ -1,5 +1,5 @@
 import React, { useState } from "react";
-import { useQuery, useMutation, useQueryClient } from "@tanstack/react-query";
+import { useMutation, useQueryClient } from "@tanstack/react-query";
 import {
   Brain,
   TrendingUp,
@@ -33,6 +33,8 @@ import {
   Pie,
   Cell,
 } from "recharts";
+import useCursorList from "@/utils/useCursorList";
+import LoadMoreButton from "@/components/LoadMoreButton";
 
 export default function AIPredictionsTab({ company, filters }) {
   const [selectedPredictionType, setSelectedPredictionType] =
@@ -41,25 +43,22 @@ export default function AIPredictionsTab({ company, filters }) {
   const [isGenerating, setIsGenerating] = useState(false);
   const queryClient = useQueryClient();
 
-  const { data: predictionsData, isLoading } = useQuery({
+  const predictionList = useCursorList({
     queryKey: [
       "ai-predictions",
       company?.id,
       selectedPredictionType,
       selectedPeriod,
     ],
-    queryFn: async () => {
-      const params = new URLSearchParams({
-        company_id: company.id,
-        type: selectedPredictionType,
-        period: selectedPeriod,
-      });
-      const res = await fetch(`/api/ai-predictions?${params}`);
-      if (!res.ok) throw new Error("Failed to fetch predictions");
-      return res.json();
-    },
+    url: `/api/ai-predictions?${new URLSearchParams({
+      company_id: company?.id,
+      type: selectedPredictionType,
+      period: selectedPeriod,
+    })}`,
+    key: "predictions",
     enabled: !!company?.id,
   });
+  const { items: predictions, isLoading } = predictionList;
 
   const generatePredictionMutation = useMutation({
     mutationFn: async (predictionData) => {
@@ -491,14 +490,15 @@ export default function AIPredictionsTab({ company, filters }) {
           <div className="w-12 h-12 border-4 border-blue-400 border-t-transparent rounded-full animate-spin mx-auto"></div>
           <p className="mt-4 text-gray-600">Loading predictions...</p>
         </div>
-      ) : predictionsData?.predictions?.length > 0 ? (
+      ) : predictions.length > 0 ? (
         <div className="space-y-6">
           <h3 className="text-lg font-semibold text-gray-900">
             Recent Predictions
           </h3>
           <div className="grid grid-cols-1 lg:grid-cols-2 gap-6">
-            {predictionsData.predictions.map(renderPredictionCard)}
+            {predictions.map(renderPredictionCard)}
           </div>
+          <LoadMoreButton list={predictionList} />
         </div>
       ) : (
         <div className="bg-white rounded-lg p-12 border border-gray-200 text-center">
@@ -77,6 +77,7 @@ export default function BuyersTab({ company }) {
     },
     onSuccess: () => {
       queryClient.invalidateQueries(["potential-buyers"]);
+      queryClient.invalidateQueries(["dashboard-summary"]);
       setShowSearchModal(false);
     },
     onError: () => {
@@ -107,6 +107,7 @@ Best regards,
     },
     onSuccess: () => {
       queryClient.invalidateQueries(["campaigns"]);
+      queryClient.invalidateQueries(["dashboard-summary"]);
       setShowCreateModal(false);
     },
     onError: (error) => {
@@ -127,6 +128,7 @@ Best regards,
     },
     onSuccess: () => {
       queryClient.invalidateQueries(["campaigns"]);
+      queryClient.invalidateQueries(["dashboard-summary"]);
       setEditingCampaign(null);
     },
   });
@@ -141,6 +143,7 @@ Best regards,
     },
     onSuccess: () => {
       queryClient.invalidateQueries(["campaigns"]);
+      queryClient.invalidateQueries(["dashboard-summary"]);
     },
   });
 
@@ -165,6 +168,7 @@ Best regards,
     },
     onSuccess: () => {
       queryClient.invalidateQueries(["campaigns"]);
+      queryClient.invalidateQueries(["dashboard-summary"]);
     },
   });
 
@@ -13,42 +13,14 @@ import { useMemo } from "react";
 import ActivityFeed from "@/components/ActivityFeed";
 
 export default function DashboardTab({ company, setActiveNav }) {
-  // Fetch real data from APIs
-  const { data: campaignsData } = useQuery({
-    queryKey: ["campaigns", company?.id],
+  // Counts, monthly activity and the latest items in one request
+  const { data: summary } = useQuery({
+    queryKey: ["dashboard-summary", company?.id],
     queryFn: async () => {
-      const res = await fetch(`/api/campaigns?company_id=${company.id}`);
-      if (!res.ok) throw new Error("Failed to fetch campaigns");
-      return res.json();
-    },
-    enabled: !!company?.id,
-  });
-
-  const { data: buyersData } = useQuery({
-    queryKey: ["potential-buyers", company?.id],
-    queryFn: async () => {
-      const res = await fetch(`/api/potential-buyers?company_id=${company.id}`);
-      if (!res.ok) throw new Error("Failed to fetch buyers");
-      return res.json();
-    },
-    enabled: !!company?.id,
-  });
-
-  const { data: reportsData } = useQuery({
-    queryKey: ["market-reports", company?.id],
-    queryFn: async () => {
-      const res = await fetch(`/api/market-reports?company_id=${company.id}`);
-      if (!res.ok) throw new Error("Failed to fetch reports");
-      return res.json();
-    },
-    enabled: !!company?.id,
-  });
-
-  const { data: productsData } = useQuery({
-    queryKey: ["products", company?.id],
-    queryFn: async () => {
-      const res = await fetch(`/api/products?company_id=${company.id}`);
-      if (!res.ok) throw new Error("Failed to fetch products");
+      const res = await fetch(
+        `/api/dashboard/summary?company_id=${company.id}`,
+      );
+      if (!res.ok) throw new Error("Failed to fetch dashboard summary");
       return res.json();
     },
     enabled: !!company?.id,
@@ -56,27 +28,19 @@ export default function DashboardTab({ company, setActiveNav }) {
 
   // Calculate real stats from data
   const stats = useMemo(() => {
-    const campaignCount = campaignsData?.campaigns?.length || 0;
-    const buyerCount = buyersData?.buyers?.length || 0;
-    const marketCount = reportsData?.reports?.length || 0;
+    const campaignCount = summary?.campaigns?.total || 0;
+    const buyerCount = summary?.buyers?.total || 0;
+    const marketCount = summary?.reports?.total || 0;
 
-    // Calculate more realistic revenue from campaigns
+    // Estimated deals come from emails sent × conversion rate (default 2.5%)
+    const averageDealValue = 25000; // Average deal value in USD
     const totalRevenue =
-      campaignsData?.campaigns?.reduce((total, campaign) => {
-        const emailsSent = campaign.emails_sent || 0;
-        const conversionRate = (campaign.conversion_rate || 2.5) / 100; // Default 2.5%
-        const averageDealValue = 25000; // Average deal value in USD
-        const estimatedRevenue = emailsSent * conversionRate * averageDealValue;
-        return total + estimatedRevenue;
-      }, 0) || 0;
+      (summary?.campaigns?.estimated_deals || 0) * averageDealValue;
 
     // Calculate growth rates for more realism
     const currentMonth = new Date().getMonth();
     const lastMonthCampaigns =
-      campaignsData?.campaigns?.filter(
-        (campaign) =>
-          new Date(campaign.created_at).getMonth() === currentMonth - 1,
-      ).length || 0;
+      summary?.campaigns?.by_month?.[currentMonth - 1] || 0;
 
     const campaignGrowth =
       lastMonthCampaigns > 0
@@ -118,15 +82,11 @@ export default function DashboardTab({ company, setActiveNav }) {
         growth: totalRevenue > 0 ? "+23%" : "0%",
       },
     ];
-  }, [campaignsData, buyersData, reportsData]);
+  }, [summary]);
 
   // Generate more realistic chart data
   const chartData = useMemo(() => {
-    if (
-      !campaignsData?.campaigns &&
-      !buyersData?.buyers &&
-      !reportsData?.reports
-    ) {
+    if (!summary) {
       // Return demo data with realistic growth patterns
       const baseMarkets = 15;
       const baseBuyers = 45;
@@ -229,20 +189,9 @@ export default function DashboardTab({ company, setActiveNav }) {
     let cumulativeDeals = 0;
 
     return months.map((month, index) => {
-      const marketsThisMonth =
-        reportsData?.reports?.filter(
-          (report) => new Date(report.created_at).getMonth() === index,
-        ).length || 0;
-
-      const buyersThisMonth =
-        buyersData?.buyers?.filter(
-          (buyer) => new Date(buyer.created_at).getMonth() === index,
-        ).length || 0;
-
-      const dealsThisMonth =
-        campaignsData?.campaigns?.filter(
-          (campaign) => new Date(campaign.created_at).getMonth() === index,
-        ).length || 0;
+      const marketsThisMonth = summary.reports.by_month[index];
+      const buyersThisMonth = summary.buyers.by_month[index];
+      const dealsThisMonth = summary.campaigns.by_month[index];
 
       // Add cumulative effect for realistic growth
       cumulativeMarkets += marketsThisMonth + Math.floor(Math.random() * 3);
@@ -256,7 +205,7 @@ export default function DashboardTab({ company, setActiveNav }) {
         deals: cumulativeDeals,
       };
     });
-  }, [campaignsData, buyersData, reportsData]);
+  }, [summary]);
 
   const colorClasses = {
     blue: "bg-blue-50 text-blue-600",
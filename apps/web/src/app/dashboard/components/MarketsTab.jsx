@@ -1,5 +1,5 @@
 import { useState } from "react";
-import { useQuery, useMutation, useQueryClient } from "@tanstack/react-query";
+import { useMutation, useQueryClient } from "@tanstack/react-query";
 import {
   Globe,
   Search,
@@ -10,6 +10,8 @@ import {
   Plus,
   Filter,
 } from "lucide-react";
+import useCursorList from "@/utils/useCursorList";
+import LoadMoreButton from "@/components/LoadMoreButton";
 
 export default function MarketsTab({ company }) {
   const [searchQuery, setSearchQuery] = useState("");
@@ -18,15 +20,13 @@ export default function MarketsTab({ company }) {
   const [showSearchModal, setShowSearchModal] = useState(false);
   const queryClient = useQueryClient();
 
-  const { data: targetMarkets, isLoading } = useQuery({
+  const marketList = useCursorList({
     queryKey: ["target-markets", company?.id],
-    queryFn: async () => {
-      const res = await fetch(`/api/target-markets?company_id=${company.id}`);
-      if (!res.ok) throw new Error("Failed to fetch target markets");
-      return res.json();
-    },
+    url: `/api/target-markets?company_id=${company?.id}`,
+    key: "markets",
     enabled: !!company?.id,
   });
+  const { items: targetMarkets, isLoading } = marketList;
 
   const analyzeMarketMutation = useMutation({
     mutationFn: async (query) => {
@@ -223,7 +223,7 @@ export default function MarketsTab({ company }) {
       </div>
 
       {/* Markets Grid */}
-      {targetMarkets?.markets?.length === 0 ? (
+      {targetMarkets.length === 0 ? (
         <div className="bg-white rounded-lg p-12 border border-gray-200 text-center">
           <Globe className="w-16 h-16 text-gray-300 mx-auto mb-4" />
           <h3 className="text-xl font-semibold text-gray-900 mb-2">
@@ -241,7 +241,7 @@ export default function MarketsTab({ company }) {
         </div>
       ) : (
         <div className="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-3 gap-6">
-          {targetMarkets?.markets?.map((market) => (
+          {targetMarkets.map((market) => (
             <div
               key={market.id}
               className="bg-white rounded-lg p-6 border border-gray-200 hover:shadow-lg transition"
@@ -308,6 +308,7 @@ export default function MarketsTab({ company }) {
           ))}
         </div>
       )}
+      <LoadMoreButton list={marketList} />
 
       {/* Market Discovery Modal */}
       {showSearchModal && (
@@ -1,6 +1,8 @@
 import { useState } from "react";
-import { useQuery, useMutation, useQueryClient } from "@tanstack/react-query";
+import { useMutation, useQueryClient } from "@tanstack/react-query";
 import { Package, Plus, Edit, Trash2, Search, Filter } from "lucide-react";
+import useCursorList from "@/utils/useCursorList";
+import LoadMoreButton from "@/components/LoadMoreButton";
 
 export default function ProductsTab({ company }) {
   const [showAddModal, setShowAddModal] = useState(false);
@@ -8,15 +10,13 @@ export default function ProductsTab({ company }) {
   const [searchTerm, setSearchTerm] = useState("");
   const queryClient = useQueryClient();
 
-  const { data: products, isLoading } = useQuery({
+  const productList = useCursorList({
     queryKey: ["products", company?.id],
-    queryFn: async () => {
-      const res = await fetch(`/api/products?company_id=${company.id}`);
-      if (!res.ok) throw new Error("Failed to fetch products");
-      return res.json();
-    },
+    url: `/api/products?company_id=${company?.id}`,
+    key: "products",
     enabled: !!company?.id,
   });
+  const { items: products, isLoading } = productList;
 
   const addProductMutation = useMutation({
     mutationFn: async (productData) => {
@@ -30,6 +30,7 @@ export default function ProductsTab({ company }) {
     },
     onSuccess: () => {
       queryClient.invalidateQueries(["products"]);
+      queryClient.invalidateQueries(["dashboard-summary"]);
       setShowAddModal(false);
     },
   });
@@ -46,6 +47,7 @@ export default function ProductsTab({ company }) {
     },
     onSuccess: () => {
       queryClient.invalidateQueries(["products"]);
+      queryClient.invalidateQueries(["dashboard-summary"]);
       setEditingProduct(null);
     },
   });
@@ -60,6 +62,7 @@ export default function ProductsTab({ company }) {
     },
     onSuccess: () => {
       queryClient.invalidateQueries(["products"]);
+      queryClient.invalidateQueries(["dashboard-summary"]);
     },
   });
 
@@ -84,12 +87,11 @@ export default function ProductsTab({ company }) {
     }
   };
 
-  const filteredProducts =
-    products?.products?.filter(
-      (product) =>
-        product.product_name.toLowerCase().includes(searchTerm.toLowerCase()) ||
-        product.category?.toLowerCase().includes(searchTerm.toLowerCase()),
-    ) || [];
+  const filteredProducts = products.filter(
+    (product) =>
+      product.product_name.toLowerCase().includes(searchTerm.toLowerCase()) ||
+      product.category?.toLowerCase().includes(searchTerm.toLowerCase()),
+  );
 
   if (isLoading) {
     return (
@@ -212,6 +214,7 @@ export default function ProductsTab({ company }) {
           ))}
         </div>
       )}
+      <LoadMoreButton list={productList} />
 
       {/* Add/Edit Modal */}
       {(showAddModal || editingProduct) && (
@@ -1,5 +1,5 @@
 import { useState } from "react";
-import { useQuery, useMutation, useQueryClient } from "@tanstack/react-query";
+import { useMutation, useQueryClient } from "@tanstack/react-query";
 import {
   FileText,
   Download,
@@ -10,6 +10,8 @@ import {
   Globe,
   Users,
 } from "lucide-react";
+import useCursorList from "@/utils/useCursorList";
+import LoadMoreButton from "@/components/LoadMoreButton";
 
 export default function ReportsTab({ company }) {
   const [showCreateModal, setShowCreateModal] = useState(false);
@@ -17,15 +19,13 @@ export default function ReportsTab({ company }) {
   const [searchTerm, setSearchTerm] = useState("");
   const queryClient = useQueryClient();
 
-  const { data: marketReports, isLoading } = useQuery({
+  const reportList = useCursorList({
     queryKey: ["market-reports", company?.id],
-    queryFn: async () => {
-      const res = await fetch(`/api/market-reports?company_id=${company.id}`);
-      if (!res.ok) throw new Error("Failed to fetch market reports");
-      return res.json();
-    },
+    url: `/api/market-reports?company_id=${company?.id}`,
+    key: "reports",
     enabled: !!company?.id,
   });
+  const { items: marketReports, isLoading } = reportList;
 
   const generateReportMutation = useMutation({
     mutationFn: async (reportData) => {
@@ -123,6 +123,7 @@ export default function ReportsTab({ company }) {
     },
     onSuccess: () => {
       queryClient.invalidateQueries(["market-reports"]);
+      queryClient.invalidateQueries(["dashboard-summary"]);
       setShowCreateModal(false);
     },
     onError: () => {
@@ -199,15 +200,12 @@ export default function ReportsTab({ company }) {
     generateReportMutation.mutate(reportData);
   };
 
-  const filteredReports =
-    marketReports?.reports?.filter(
-      (report) =>
-        report.report_title.toLowerCase().includes(searchTerm.toLowerCase()) ||
-        report.country?.toLowerCase().includes(searchTerm.toLowerCase()) ||
-        report.product_category
-          ?.toLowerCase()
-          .includes(searchTerm.toLowerCase()),
-    ) || [];
+  const filteredReports = marketReports.filter(
+    (report) =>
+      report.report_title.toLowerCase().includes(searchTerm.toLowerCase()) ||
+      report.country?.toLowerCase().includes(searchTerm.toLowerCase()) ||
+      report.product_category?.toLowerCase().includes(searchTerm.toLowerCase()),
+  );
 
   if (isLoading) {
     return (
@@ -360,6 +358,7 @@ export default function ReportsTab({ company }) {
           ))}
         </div>
       )}
+      <LoadMoreButton list={reportList} />
 
       {/* Create Report Modal */}
       {showCreateModal && (
@@ -39,6 +39,8 @@ import {
   Pie,
   Cell,
 } from "recharts";
+import useCursorList from "@/utils/useCursorList";
+import LoadMoreButton from "@/components/LoadMoreButton";
 
 export default function SmartProductMatchingTab({ company, filters }) {
   const [selectedProduct, setSelectedProduct] = useState(null);
@@ -47,13 +49,11 @@ export default function SmartProductMatchingTab({ company, filters }) {
   const [minMatchScore, setMinMatchScore] = useState(0.6);
   const queryClient = useQueryClient();
 
-  const { data: productsData } = useQuery({
+  // Same list and cache entry as ProductsTab
+  const productList = useCursorList({
     queryKey: ["products", company?.id],
-    queryFn: async () => {
-      const res = await fetch(`/api/products?company_id=${company.id}`);
-      if (!res.ok) throw new Error("Failed to fetch products");
-      return res.json();
-    },
+    url: `/api/products?company_id=${company?.id}`,
+    key: "products",
     enabled: !!company?.id,
   });
 
@@ -364,7 +364,7 @@ export default function SmartProductMatchingTab({ company, filters }) {
               Select Product
             </label>
             <div className="space-y-2 max-h-48 overflow-y-auto">
-              {productsData?.products?.map((product) => (
+              {productList.items.map((product) => (
                 <button
                   key={product.id}
                   onClick={() => setSelectedProduct(product)}
@@ -385,6 +385,7 @@ export default function SmartProductMatchingTab({ company, filters }) {
                   </div>
                 </button>
               ))}
+              <LoadMoreButton list={productList} />
             </div>
           </div>
 
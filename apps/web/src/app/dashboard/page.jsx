@@ -124,29 +124,18 @@ export default function DashboardPage() {
       switch (activeNav) {
         case "Dashboard":
           // Export summary data
-          const [campaigns, buyers, reports, products] = await Promise.all([
-            fetch(`/api/campaigns?company_id=${company.id}`).then((res) =>
-              res.json(),
-            ),
-            fetch(`/api/potential-buyers?company_id=${company.id}`).then(
-              (res) => res.json(),
-            ),
-            fetch(`/api/market-reports?company_id=${company.id}`).then((res) =>
-              res.json(),
-            ),
-            fetch(`/api/products?company_id=${company.id}`).then((res) =>
-              res.json(),
-            ),
-          ]);
+          const summary = await fetch(
+            `/api/dashboard/summary?company_id=${company.id}`,
+          ).then((res) => res.json());
 
           exportData = [
             {
               category: "Active Campaigns",
-              count: campaigns.campaigns?.length || 0,
+              count: summary.campaigns?.total || 0,
             },
-            { category: "Potential Buyers", count: buyers.buyers?.length || 0 },
-            { category: "Market Reports", count: reports.reports?.length || 0 },
-            { category: "Products", count: products.products?.length || 0 },
+            { category: "Potential Buyers", count: summary.buyers?.total || 0 },
+            { category: "Market Reports", count: summary.reports?.total || 0 },
+            { category: "Products", count: summary.products?.total || 0 },
           ];
           filename = "dashboard-summary";
           break;
@@ -0,0 +1,16 @@
+// Shown under a useCursorList() list while the server has more pages.
+export default function LoadMoreButton({ list }) {
+  if (!list.hasNextPage) return null;
+
+  return (
+    <div className="flex justify-center mt-6">
+      <button
+        onClick={() => list.fetchNextPage()}
+        disabled={list.isFetchingNextPage}
+        className="px-6 py-2 border border-gray-300 rounded-lg text-gray-700 hover:bg-gray-50 transition disabled:opacity-50"
+      >
+        {list.isFetchingNextPage ? "Loading..." : "Load more"}
+      </button>
+    </div>
+  );
+}
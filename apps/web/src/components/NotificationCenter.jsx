@@ -34,9 +34,47 @@ export default function NotificationCenter() {
       if (!res.ok) throw new Error("Failed to fetch notifications");
       return res.json();
     },
-    refetchInterval: 30000, // Refetch every 30 seconds for real-time updates
   });
 
+  // New notifications and unread counts are pushed over server-sent events
+  useEffect(() => {
+    const source = new EventSource("/api/notifications/stream");
+
+    // Only notification lists are touched; other cached data is left alone.
+    const updateCached = (update) => {
+      queryClient.setQueriesData({ queryKey: ["notifications"] }, (data) =>
+        Array.isArray(data?.notifications) ? update(data) : data,
+      );
+    };
+
+    source.addEventListener("notification", (event) => {
+      const { notification, unread_count } = JSON.parse(event.data);
+      updateCached((data) => {
+        if (data.notifications.some((n) => n.id === notification.id)) {
+          return data;
+        }
+        return {
+          ...data,
+          notifications: [notification, ...data.notifications],
+          total: data.total + 1,
+          unread_count: unread_count ?? data.unread_count,
+        };
+      });
+    });
+
+    // Too many notifications were missed to replay; reload the lists
+    source.addEventListener("reset", () => {
+      queryClient.invalidateQueries({ queryKey: ["notifications"] });
+    });
+
+    source.addEventListener("unread", (event) => {
+      const { unread_count } = JSON.parse(event.data);
+      updateCached((data) => ({ ...data, unread_count }));
+    });
+
+    return () => source.close();
+  }, [queryClient]);
+
   // Mark notifications as read
   const markAsReadMutation = useMutation({
     mutationFn: async (notificationIds) => {
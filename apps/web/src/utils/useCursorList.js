@@ -0,0 +1,30 @@
+import { useInfiniteQuery } from "@tanstack/react-query";
+
+// A paginated list endpoint read a page at a time by following
+// `next_cursor`. `key` names the array in each page (e.g. "products");
+// `items` is every page loaded so far, flattened.
+const useCursorList = ({ queryKey, url, key, enabled = true }) => {
+  const query = useInfiniteQuery({
+    queryKey,
+    queryFn: async ({ pageParam }) => {
+      const separator = url.includes("?") ? "&" : "?";
+      const res = await fetch(
+        pageParam
+          ? `${url}${separator}cursor=${encodeURIComponent(pageParam)}`
+          : url,
+      );
+      if (!res.ok) throw new Error(`Failed to fetch ${key}`);
+      return res.json();
+    },
+    initialPageParam: null,
+    getNextPageParam: (lastPage) => lastPage.next_cursor ?? undefined,
+    enabled,
+  });
+
+  return {
+    ...query,
+    items: query.data?.pages.flatMap((page) => page[key] ?? []) ?? [],
+  };
+};
+
+export default useCursorList;
@@ -145,11 +145,27 @@ CREATE TABLE IF NOT EXISTS notifications (
   type TEXT DEFAULT 'info' CHECK (type IN ('info', 'success', 'warning', 'error')),
   category TEXT,
   link_url TEXT,
+  data JSONB,
   is_read BOOLEAN DEFAULT false,
   read_at TIMESTAMP WITH TIME ZONE,
   created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
 );
 
+-- Databases created before the data column existed
+ALTER TABLE notifications ADD COLUMN IF NOT EXISTS data JSONB;
+
+-- ============================================
+-- NOTIFICATION COUNTERS (per user)
+-- ============================================
+-- Maintained by a trigger on notifications so the unread badge never has to
+-- count rows.
+CREATE TABLE IF NOT EXISTS notification_counters (
+  user_id UUID PRIMARY KEY,
+  total_count INTEGER NOT NULL DEFAULT 0,
+  unread_count INTEGER NOT NULL DEFAULT 0,
+  updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
 -- ============================================
 -- USERS TABLE (for authentication)
 -- ============================================
@@ -178,6 +194,89 @@ CREATE TABLE IF NOT EXISTS gtip_codes (
   created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
 );
 
+-- ============================================
+-- TRADE DATA TABLE (raw import/export statistics)
+-- ============================================
+CREATE TABLE IF NOT EXISTS trade_data (
+  id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+  hs_code TEXT NOT NULL,
+  country TEXT NOT NULL,
+  year INTEGER NOT NULL,
+  product_category TEXT,
+  import_value DECIMAL(15,2),
+  export_value DECIMAL(15,2),
+  import_volume DECIMAL(15,2),
+  growth_rate DECIMAL(8,2),
+  created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+-- ============================================
+-- TRADE DATA ROLLUPS (per HS chapter, country and year)
+-- ============================================
+-- Kept as sums and counts so every change to trade_data can be applied
+-- incrementally; trade_data_summary derives averages and growth from them.
+CREATE TABLE IF NOT EXISTS trade_data_rollups (
+  hs_chapter TEXT NOT NULL,
+  country TEXT NOT NULL,
+  year INTEGER NOT NULL,
+  row_count INTEGER NOT NULL DEFAULT 0,
+  import_value_sum NUMERIC NOT NULL DEFAULT 0,
+  export_value_sum NUMERIC NOT NULL DEFAULT 0,
+  import_volume_sum NUMERIC NOT NULL DEFAULT 0,
+  growth_rate_sum NUMERIC NOT NULL DEFAULT 0,
+  growth_rate_count INTEGER NOT NULL DEFAULT 0,
+  unit_value_sum NUMERIC NOT NULL DEFAULT 0,
+  unit_value_sq_sum NUMERIC NOT NULL DEFAULT 0,
+  unit_value_count INTEGER NOT NULL DEFAULT 0,
+  updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+  PRIMARY KEY (hs_chapter, country, year)
+);
+
+-- ============================================
+-- TREND DETECTIONS TABLE
+-- ============================================
+CREATE TABLE IF NOT EXISTS trend_detections (
+  id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+  company_id UUID NOT NULL REFERENCES companies(id) ON DELETE CASCADE,
+  trend_type TEXT NOT NULL,
+  timeframe TEXT,
+  market_scope TEXT,
+  trend_strength DECIMAL(6,2),
+  growth_rate DECIMAL(8,2),
+  confidence_score DECIMAL(6,2),
+  trend_description TEXT,
+  key_indicators TEXT[],
+  impact_assessment TEXT,
+  opportunities TEXT[],
+  recommendations TEXT[],
+  data_sources TEXT,
+  created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+-- ============================================
+-- PRODUCT MATCHES TABLE
+-- ============================================
+CREATE TABLE IF NOT EXISTS product_matches (
+  id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
+  company_id UUID NOT NULL REFERENCES companies(id) ON DELETE CASCADE,
+  product_id UUID NOT NULL REFERENCES products(id) ON DELETE CASCADE,
+  target_market TEXT NOT NULL,
+  match_score DECIMAL(6,3),
+  market_size TEXT,
+  competition_level TEXT,
+  entry_barriers TEXT,
+  growth_potential TEXT,
+  cultural_fit DECIMAL(6,3),
+  regulatory_complexity TEXT,
+  key_advantages TEXT[],
+  risk_factors TEXT[],
+  recommendations TEXT[],
+  data_sources TEXT,
+  created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+  updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+  UNIQUE (company_id, product_id, target_market)
+);
+
 -- ============================================
 -- INDEXES for Performance
 -- ============================================
@@ -195,6 +294,23 @@ CREATE INDEX IF NOT EXISTS idx_users_email ON users(email);
 CREATE INDEX IF NOT EXISTS idx_users_company_id ON users(company_id);
 CREATE INDEX IF NOT EXISTS idx_gtip_codes_code ON gtip_codes(gtip_code);
 
+-- Keyset pagination: list endpoints page by (created_at, id) newest first
+CREATE INDEX IF NOT EXISTS idx_products_company_created ON products(company_id, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_ai_predictions_company_created ON ai_predictions(company_id, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_ai_predictions_company_type_created ON ai_predictions(company_id, prediction_type, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_market_reports_company_created ON market_reports(company_id, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_campaigns_company_created ON campaigns(company_id, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_potential_buyers_company_created ON potential_buyers(company_id, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_target_markets_product_created ON target_markets(product_id, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_notifications_user_created ON notifications(user_id, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_notifications_user_unread_created ON notifications(user_id, created_at DESC, id DESC) WHERE NOT is_read;
+CREATE INDEX IF NOT EXISTS idx_trend_detections_company_created ON trend_detections(company_id, created_at DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_product_matches_company_score ON product_matches(company_id, match_score DESC);
+
+-- Trade data: raw lookups by code/country and rollups ranked within a year
+CREATE INDEX IF NOT EXISTS idx_trade_data_hs_country_year ON trade_data(hs_code, country, year DESC);
+CREATE INDEX IF NOT EXISTS idx_trade_data_rollups_year_imports ON trade_data_rollups(year DESC, import_value_sum DESC);
+
 -- ============================================
 -- ROW LEVEL SECURITY (RLS) - Enable
 -- ============================================
@@ -289,6 +405,154 @@ CREATE TRIGGER update_products_updated_at BEFORE UPDATE ON products
 CREATE TRIGGER update_users_updated_at BEFORE UPDATE ON users
   FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
 
+-- ============================================
+-- FUNCTIONS - Trade Data Rollups
+-- ============================================
+CREATE OR REPLACE FUNCTION trade_hs_chapter(code TEXT)
+RETURNS TEXT AS $$
+  SELECT LEFT(regexp_replace(code, '[^0-9]', '', 'g'), 2);
+$$ LANGUAGE sql IMMUTABLE;
+
+-- Unit value (import value per unit of volume) of one trade_data row
+CREATE OR REPLACE FUNCTION trade_unit_value(import_value NUMERIC, import_volume NUMERIC)
+RETURNS NUMERIC AS $$
+  SELECT CASE WHEN import_volume > 0 THEN import_value / import_volume END;
+$$ LANGUAGE sql IMMUTABLE;
+
+-- Add (direction = 1) or remove (direction = -1) one row's contribution
+CREATE OR REPLACE FUNCTION apply_trade_data_rollup(r trade_data, direction INTEGER)
+RETURNS VOID AS $$
+DECLARE
+  unit_value NUMERIC := trade_unit_value(r.import_value, r.import_volume);
+  remaining INTEGER;
+BEGIN
+  INSERT INTO trade_data_rollups AS t (
+    hs_chapter, country, year, row_count,
+    import_value_sum, export_value_sum, import_volume_sum,
+    growth_rate_sum, growth_rate_count,
+    unit_value_sum, unit_value_sq_sum, unit_value_count
+  ) VALUES (
+    trade_hs_chapter(r.hs_code), r.country, r.year, direction,
+    direction * COALESCE(r.import_value, 0),
+    direction * COALESCE(r.export_value, 0),
+    direction * COALESCE(r.import_volume, 0),
+    direction * COALESCE(r.growth_rate, 0),
+    direction * (r.growth_rate IS NOT NULL)::INTEGER,
+    direction * COALESCE(unit_value, 0),
+    direction * COALESCE(unit_value * unit_value, 0),
+    direction * (unit_value IS NOT NULL)::INTEGER
+  )
+  ON CONFLICT (hs_chapter, country, year) DO UPDATE SET
+    row_count = t.row_count + EXCLUDED.row_count,
+    import_value_sum = t.import_value_sum + EXCLUDED.import_value_sum,
+    export_value_sum = t.export_value_sum + EXCLUDED.export_value_sum,
+    import_volume_sum = t.import_volume_sum + EXCLUDED.import_volume_sum,
+    growth_rate_sum = t.growth_rate_sum + EXCLUDED.growth_rate_sum,
+    growth_rate_count = t.growth_rate_count + EXCLUDED.growth_rate_count,
+    unit_value_sum = t.unit_value_sum + EXCLUDED.unit_value_sum,
+    unit_value_sq_sum = t.unit_value_sq_sum + EXCLUDED.unit_value_sq_sum,
+    unit_value_count = t.unit_value_count + EXCLUDED.unit_value_count,
+    updated_at = NOW()
+  RETURNING t.row_count INTO remaining;
+
+  IF remaining <= 0 THEN
+    DELETE FROM trade_data_rollups
+    WHERE hs_chapter = trade_hs_chapter(r.hs_code)
+      AND country = r.country
+      AND year = r.year;
+  END IF;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION maintain_trade_data_rollups()
+RETURNS TRIGGER AS $$
+BEGIN
+  IF TG_OP IN ('UPDATE', 'DELETE') THEN
+    PERFORM apply_trade_data_rollup(OLD, -1);
+  END IF;
+  IF TG_OP IN ('INSERT', 'UPDATE') THEN
+    PERFORM apply_trade_data_rollup(NEW, 1);
+  END IF;
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Rebuild every rollup from trade_data in one pass: for backfills, and after
+-- bulk loads run with the maintenance trigger disabled.
+CREATE OR REPLACE FUNCTION refresh_trade_data_rollups()
+RETURNS VOID AS $$
+BEGIN
+  DELETE FROM trade_data_rollups;
+  INSERT INTO trade_data_rollups (
+    hs_chapter, country, year, row_count,
+    import_value_sum, export_value_sum, import_volume_sum,
+    growth_rate_sum, growth_rate_count,
+    unit_value_sum, unit_value_sq_sum, unit_value_count
+  )
+  SELECT
+    trade_hs_chapter(hs_code), country, year, COUNT(*),
+    COALESCE(SUM(import_value), 0),
+    COALESCE(SUM(export_value), 0),
+    COALESCE(SUM(import_volume), 0),
+    COALESCE(SUM(growth_rate), 0),
+    COUNT(growth_rate),
+    COALESCE(SUM(trade_unit_value(import_value, import_volume)), 0),
+    COALESCE(SUM(trade_unit_value(import_value, import_volume) * trade_unit_value(import_value, import_volume)), 0),
+    COUNT(trade_unit_value(import_value, import_volume))
+  FROM trade_data
+  GROUP BY 1, 2, 3;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER maintain_trade_data_rollups AFTER INSERT OR UPDATE OR DELETE ON trade_data
+  FOR EACH ROW EXECUTE FUNCTION maintain_trade_data_rollups();
+
+SELECT refresh_trade_data_rollups();
+
+-- ============================================
+-- FUNCTIONS - Notification Counters
+-- ============================================
+CREATE OR REPLACE FUNCTION apply_notification_counter(uid UUID, total_delta INTEGER, unread_delta INTEGER)
+RETURNS VOID AS $$
+  INSERT INTO notification_counters AS c (user_id, total_count, unread_count)
+  VALUES (uid, total_delta, unread_delta)
+  ON CONFLICT (user_id) DO UPDATE SET
+    total_count = c.total_count + EXCLUDED.total_count,
+    unread_count = c.unread_count + EXCLUDED.unread_count,
+    updated_at = NOW();
+$$ LANGUAGE sql;
+
+CREATE OR REPLACE FUNCTION maintain_notification_counters()
+RETURNS TRIGGER AS $$
+BEGIN
+  IF TG_OP IN ('UPDATE', 'DELETE') THEN
+    PERFORM apply_notification_counter(OLD.user_id, -1, -(NOT COALESCE(OLD.is_read, false))::INTEGER);
+  END IF;
+  IF TG_OP IN ('INSERT', 'UPDATE') THEN
+    PERFORM apply_notification_counter(NEW.user_id, 1, (NOT COALESCE(NEW.is_read, false))::INTEGER);
+  END IF;
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Recount every user's notifications, e.g. to backfill existing rows.
+CREATE OR REPLACE FUNCTION refresh_notification_counters()
+RETURNS VOID AS $$
+BEGIN
+  DELETE FROM notification_counters;
+  INSERT INTO notification_counters (user_id, total_count, unread_count)
+  SELECT user_id, COUNT(*), COUNT(*) FILTER (WHERE NOT COALESCE(is_read, false))
+  FROM notifications
+  GROUP BY user_id;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE TRIGGER maintain_notification_counters
+  AFTER INSERT OR DELETE OR UPDATE OF is_read, user_id ON notifications
+  FOR EACH ROW EXECUTE FUNCTION maintain_notification_counters();
+
+SELECT refresh_notification_counters();
+
 -- ============================================
 -- SAMPLE DATA (for testing)
 -- ============================================
@@ -320,6 +584,14 @@ VALUES
   ('6203.41', 'Yünden veya ince hayvan kılından pantolonlar', 'Trousers of wool or fine animal hair', 'Apparel', 12.0)
 ON CONFLICT (gtip_code) DO NOTHING;
 
+-- Insert test notifications for the demo user
+INSERT INTO notifications (id, user_id, type, category, title, message, data, is_read, created_at)
+VALUES
+  ('00000000-0000-0000-0000-0000000000a1', '00000000-0000-0000-0000-000000000001', 'info', 'market_alert', 'New Market Opportunity', 'Germany textile market shows 15% growth potential for your products', '{"country": "Germany", "industry": "Textiles", "growth": 15.2}', false, NOW() - INTERVAL '2 hours'),
+  ('00000000-0000-0000-0000-0000000000a2', '00000000-0000-0000-0000-000000000001', 'success', 'buyer_match', 'New Buyer Match', 'Fashion retailer in UK shows interest in your cotton products', '{"buyer": "Fashion Plus Ltd", "country": "UK", "product": "Cotton T-shirts"}', false, NOW() - INTERVAL '4 hours'),
+  ('00000000-0000-0000-0000-0000000000a3', '00000000-0000-0000-0000-000000000001', 'info', 'campaign_update', 'Campaign Performance Update', 'Your email campaign achieved 24% open rate, above industry average', '{"campaign": "Q4 Outreach", "open_rate": 24.5, "industry_avg": 18.2}', true, NOW() - INTERVAL '1 day')
+ON CONFLICT (id) DO NOTHING;
+
 -- ============================================
 -- VIEWS - Useful queries
 -- ============================================
@@ -338,6 +610,32 @@ LEFT JOIN ai_predictions ap ON c.id = ap.company_id
 LEFT JOIN target_markets tm ON c.id = tm.company_id
 GROUP BY c.id, c.name, c.country, c.industry;
 
+-- Compact per chapter/country/year statistics read by the AI analysis routes
+CREATE OR REPLACE VIEW trade_data_summary AS
+SELECT
+  r.hs_chapter,
+  r.country,
+  r.year,
+  r.row_count,
+  r.import_value_sum AS import_value,
+  r.export_value_sum AS export_value,
+  r.import_volume_sum AS import_volume,
+  r.export_value_sum - r.import_value_sum AS trade_balance,
+  ROUND(r.growth_rate_sum / NULLIF(r.growth_rate_count, 0), 2) AS avg_growth_rate,
+  ROUND(r.import_value_sum / NULLIF(r.import_volume_sum, 0), 4) AS avg_unit_value,
+  ROUND(SQRT(GREATEST(
+    r.unit_value_sq_sum / NULLIF(r.unit_value_count, 0)
+      - POWER(r.unit_value_sum / NULLIF(r.unit_value_count, 0), 2),
+    0
+  )), 4) AS unit_value_stddev,
+  ROUND(100 * (r.import_value_sum - p.import_value_sum) / NULLIF(p.import_value_sum, 0), 2) AS import_growth_pct,
+  ROUND(100 * (r.export_value_sum - p.export_value_sum) / NULLIF(p.export_value_sum, 0), 2) AS export_growth_pct
+FROM trade_data_rollups r
+LEFT JOIN trade_data_rollups p
+  ON p.hs_chapter = r.hs_chapter
+  AND p.country = r.country
+  AND p.year = r.year - 1;
+
 -- Success message
 SELECT 'Database schema created successfully! 🎉' as message;
 
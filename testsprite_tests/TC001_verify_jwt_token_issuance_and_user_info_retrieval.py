@@ -1,15 +1,15 @@
 import requests
 
-BASE_URL = "http://localhost:3000"
-TIMEOUT = 30
+from api_client import BASE_URL, TIMEOUT, get_session
 
 
 def test_verify_jwt_token_issuance_and_user_info_retrieval():
+    session = get_session()
     token_url = f"{BASE_URL}/api/auth/token"
 
     # Test unauthenticated request: expect 401 Unauthorized as per PRD.
     try:
-        response_unauth = requests.get(token_url, timeout=TIMEOUT)
+        response_unauth = session.get(token_url, timeout=TIMEOUT)
     except requests.RequestException as e:
         assert False, f"Request failed for token fetch: {e}"
     assert response_unauth.status_code == 401, f"Expected 401 Unauthorized for unauthenticated token request, got {response_unauth.status_code}"
@@ -20,7 +20,7 @@ def test_verify_jwt_token_issuance_and_user_info_retrieval():
     if valid_token:
         headers = {"Authorization": f"Bearer {valid_token}"}
         try:
-            response_auth = requests.get(token_url, headers=headers, timeout=TIMEOUT)
+            response_auth = session.get(token_url, headers=headers, timeout=TIMEOUT)
         except requests.RequestException as e:
             assert False, f"Request failed for authenticated token fetch: {e}"
         assert response_auth.status_code == 200, f"Expected 200 OK for authenticated request, got {response_auth.status_code}"
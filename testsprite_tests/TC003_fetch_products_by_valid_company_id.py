@@ -1,66 +1,65 @@
+import base64
+import json
+
 import requests
 
-BASE_URL = "http://localhost:3000"
-TIMEOUT = 30
+from api_client import BASE_URL, TIMEOUT, check_keyset_pages, get_company_id, get_jwt_token, get_session, iter_pages
 
-def test_fetch_products_by_valid_company_id():
-    # Step 1: Authenticate to get JWT token
-    auth_url = f"{BASE_URL}/api/auth/token"
-    headers = {"Accept": "application/json"}
-    try:
-        auth_resp = requests.get(auth_url, headers=headers, timeout=TIMEOUT)
-        assert auth_resp.status_code == 200, f"Authentication failed with status code {auth_resp.status_code}"
-        ct = auth_resp.headers.get('Content-Type', '')
-        assert 'application/json' in ct, "Authentication response is not JSON"
-        auth_data = auth_resp.json()
-        jwt_token = auth_data.get("jwt")
-        user = auth_data.get("user")
-        assert jwt_token and user, "Authentication response missing token or user info"
-    except requests.RequestException as e:
-        assert False, f"Authentication request failed: {e}"
-    except ValueError as e:
-        assert False, f"Authentication response is not valid JSON: {e}"
+# Page size of list requests that send no limit
+DEFAULT_PAGE_SIZE = 100
 
-    # Prepare headers with Authorization
-    headers["Authorization"] = f"Bearer {jwt_token}"
-    headers["Accept"] = "application/json"
 
-    # Use company_id from authenticated user info if available, else fail test
-    # The PRD does not explicitly mention the company id in auth user, so we must try to get a valid company_id
-    # For this test, try to fetch companies and use one of their IDs
+def test_fetch_products_by_valid_company_id():
+    session = get_session()
+    # Step 1: JWT token and company_id are fetched once per run and cached by api_client
     try:
-        companies_resp = requests.get(f"{BASE_URL}/api/companies", headers=headers, timeout=TIMEOUT)
-        assert companies_resp.status_code == 200, f"Fetching companies failed with status code {companies_resp.status_code}"
-        ct = companies_resp.headers.get('Content-Type', '')
-        assert 'application/json' in ct, "Companies response is not JSON"
-        companies_data = companies_resp.json()
-        company_id = None
-        if isinstance(companies_data, list) and len(companies_data) > 0:
-            if isinstance(companies_data[0], dict) and "id" in companies_data[0]:
-                company_id = companies_data[0]["id"]
-        elif isinstance(companies_data, dict):
-            if "companies" in companies_data and isinstance(companies_data["companies"], list) and len(companies_data["companies"]) > 0:
-                company_id = companies_data["companies"][0].get("id")
-            elif "id" in companies_data:
-                company_id = companies_data["id"]
-        assert company_id, "No company_id found from /api/companies to test products retrieval"
-    except requests.RequestException as e:
-        assert False, f"Request to fetch companies failed: {e}"
-    except ValueError as e:
-        assert False, f"Companies response is not valid JSON: {e}"
+        jwt_token = get_jwt_token()
+        company_id = get_company_id()
+    except RuntimeError as e:
+        assert False, str(e)
+    assert company_id, "No company_id found from /api/companies to test products retrieval"
+
+    headers = {
+        "Accept": "application/json",
+        "Authorization": f"Bearer {jwt_token}",
+    }
 
     # Step 2: Request products by valid company_id
     products_url = f"{BASE_URL}/api/products"
     params = {"company_id": company_id}
 
     try:
-        products_resp = requests.get(products_url, headers=headers, params=params, timeout=TIMEOUT)
+        products_resp = session.get(products_url, headers=headers, params=params, timeout=TIMEOUT)
         assert products_resp.status_code == 200, f"Products fetch failed with status code {products_resp.status_code}"
         ct = products_resp.headers.get('Content-Type', '')
         assert 'application/json' in ct, "Products response is not JSON"
         products_data = products_resp.json()
         assert "products" in products_data, "Response JSON does not contain 'products' key"
         assert isinstance(products_data["products"], list), "'products' key is not a list"
+
+        # Step 3: Without limit the first DEFAULT_PAGE_SIZE rows come back; walking
+        # the default pages and small keyset pages must see the same rows
+        assert len(products_data["products"]) <= DEFAULT_PAGE_SIZE, f"Default page has {len(products_data['products'])} products"
+        assert products_data.get("has_more") == bool(products_data.get("next_cursor")), "has_more and next_cursor disagree"
+        default_total = check_keyset_pages(iter_pages("/api/products", "products", params, headers=headers), DEFAULT_PAGE_SIZE)
+        page_limit = 2
+        total = check_keyset_pages(iter_pages("/api/products", "products", params, limit=page_limit, headers=headers), page_limit)
+        assert total == default_total, f"Walk in pages of {page_limit} saw {total} products, default pages saw {default_total}"
+
+        # Malformed cursors are rejected before they reach the database
+        for cursor_value in (["not-a-date", "00000000-0000-0000-0000-000000000001"], ["2024-01-01T00:00:00Z", "1; DROP"]):
+            cursor = base64.urlsafe_b64encode(json.dumps(cursor_value).encode()).decode().rstrip("=")
+            bad_cursor = session.get(products_url, headers=headers, params=dict(params, cursor=cursor), timeout=TIMEOUT)
+            assert bad_cursor.status_code == 400, f"Expected 400 for cursor {cursor_value}, got {bad_cursor.status_code}"
+
+        # Step 4: Field projection returns only the requested columns plus the cursor keys
+        projected = session.get(products_url, headers=headers, params=dict(params, fields="product_name", limit=page_limit), timeout=TIMEOUT)
+        assert projected.status_code == 200, f"Projected products fetch failed with status code {projected.status_code}"
+        for product in projected.json()["products"]:
+            assert set(product) == {"id", "created_at", "product_name"}, f"Unexpected projected columns {sorted(product)}"
+
+        bad_fields = session.get(products_url, headers=headers, params=dict(params, fields="password_hash"), timeout=TIMEOUT)
+        assert bad_fields.status_code == 400, f"Expected 400 for an unknown projected field, got {bad_fields.status_code}"
     except requests.RequestException as e:
         assert False, f"Request to fetch products failed: {e}"
     except ValueError as e:
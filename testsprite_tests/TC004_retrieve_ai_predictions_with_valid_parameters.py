@@ -1,20 +1,14 @@
 import requests
 
-BASE_URL = "http://localhost:3000"
-TIMEOUT = 30
+from api_client import BASE_URL, TIMEOUT, check_keyset_pages, get_auth, get_session, iter_pages
+
 
 def test_retrieve_ai_predictions_with_valid_parameters():
-    # Authenticate to get JWT token
-    auth_url = f"{BASE_URL}/api/auth/token"
+    session = get_session()
+    # Authenticate to get JWT token (cached across the run by api_client)
     try:
-        auth_response = requests.get(auth_url, timeout=TIMEOUT)
-        assert auth_response.status_code == 200, f"Auth failed with status {auth_response.status_code}"
-        auth_data = auth_response.json()
-        jwt_token = auth_data.get("jwt")
-        user = auth_data.get("user")
-        assert jwt_token is not None, "JWT token missing in auth response"
-        assert user is not None and "id" in user, "User info missing or incomplete in auth response"
-    except (requests.RequestException, AssertionError) as e:
+        jwt_token, user = get_auth()
+    except RuntimeError as e:
         raise Exception(f"Authentication failed: {e}")
 
     headers = {
@@ -38,7 +32,7 @@ def test_retrieve_ai_predictions_with_valid_parameters():
                 "period": period
             }
             try:
-                response = requests.get(f"{BASE_URL}/api/ai-predictions", headers=headers, params=params, timeout=TIMEOUT)
+                response = session.get(f"{BASE_URL}/api/ai-predictions", headers=headers, params=params, timeout=TIMEOUT)
                 assert response.status_code == 200, f"Expected 200, got {response.status_code} for type {prediction_type} and period {period}"
                 data = response.json()
                 # Validate response content structure and presence of relevant keys (assuming response contains prediction data)
@@ -50,4 +44,10 @@ def test_retrieve_ai_predictions_with_valid_parameters():
             except (requests.RequestException, AssertionError) as e:
                 raise Exception(f"Failed for prediction_type={prediction_type}, period={period} with error: {e}")
 
+    # Walking every prediction for the company in small pages must not skip or repeat rows
+    try:
+        check_keyset_pages(iter_pages("/api/ai-predictions", "predictions", {"company_id": company_id}, limit=2, headers=headers), 2)
+    except (requests.RequestException, AssertionError) as e:
+        raise Exception(f"Paginating AI predictions failed: {e}")
+
 test_retrieve_ai_predictions_with_valid_parameters()
\ No newline at end of file
@@ -1,26 +1,15 @@
-import requests
+from api_client import BASE_URL, TIMEOUT, get_company_id, get_jwt_token, get_session
 
-BASE_URL = "http://localhost:3000"
-TIMEOUT = 30
 
 def test_create_ai_prediction_with_required_fields():
-    # Step 1: Authenticate and get JWT token
-    auth_url = f"{BASE_URL}/api/auth/token"
+    session = get_session()
+    # Step 1: JWT token and company_id are fetched once per run and cached by api_client
     try:
-        auth_resp = requests.get(auth_url, timeout=TIMEOUT)
-        assert auth_resp.status_code == 200, f"Authentication failed with status {auth_resp.status_code}"
-        if not auth_resp.content:
-            raise AssertionError("Authentication response is empty")
-        try:
-            auth_data = auth_resp.json()
-        except Exception as e:
-            raise AssertionError(f"Authentication response is not valid JSON: {e}")
-        token = auth_data.get("jwt")
-        user = auth_data.get("user")
-        assert token and isinstance(token, str), "JWT token is missing or invalid"
-        assert user and "id" in user, "User info is missing or invalid"
-    except Exception as e:
+        token = get_jwt_token()
+        company_id = get_company_id()
+    except RuntimeError as e:
         raise AssertionError(f"Authentication step failed: {e}")
+    assert company_id and isinstance(company_id, str), "Valid company_id not found in companies response"
 
     # Prepare headers with Authorization
     headers = {
@@ -28,32 +17,6 @@ def test_create_ai_prediction_with_required_fields():
         "Content-Type": "application/json"
     }
 
-    # We need a valid company_id. We can get it from user info or fetch companies if available.
-    # Since user info does not have company_id explicitly, try to get company list first:
-    company_id = None
-    try:
-        companies_resp = requests.get(f"{BASE_URL}/api/companies", headers=headers, timeout=TIMEOUT)
-        assert companies_resp.status_code == 200, f"Failed to fetch companies with status {companies_resp.status_code}"
-        if not companies_resp.content:
-            raise AssertionError("Companies response is empty")
-        try:
-            companies_data = companies_resp.json()
-        except Exception as e:
-            raise AssertionError(f"Companies response is not valid JSON: {e}")
-
-        # Assuming companies_data is a list or dict with company info - pick first company id if possible
-        if isinstance(companies_data, list) and companies_data:
-            company_id = companies_data[0].get("id")
-        elif isinstance(companies_data, dict):
-            # Try common keys
-            if "companies" in companies_data and isinstance(companies_data["companies"], list) and companies_data["companies"]:
-                company_id = companies_data["companies"][0].get("id")
-            elif "id" in companies_data:
-                company_id = companies_data.get("id")
-        assert company_id and isinstance(company_id, str), "Valid company_id not found in companies response"
-    except Exception as e:
-        raise AssertionError(f"Fetching company_id failed: {e}")
-
     # Prepare AI prediction payload with required fields plus some optional fields
     payload = {
         "company_id": company_id,
@@ -72,7 +35,7 @@ def test_create_ai_prediction_with_required_fields():
 
     # POST the AI prediction and validate success
     try:
-        response = requests.post(ai_prediction_url, json=payload, headers=headers, timeout=TIMEOUT)
+        response = session.post(ai_prediction_url, json=payload, headers=headers, timeout=TIMEOUT)
         assert response.status_code == 200, f"AI prediction creation failed with status {response.status_code}"
         if response.content:
             try:
@@ -87,6 +50,11 @@ def test_create_ai_prediction_with_required_fields():
             assert resp_json["company_id"] == company_id, "Returned company_id does not match"
         if "prediction_type" in resp_json:
             assert resp_json["prediction_type"] == "market_forecast", "Returned prediction_type does not match"
+
+        # Names inherited from Object.prototype are not prediction types
+        for bad_type in ("constructor", "toString"):
+            response = session.post(ai_prediction_url, json=dict(payload, prediction_type=bad_type), headers=headers, timeout=TIMEOUT)
+            assert response.status_code == 400, f"Expected 400 for prediction_type {bad_type!r}, got {response.status_code}"
     except Exception as e:
         raise AssertionError(f"Failed to create AI prediction: {e}")
 
@@ -1,32 +1,11 @@
 import requests
 
-BASE_URL = "http://localhost:3000"
-TIMEOUT = 30
+from api_client import BASE_URL, TIMEOUT, check_keyset_pages, get_auth, get_session, iter_pages
 
-def get_jwt_token():
-    url = f"{BASE_URL}/api/auth/token"
-    try:
-        response = requests.get(url, timeout=TIMEOUT)
-        if response.status_code == 200:
-            try:
-                data = response.json()
-            except ValueError:
-                assert False, "Response content is not valid JSON"
-
-            token = data.get("jwt")
-            user = data.get("user")
-            assert isinstance(token, str) and token, "JWT token is missing or empty"
-            assert isinstance(user, dict) and "id" in user, "User info is missing or invalid"
-            return token, user
-        elif response.status_code == 401:
-            raise PermissionError("Unauthorized: Invalid credentials or no credentials provided")
-        else:
-            response.raise_for_status()
-    except (requests.RequestException, AssertionError, PermissionError) as e:
-        raise RuntimeError(f"Failed to obtain JWT token: {e}")
 
 def test_get_market_reports_for_company():
-    token, user = get_jwt_token()
+    session = get_session()
+    token, user = get_auth()
     company_id = user.get("id")
     assert company_id, "Company ID (user id) is required for the test"
 
@@ -38,7 +17,7 @@ def test_get_market_reports_for_company():
     url = f"{BASE_URL}/api/market-reports"
 
     try:
-        response = requests.get(url, headers=headers, params=params, timeout=TIMEOUT)
+        response = session.get(url, headers=headers, params=params, timeout=TIMEOUT)
         assert response.status_code == 200, f"Expected status code 200 but got {response.status_code}"
         try:
             data = response.json()
@@ -50,6 +29,8 @@ def test_get_market_reports_for_company():
         assert any(
             key in keys for key in ["trade_statistics", "market_insights", "reports", "analytics"]
         ) or len(keys) > 0, "Response does not contain expected market report data"
+
+        check_keyset_pages(iter_pages("/api/market-reports", "reports", params, limit=2, headers=headers), 2)
     except requests.Timeout:
         assert False, "Request timed out"
     except requests.RequestException as e:
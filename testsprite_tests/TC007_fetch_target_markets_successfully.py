@@ -1,25 +1,10 @@
 import requests
 
-BASE_URL = "http://localhost:3000"
-TIMEOUT = 30
+from api_client import BASE_URL, TIMEOUT, get_jwt_token, get_session
 
-def get_jwt_token():
-    url = f"{BASE_URL}/api/auth/token"
-    try:
-        response = requests.get(url, timeout=TIMEOUT)
-        if response.status_code == 200:
-            data = response.json()
-            jwt = data.get("jwt")
-            assert jwt is not None and isinstance(jwt, str), "JWT token missing or invalid"
-            return jwt
-        elif response.status_code == 401:
-            raise Exception("Unauthorized: Invalid or missing authentication")
-        else:
-            response.raise_for_status()
-    except requests.RequestException as e:
-        raise Exception(f"Failed to get JWT token: {e}")
 
 def test_fetch_target_markets_successfully():
+    session = get_session()
     token = get_jwt_token()
     url = f"{BASE_URL}/api/target-markets"
     headers = {
@@ -27,7 +12,7 @@ def test_fetch_target_markets_successfully():
         "Accept": "application/json"
     }
     try:
-        response = requests.get(url, headers=headers, timeout=TIMEOUT)
+        response = session.get(url, headers=headers, timeout=TIMEOUT)
         assert response.status_code == 200, f"Expected 200 OK but got {response.status_code}"
         data = response.json()
         # The PRD does not specify exact schema for target markets, 
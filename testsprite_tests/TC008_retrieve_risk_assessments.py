@@ -1,7 +1,6 @@
 import requests
 
-BASE_URL = "http://localhost:3000"
-TIMEOUT = 30
+from api_client import BASE_URL, TIMEOUT, get_session
 
 def test_retrieve_risk_assessments():
     url = f"{BASE_URL}/api/risk-assessment"
@@ -9,7 +8,7 @@ def test_retrieve_risk_assessments():
         "Accept": "application/json",
     }
     try:
-        response = requests.get(url, headers=headers, timeout=TIMEOUT)
+        response = get_session().get(url, headers=headers, timeout=TIMEOUT)
         # Assert status code 200 OK
         assert response.status_code == 200, f"Expected status code 200, got {response.status_code}"
         data = response.json()
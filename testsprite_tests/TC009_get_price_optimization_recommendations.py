@@ -1,7 +1,6 @@
 import requests
 
-BASE_URL = "http://localhost:3000"
-TIMEOUT = 30
+from api_client import BASE_URL, TIMEOUT, get_session
 
 def get_jwt_token():
     # Return a placeholder JWT token for testing purposes
@@ -15,7 +14,7 @@ def test_get_price_optimization_recommendations():
     }
     url = f"{BASE_URL}/api/price-optimization"
     try:
-        response = requests.get(url, headers=headers, timeout=TIMEOUT)
+        response = get_session().get(url, headers=headers, timeout=TIMEOUT)
     except requests.RequestException as e:
         assert False, f"Request to /api/price-optimization failed: {e}"
     assert response.status_code == 200, f"Expected status code 200 but got {response.status_code}"
@@ -1,7 +1,6 @@
 import requests
 
-BASE_URL = "http://localhost:3000"
-TIMEOUT = 30
+from api_client import BASE_URL, TIMEOUT, get_session
 
 def test_fetch_market_trends_data():
     url = f"{BASE_URL}/api/trend-detection"
@@ -9,7 +8,7 @@ def test_fetch_market_trends_data():
         "Accept": "application/json"
     }
     try:
-        response = requests.get(url, headers=headers, timeout=TIMEOUT)
+        response = get_session().get(url, headers=headers, timeout=TIMEOUT)
         # Check HTTP status code 200
         assert response.status_code == 200, f"Expected status 200, got {response.status_code}"
         # Validate JSON response content
@@ -0,0 +1,74 @@
+import time
+import uuid
+
+import requests
+
+from api_client import BASE_URL, TIMEOUT, get_company_id, get_jwt_token, get_session, thread_pool
+from stub_ai import ensure_stub, total_calls
+
+# Requires apps/web to be started with NEXT_PUBLIC_CREATE_BASE_URL pointing at the
+# AI stub (http://localhost:8787 by default) so generations are counted locally.
+
+# Asserts exact deltas of the stub's global call counter.
+SERIAL = True
+
+
+def test_ai_generation_cache_hit_and_miss():
+    ensure_stub()
+    session = get_session()
+    headers = {
+        "Authorization": f"Bearer {get_jwt_token()}",
+        "Content-Type": "application/json"
+    }
+    url = f"{BASE_URL}/api/ai-predictions"
+
+    def post(payload):
+        started = time.perf_counter()
+        response = session.post(url, json=payload, headers=headers, timeout=TIMEOUT)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        assert response.status_code == 200, f"AI prediction creation failed with status {response.status_code}"
+        return response.headers.get("X-AI-Cache"), elapsed_ms
+
+    # A unique period guarantees the first request cannot be served from cache.
+    payload = {
+        "company_id": get_company_id(),
+        "prediction_type": "market_forecast",
+        "period": f"cache-test-{uuid.uuid4()}",
+        "target_market": "North America",
+        "product_category": "Electronics",
+        "hs_code": "854239",
+        "market_data": {"previous_prices": [100, 105, 110], "market_conditions": "stable"}
+    }
+
+    try:
+        calls_before = total_calls()
+        cache_state, miss_ms = post(payload)
+        assert cache_state == "miss", f"Expected first request to miss the cache, got {cache_state}"
+        assert total_calls() == calls_before + 1, "Expected exactly one AI generation for the first request"
+
+        # Identifiers differing only in case and spacing, and market_data with its
+        # keys reordered, normalize to the same cache key.
+        repeat = dict(payload, target_market="  north america ", market_data={"market_conditions": "stable", "previous_prices": [100, 105, 110]})
+        cache_state, hit_ms = post(repeat)
+        assert cache_state == "hit", f"Expected repeated request to hit the cache, got {cache_state}"
+        assert total_calls() == calls_before + 1, "Cache hit must not call the AI integration"
+        assert hit_ms < miss_ms, f"Cache hit ({hit_ms:.0f} ms) should be faster than the miss ({miss_ms:.0f} ms)"
+
+        # market_data goes to the prompt as sent, so its text is not case-folded
+        recased = dict(payload, market_data={"previous_prices": [100, 105, 110], "market_conditions": "Stable"})
+        cache_state, _ = post(recased)
+        assert cache_state == "miss", f"market_data differing in case should miss the cache, got {cache_state}"
+        assert total_calls() == calls_before + 2, "A market_data change must start a new generation"
+
+        # Concurrent identical requests share one in-flight generation.
+        concurrent_payload = dict(payload, period=f"cache-test-{uuid.uuid4()}")
+        calls_before = total_calls()
+        with thread_pool(5) as executor:
+            states = [state for state, _ in executor.map(post, [concurrent_payload] * 5)]
+        assert total_calls() == calls_before + 1, f"Expected one shared generation, stub saw {total_calls() - calls_before}"
+        assert states.count("miss") == 1, f"Expected exactly one miss among concurrent requests, got {states}"
+        assert all(s in ("miss", "shared", "hit") for s in states), f"Unexpected cache states {states}"
+    except requests.RequestException as e:
+        assert False, f"Request to /api/ai-predictions failed: {e}"
+
+test_ai_generation_cache_hit_and_miss()
@@ -0,0 +1,69 @@
+import uuid
+
+import requests
+
+from api_client import TIMEOUT, auth_headers, get_company_id, get_session, url
+from products_bulk import export_products, import_products
+
+
+def test_bulk_product_import_and_export():
+    session = get_session()
+    company_id = get_company_id()
+    run_id = uuid.uuid4().hex[:8]
+
+    def catalogue(fmt):
+        rows = [
+            {"product_name": f"Bulk {run_id} {fmt} #{i}", "hs_code": "847130", "unit_price": 10 + i, "certifications": ["CE"]}
+            for i in range(25)
+        ]
+        # A quoted description spanning two lines pushes later CSV records down a line
+        rows[2]["description"] = "First line\nsecond line"
+        # Rows 26 and 27 are invalid and must be reported without aborting the import
+        rows.append({"hs_code": "847130"})
+        rows.append({"product_name": f"Bulk {run_id} {fmt} bad price", "unit_price": "abc"})
+        rows.append({"product_name": f"Bulk {run_id} {fmt} last", "min_order_quantity": 5})
+        return rows
+
+    try:
+        for fmt in ("ndjson", "csv"):
+            response = import_products(catalogue(fmt), company_id, fmt=fmt)
+            assert response.status_code == 200, f"Bulk {fmt} import failed with status {response.status_code}"
+            summary = response.json()
+            assert summary["inserted"] == 26, f"Expected 26 inserted {fmt} rows, got {summary['inserted']}"
+            assert summary["failed"] == 2, f"Expected 2 failed {fmt} rows, got {summary['failed']}"
+            # CSV line numbers are physical lines: the header plus the extra
+            # line of the multi-line description
+            offset = 2 if fmt == "csv" else 0
+            failed_lines = [error["line"] for error in summary["errors"]]
+            assert failed_lines == [26 + offset, 27 + offset], f"Unexpected failed {fmt} lines {failed_lines}"
+            assert "product_name" in summary["errors"][0]["error"], "Missing product_name should be reported by name"
+
+        unsupported = session.post(
+            url("/api/products/bulk"),
+            params={"company_id": company_id},
+            data="{}",
+            headers=auth_headers({"Content-Type": "application/json"}),
+            timeout=TIMEOUT,
+        )
+        assert unsupported.status_code == 415, f"Expected 415 for a JSON body, got {unsupported.status_code}"
+
+        bad_company = import_products(catalogue("ndjson")[:1], "not-a-uuid")
+        assert bad_company.status_code == 400, f"Expected 400 for a malformed company_id, got {bad_company.status_code}"
+
+        exported = [row for row in export_products(company_id) if row["product_name"].startswith(f"Bulk {run_id}")]
+        assert len(exported) == 52, f"Expected 52 imported rows in the export, found {len(exported)}"
+        assert len({row["id"] for row in exported}) == 52, "Export returned duplicate rows"
+        assert all(row["certifications"] in (None, ["CE"]) for row in exported), "Certifications did not round-trip"
+
+        # The company id names the download, so anything but a UUID is refused
+        bad_export = session.get(
+            url("/api/products/export"),
+            params={"company_id": 'x"\r\nSet-Cookie: a=b'},
+            headers=auth_headers(),
+            timeout=TIMEOUT,
+        )
+        assert bad_export.status_code == 400, f"Expected 400 for a malformed company_id, got {bad_export.status_code}"
+    except requests.RequestException as e:
+        assert False, f"Bulk product request failed: {e}"
+
+test_bulk_product_import_and_export()
@@ -0,0 +1,89 @@
+import json
+import time
+import uuid
+
+import requests
+
+from api_client import BASE_URL, TIMEOUT, get_company_id, get_jwt_token, get_session
+from stub_ai import configure, ensure_stub, total_calls
+
+# Requires apps/web to be started with NEXT_PUBLIC_CREATE_BASE_URL pointing at the
+# AI stub (http://localhost:8787 by default) so every generation has a fixed cost.
+
+# Sets the shared AI stub's delay and asserts exact deltas of its call counter.
+SERIAL = True
+PREDICTION_TYPES = ["market_forecast", "price_trend", "demand_prediction"]
+PERIODS = ["1_month", "3_months", "6_months", "1_year"]
+STUB_DELAY = 0.5
+
+
+def test_batch_ai_predictions_faster_than_sequential():
+    ensure_stub()
+    configure(STUB_DELAY)
+    session = get_session()
+    headers = {
+        "Authorization": f"Bearer {get_jwt_token()}",
+        "Content-Type": "application/json"
+    }
+    company_id = get_company_id()
+
+    def shared_fields():
+        # A fresh run id in market_data keeps both runs out of the generation cache
+        return {
+            "target_market": "Germany",
+            "product_category": "Textiles",
+            "hs_code": "610910",
+            "market_data": {"run": str(uuid.uuid4())},
+        }
+
+    try:
+        # Sequential: one POST per type x period, as TC004/TC005 and the dashboard do today
+        fields = shared_fields()
+        started = time.perf_counter()
+        for prediction_type in PREDICTION_TYPES:
+            for period in PERIODS:
+                payload = dict(fields, company_id=company_id, prediction_type=prediction_type, period=period)
+                response = session.post(f"{BASE_URL}/api/ai-predictions", json=payload, headers=headers, timeout=TIMEOUT)
+                assert response.status_code == 200, f"Sequential prediction failed with status {response.status_code}"
+        sequential_ms = (time.perf_counter() - started) * 1000
+
+        # Batch: the same matrix in one request, results streamed back as NDJSON
+        calls_before = total_calls()
+        payload = dict(shared_fields(), company_id=company_id, prediction_types=PREDICTION_TYPES, periods=PERIODS)
+        started = time.perf_counter()
+        response = session.post(f"{BASE_URL}/api/ai-predictions/batch", json=payload, headers=headers, timeout=TIMEOUT, stream=True)
+        assert response.status_code == 200, f"Batch prediction failed with status {response.status_code}"
+        assert "ndjson" in response.headers.get("Content-Type", ""), "Batch response is not NDJSON"
+
+        first_result_ms = None
+        events = []
+        for line in response.iter_lines():
+            if not line:
+                continue
+            event = json.loads(line)
+            if first_result_ms is None and event["type"] == "result":
+                first_result_ms = (time.perf_counter() - started) * 1000
+            events.append(event)
+        batch_ms = (time.perf_counter() - started) * 1000
+
+        expected = len(PREDICTION_TYPES) * len(PERIODS)
+        results = [event for event in events if event["type"] == "result"]
+        assert len(results) == expected, f"Expected {expected} streamed results, got {len(results)}"
+        assert sorted(event["index"] for event in results) == list(range(expected)), "Batch results do not cover every spec"
+        assert total_calls() - calls_before == expected, "Each batch spec should be generated exactly once"
+
+        summary = events[-1]
+        assert summary["type"] == "summary", "Batch stream must end with a summary line"
+        assert summary["saved"] == expected, f"Expected {expected} saved predictions, got {summary['saved']}"
+        assert all(row.get("id") for row in summary["predictions"]), "Saved predictions should carry their ids"
+
+        # The first result arrives after about one generation, not after the whole batch
+        assert first_result_ms < batch_ms, "Results should stream before the batch completes"
+        assert batch_ms < sequential_ms / 2, f"Batch took {batch_ms:.0f} ms, sequential took {sequential_ms:.0f} ms"
+        print(f"sequential {sequential_ms:.0f} ms, batch {batch_ms:.0f} ms (first result {first_result_ms:.0f} ms)")
+    except requests.RequestException as e:
+        assert False, f"Request to /api/ai-predictions failed: {e}"
+    finally:
+        configure(1.0)
+
+test_batch_ai_predictions_faster_than_sequential()
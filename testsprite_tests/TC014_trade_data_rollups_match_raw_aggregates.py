@@ -0,0 +1,126 @@
+import random
+import uuid
+
+import local_db
+
+# Runs against the local database (python local_db.py start). Raw trade_data rows
+# are inserted, updated and deleted under a unique country prefix, then the
+# trigger-maintained rollups and the trade_data_summary view are compared with
+# aggregates computed directly from trade_data.
+
+RAW_AGGREGATES = """
+SELECT trade_hs_chapter(hs_code) AS hs_chapter, country, year,
+       COUNT(*) AS row_count,
+       COALESCE(SUM(import_value), 0) AS import_value_sum,
+       COALESCE(SUM(export_value), 0) AS export_value_sum,
+       COALESCE(SUM(import_volume), 0) AS import_volume_sum,
+       COALESCE(SUM(growth_rate), 0) AS growth_rate_sum,
+       COUNT(growth_rate) AS growth_rate_count,
+       COALESCE(SUM(trade_unit_value(import_value, import_volume)), 0) AS unit_value_sum,
+       COUNT(trade_unit_value(import_value, import_volume)) AS unit_value_count,
+       ROUND(AVG(growth_rate), 2) AS avg_growth_rate,
+       ROUND(SUM(import_value) / NULLIF(SUM(import_volume), 0), 4) AS avg_unit_value,
+       STDDEV_POP(trade_unit_value(import_value, import_volume)) AS unit_value_stddev
+FROM trade_data
+WHERE country LIKE '{prefix}%'
+GROUP BY 1, 2, 3
+"""
+
+ROLLUP_MISMATCHES = """
+WITH raw AS ({raw}),
+rollups AS (SELECT * FROM trade_data_rollups WHERE country LIKE '{prefix}%')
+SELECT COALESCE(raw.hs_chapter, rollups.hs_chapter), COALESCE(raw.country, rollups.country), COALESCE(raw.year, rollups.year)
+FROM raw
+FULL OUTER JOIN rollups USING (hs_chapter, country, year)
+WHERE raw.row_count IS DISTINCT FROM rollups.row_count
+   OR raw.import_value_sum IS DISTINCT FROM rollups.import_value_sum
+   OR raw.export_value_sum IS DISTINCT FROM rollups.export_value_sum
+   OR raw.import_volume_sum IS DISTINCT FROM rollups.import_volume_sum
+   OR raw.growth_rate_sum IS DISTINCT FROM rollups.growth_rate_sum
+   OR raw.growth_rate_count IS DISTINCT FROM rollups.growth_rate_count
+   OR raw.unit_value_sum IS DISTINCT FROM rollups.unit_value_sum
+   OR raw.unit_value_count IS DISTINCT FROM rollups.unit_value_count
+"""
+
+SUMMARY_MISMATCHES = """
+WITH raw AS ({raw}),
+summary AS (SELECT * FROM trade_data_summary WHERE country LIKE '{prefix}%')
+SELECT summary.hs_chapter, summary.country, summary.year
+FROM raw
+JOIN summary USING (hs_chapter, country, year)
+LEFT JOIN raw previous
+  ON previous.hs_chapter = raw.hs_chapter AND previous.country = raw.country AND previous.year = raw.year - 1
+WHERE summary.avg_growth_rate IS DISTINCT FROM raw.avg_growth_rate
+   OR summary.avg_unit_value IS DISTINCT FROM raw.avg_unit_value
+   OR ABS(COALESCE(summary.unit_value_stddev, 0) - COALESCE(ROUND(raw.unit_value_stddev, 4), 0)) > 0.0001
+   OR summary.import_growth_pct IS DISTINCT FROM
+      ROUND(100 * (raw.import_value_sum - previous.import_value_sum) / NULLIF(previous.import_value_sum, 0), 2)
+"""
+
+
+def sql_value(value):
+    return "NULL" if value is None else repr(value)
+
+
+def random_rows(prefix, count):
+    rng = random.Random(prefix)
+    rows = []
+    for _ in range(count):
+        rows.append((
+            rng.choice(["8471.30", "847150", "6109.10", "610990", "0805.10"]),
+            f"{prefix}{rng.choice(['DE', 'US', 'FR'])}",
+            rng.choice([2022, 2023, 2024]),
+            round(rng.uniform(1, 500), 2),
+            round(rng.uniform(1, 500), 2),
+            rng.choice([None, round(rng.uniform(1, 100), 2)]),
+            rng.choice([None, round(rng.uniform(-20, 40), 2)]),
+        ))
+    return rows
+
+
+def assert_rollups_match(prefix, stage):
+    raw = RAW_AGGREGATES.format(prefix=prefix)
+    mismatches = local_db.query(ROLLUP_MISMATCHES.format(raw=raw, prefix=prefix))
+    assert not mismatches, f"Rollups differ from raw aggregates after {stage}: {mismatches[:5]}"
+    mismatches = local_db.query(SUMMARY_MISMATCHES.format(raw=raw, prefix=prefix))
+    assert not mismatches, f"trade_data_summary differs from raw aggregates after {stage}: {mismatches[:5]}"
+
+
+def test_trade_data_rollups_match_raw_aggregates():
+    prefix = f"T{uuid.uuid4().hex[:8]}-"
+    values = ",\n".join(
+        "(" + ", ".join(sql_value(v) for v in row) + ")" for row in random_rows(prefix, 300)
+    )
+    try:
+        local_db.psql(
+            "INSERT INTO trade_data (hs_code, country, year, import_value, export_value, import_volume, growth_rate) "
+            f"VALUES {values};"
+        )
+        assert_rollups_match(prefix, "insert")
+
+        # Updates may move rows between chapters, countries and years
+        local_db.psql(f"""
+            UPDATE trade_data SET import_value = import_value * 1.5, growth_rate = NULL
+            WHERE country LIKE '{prefix}%' AND year = 2023;
+            UPDATE trade_data SET hs_code = '6109.10', year = 2024
+            WHERE id IN (SELECT id FROM trade_data WHERE country LIKE '{prefix}%' ORDER BY id LIMIT 40);
+        """)
+        assert_rollups_match(prefix, "update")
+
+        local_db.psql(f"""
+            DELETE FROM trade_data
+            WHERE id IN (SELECT id FROM trade_data WHERE country LIKE '{prefix}%' ORDER BY id DESC LIMIT 120);
+            DELETE FROM trade_data WHERE country = '{prefix}FR' AND year = 2022;
+        """)
+        assert_rollups_match(prefix, "delete")
+
+        # A full rebuild must agree with the incrementally maintained state
+        local_db.psql("SELECT refresh_trade_data_rollups();")
+        assert_rollups_match(prefix, "refresh")
+    finally:
+        local_db.psql(f"DELETE FROM trade_data WHERE country LIKE '{prefix}%';")
+
+    leftover = local_db.query(f"SELECT COUNT(*) FROM trade_data_rollups WHERE country LIKE '{prefix}%'")
+    assert leftover[0][0] == "0", "Rollups for deleted trade data were not removed"
+
+test_trade_data_rollups_match_raw_aggregates()
@@ -0,0 +1,109 @@
+import uuid
+
+import requests
+
+import local_db
+from api_client import BASE_URL, TIMEOUT, get_company_id, get_jwt_token, get_session
+from stub_ai import configure, ensure_stub
+
+# Requires apps/web on the local database (python local_db.py start) with
+# NEXT_PUBLIC_CREATE_BASE_URL pointing at the AI stub. A statement-level trigger
+# counts INSERT statements on trend_detections, i.e. write round trips per analysis.
+
+# Pins the shared AI stub's responses and reads a server-wide trigger count.
+SERIAL = True
+TREND_COUNT = 25
+
+COUNTER_SETUP = """
+CREATE TABLE IF NOT EXISTS tc015_insert_statements (n INTEGER NOT NULL);
+CREATE OR REPLACE FUNCTION tc015_count_insert() RETURNS TRIGGER AS $$
+BEGIN
+  INSERT INTO tc015_insert_statements VALUES (1);
+  RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+DROP TRIGGER IF EXISTS tc015_count_trend_inserts ON trend_detections;
+CREATE TRIGGER tc015_count_trend_inserts AFTER INSERT ON trend_detections
+  FOR EACH STATEMENT EXECUTE FUNCTION tc015_count_insert();
+"""
+
+COUNTER_TEARDOWN = """
+DROP TRIGGER IF EXISTS tc015_count_trend_inserts ON trend_detections;
+DROP FUNCTION IF EXISTS tc015_count_insert();
+DROP TABLE IF EXISTS tc015_insert_statements;
+"""
+
+
+def trend(i, strength=70):
+    return {
+        "trend_type": f"trend_{i}",
+        "description": f"Trend {i}",
+        "trend_strength": strength,
+        "growth_rate": 5.5,
+        "confidence_score": 80,
+        "key_indicators": ["imports"],
+        "impact_assessment": "moderate",
+        "opportunities": ["expand"],
+        "recommendations": ["monitor"],
+    }
+
+
+def analysis(trends):
+    return {
+        "trends": trends,
+        "summary": {
+            "total_trends_identified": len(trends),
+            "strongest_trend": "trend_0",
+            "highest_opportunity": "trend_1",
+            "key_insights": [],
+            "strategic_priorities": [],
+        },
+    }
+
+
+def insert_statements():
+    return int(local_db.query("SELECT COUNT(*) FROM tc015_insert_statements")[0][0])
+
+
+def saved_trends(scope):
+    return int(local_db.query(f"SELECT COUNT(*) FROM trend_detections WHERE market_scope = '{scope}'")[0][0])
+
+
+def test_trend_detection_batched_atomic_writes():
+    ensure_stub()
+    session = get_session()
+    headers = {
+        "Authorization": f"Bearer {get_jwt_token()}",
+        "Content-Type": "application/json"
+    }
+    company_id = get_company_id()
+    url = f"{BASE_URL}/api/trend-detection"
+
+    local_db.psql(COUNTER_SETUP)
+    try:
+        # Many trends in one analysis are written with a single INSERT statement
+        configure(delay=0, responses={"trend_detection": analysis([trend(i) for i in range(TREND_COUNT)])})
+        scope = f"tc015-{uuid.uuid4().hex[:8]}"
+        before = insert_statements()
+        response = session.post(url, json={"company_id": company_id, "analysis_scope": scope}, headers=headers, timeout=TIMEOUT)
+        assert response.status_code == 200, f"Trend detection failed with status {response.status_code}"
+        assert len(response.json()["trends"]) == TREND_COUNT, "Every detected trend should be returned"
+        statements = insert_statements() - before
+        assert statements == 1, f"Expected 1 INSERT statement for {TREND_COUNT} trends, saw {statements}"
+        assert saved_trends(scope) == TREND_COUNT, f"Expected {TREND_COUNT} saved trends"
+
+        # One invalid trend must not leave the rest of the analysis behind
+        broken = [trend(i) for i in range(TREND_COUNT)]
+        broken[TREND_COUNT - 3] = trend(TREND_COUNT - 3, strength="very strong")
+        configure(responses={"trend_detection": analysis(broken)})
+        scope = f"tc015-{uuid.uuid4().hex[:8]}"
+        response = session.post(url, json={"company_id": company_id, "analysis_scope": scope}, headers=headers, timeout=TIMEOUT)
+        assert response.status_code == 500, f"Expected the invalid analysis to fail, got {response.status_code}"
+        assert saved_trends(scope) == 0, "A failed analysis left partial trends behind"
+    except requests.RequestException as e:
+        assert False, f"Request to /api/trend-detection failed: {e}"
+    finally:
+        configure(responses={"trend_detection": None})
+        local_db.psql(COUNTER_TEARDOWN)
+
+test_trend_detection_batched_atomic_writes()
@@ -0,0 +1,69 @@
+import time
+import uuid
+
+import requests
+
+import jobs
+from api_client import get_company_id
+from stub_ai import configure, ensure_stub, total_calls
+
+# Requires apps/web to be started with NEXT_PUBLIC_CREATE_BASE_URL pointing at the
+# AI stub and JOB_RETRY_DELAY_MS low enough (e.g. 200) for the retry to be quick.
+
+# Sets the shared AI stub's delay and makes its next generation fail.
+SERIAL = True
+STUB_DELAY = 2.0
+
+
+def prediction(company_id):
+    # A unique period keeps every job out of the generation cache
+    return {
+        "company_id": company_id,
+        "prediction_type": "market_forecast",
+        "period": f"async-{uuid.uuid4()}",
+        "target_market": "Japan",
+        "product_category": "Machinery",
+    }
+
+
+def test_async_ai_jobs_submit_retry_and_cancel():
+    ensure_stub()
+    configure(delay=STUB_DELAY)
+    company_id = get_company_id()
+
+    try:
+        # Submitting returns immediately instead of waiting for the generation
+        started = time.perf_counter()
+        job = jobs.submit("/api/ai-predictions", prediction(company_id))
+        submit_s = time.perf_counter() - started
+        assert submit_s < STUB_DELAY / 2, f"Async submit took {submit_s:.2f}s, expected well under the {STUB_DELAY}s generation"
+        assert job["status"] in ("queued", "running"), f"Unexpected initial job status {job['status']}"
+
+        # Streaming follows the job to completion
+        states = [state["status"] for state in jobs.stream(job["id"])]
+        assert states[-1] == "succeeded", f"Expected the stream to end with success, got {states}"
+        finished = jobs.get(job["id"])
+        assert finished["result_status"] == 200, f"Expected the wrapped handler to answer 200, got {finished['result_status']}"
+        assert finished["result"]["prediction"]["id"], "Job result should contain the saved prediction"
+
+        # A failed generation is retried and the job still succeeds
+        configure(fail_next=1)
+        calls_before = total_calls()
+        result = jobs.run("/api/ai-predictions", prediction(company_id))
+        assert result["status"] == "success", f"Retried job returned {result}"
+        assert total_calls() - calls_before == 2, "Expected one failed and one successful generation"
+
+        # Cancelling a running job stops it and later cancels are rejected
+        job = jobs.submit("/api/ai-predictions", prediction(company_id))
+        time.sleep(STUB_DELAY / 4)
+        response = jobs.cancel(job["id"])
+        assert response.status_code == 200, f"Expected 200 cancelling a running job, got {response.status_code}"
+        cancelled = jobs.wait(job["id"])
+        assert cancelled["status"] == "cancelled", f"Expected cancelled job, got {cancelled['status']}"
+        assert jobs.cancel(job["id"]).status_code == 409, "Cancelling a finished job should return 409"
+    except requests.RequestException as e:
+        assert False, f"Async job request failed: {e}"
+    finally:
+        configure(delay=1.0, fail_next=0)
+
+test_async_ai_jobs_submit_retry_and_cancel()
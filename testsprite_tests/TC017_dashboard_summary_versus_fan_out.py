@@ -0,0 +1,77 @@
+import time
+
+import requests
+
+from api_client import BASE_URL, TIMEOUT, get_company_id, get_jwt_token, get_session, thread_pool
+from perf_stats import summarize
+
+ROUNDS = 10
+TOP = 5
+
+# The four list requests the dashboard used to fire in parallel on every load,
+# with the response key holding each list and the matching summary section.
+FAN_OUT = [
+    ("/api/campaigns", "campaigns", "campaigns"),
+    ("/api/potential-buyers", "buyers", "buyers"),
+    ("/api/market-reports", "reports", "reports"),
+    ("/api/products", "products", "products"),
+]
+
+
+def test_dashboard_summary_versus_fan_out():
+    session = get_session()
+    headers = {
+        "Accept": "application/json",
+        "Authorization": f"Bearer {get_jwt_token()}",
+    }
+    company_id = get_company_id()
+    params = {"company_id": company_id}
+    summary_url = f"{BASE_URL}/api/dashboard/summary"
+
+    def get(path, extra=None):
+        response = session.get(f"{BASE_URL}{path}", headers=headers, params=dict(params, **(extra or {})), timeout=TIMEOUT)
+        assert response.status_code == 200, f"{path} failed with status {response.status_code}"
+        return response
+
+    try:
+        missing = session.get(summary_url, headers=headers, timeout=TIMEOUT)
+        assert missing.status_code == 400, f"Expected 400 without company_id, got {missing.status_code}"
+
+        # The summary agrees with the individual list endpoints
+        summary = get("/api/dashboard/summary", {"limit": TOP}).json()
+        lists = {section: get(path).json() for path, _, section in FAN_OUT}
+        for path, key, section in FAN_OUT:
+            data, part = lists[section], summary[section]
+            assert len(part["by_month"]) == 12, f"{section} should have one count per month"
+            assert sum(part["by_month"]) <= part["total"], f"{section} monthly counts exceed its total"
+            assert len(part["items"]) == min(TOP, part["total"]), f"{section} should return the top {TOP} items"
+            if not data.get("has_more"):
+                assert part["total"] == len(data[key]), f"{section} total {part['total']} != {len(data[key])} rows from {path}"
+        for section in ("reports", "products"):
+            # Both lists are newest first, so the summary items are their first page
+            expected = [row["id"] for row in lists[section][section][:TOP]]
+            assert [row["id"] for row in summary[section]["items"]] == expected, f"{section} items differ from the list head"
+        assert summary["campaigns"]["estimated_deals"] >= 0, "Campaigns should report estimated deals"
+
+        # Latency: one summary request against the four requests fired together
+        with thread_pool(len(FAN_OUT)) as pool:
+            fan_out_ms, summary_ms = [], []
+            fan_out_bytes = summary_bytes = 0
+            for _ in range(ROUNDS):
+                started = time.perf_counter()
+                responses = list(pool.map(lambda entry: get(entry[0]), FAN_OUT))
+                fan_out_ms.append((time.perf_counter() - started) * 1000)
+                fan_out_bytes = sum(len(response.content) for response in responses)
+
+                started = time.perf_counter()
+                summary_bytes = len(get("/api/dashboard/summary", {"limit": TOP}).content)
+                summary_ms.append((time.perf_counter() - started) * 1000)
+
+        fan_out, single = summarize(fan_out_ms), summarize(summary_ms)
+        print(f"fan-out ({len(FAN_OUT)} requests): {fan_out}, {fan_out_bytes} bytes")
+        print(f"summary (1 request): {single}, {summary_bytes} bytes")
+        assert single["p50_ms"] <= fan_out["p50_ms"] * 1.25, f"Summary p50 {single['p50_ms']:.0f} ms is slower than fan-out p50 {fan_out['p50_ms']:.0f} ms"
+    except requests.RequestException as e:
+        assert False, f"Request to /api/dashboard/summary failed: {e}"
+
+test_dashboard_summary_versus_fan_out()
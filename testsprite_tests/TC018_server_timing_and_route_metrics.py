@@ -0,0 +1,70 @@
+import uuid
+
+import requests
+
+from api_client import BASE_URL, TIMEOUT, get_company_id, get_jwt_token, get_session, parse_server_timing
+from stub_ai import configure, ensure_stub
+
+# Requires apps/web in development (so /api/metrics is open) with
+# NEXT_PUBLIC_CREATE_BASE_URL pointing at the AI stub, so the generation below
+# has a known cost.
+
+# Sets the shared AI stub's delay and reads server-wide route histograms.
+SERIAL = True
+STUB_DELAY = 0.3
+ROUTE = "POST /api/ai-predictions"
+
+
+def test_server_timing_and_route_metrics():
+    ensure_stub()
+    configure(delay=STUB_DELAY)
+    session = get_session()
+    headers = {
+        "Authorization": f"Bearer {get_jwt_token()}",
+        "Content-Type": "application/json"
+    }
+    company_id = get_company_id()
+    metrics_url = f"{BASE_URL}/api/metrics"
+
+    try:
+        # A plain list request only spends time in the database
+        response = session.get(f"{BASE_URL}/api/products", headers=headers, params={"company_id": company_id}, timeout=TIMEOUT)
+        assert response.status_code == 200, f"Products fetch failed with status {response.status_code}"
+        timing = parse_server_timing(response.headers.get("Server-Timing"))
+        assert "db" in timing and "total" in timing, f"Expected db and total phases, got {timing}"
+        assert "ai" not in timing, "A list request should not report an AI phase"
+
+        before = session.get(metrics_url, headers=headers, timeout=TIMEOUT).json()["routes"].get(ROUTE, {"total": {"count": 0}})
+
+        # A fresh generation reports its time in the AI call, JSON handling and the database
+        payload = {
+            "company_id": company_id,
+            "prediction_type": "market_forecast",
+            "period": f"timing-{uuid.uuid4()}",
+            "target_market": "Japan",
+            "product_category": "Machinery",
+        }
+        response = session.post(f"{BASE_URL}/api/ai-predictions", json=payload, headers=headers, timeout=TIMEOUT)
+        assert response.status_code == 200, f"Prediction failed with status {response.status_code}"
+        timing = parse_server_timing(response.headers.get("Server-Timing"))
+        for phase in ("db", "ai", "json", "total"):
+            assert phase in timing, f"Missing {phase} phase in {timing}"
+        assert timing["ai"] >= STUB_DELAY * 1000 * 0.9, f"AI phase {timing['ai']} ms is shorter than the stub delay"
+        assert timing["total"] >= timing["ai"], "Total must cover the AI phase"
+        print(f"{ROUTE}: {timing}")
+
+        # The metrics endpoint has histograms per route and per phase
+        metrics = session.get(metrics_url, headers=headers, timeout=TIMEOUT)
+        assert metrics.status_code == 200, f"Metrics fetch failed with status {metrics.status_code}"
+        route = metrics.json()["routes"][ROUTE]
+        assert route["total"]["count"] > before["total"]["count"], "The prediction was not counted"
+        for phase in ("db", "ai", "json"):
+            histogram = route["phases"][phase]
+            assert sum(bucket["count"] for bucket in histogram["buckets"]) == histogram["count"], f"{phase} buckets do not add up"
+        assert route["phases"]["ai"]["max_ms"] >= STUB_DELAY * 1000 * 0.9, "AI histogram missed the slow call"
+    except requests.RequestException as e:
+        assert False, f"Request failed: {e}"
+    finally:
+        configure(delay=1.0)
+
+test_server_timing_and_route_metrics()
@@ -0,0 +1,184 @@
+import json
+import threading
+import time
+import uuid
+
+import requests
+
+from api_client import BASE_URL, TIMEOUT, auth_headers, check_keyset_pages, get_session, iter_pages, new_session, recorded
+from perf_stats import summarize
+
+# Requires apps/web in development (NODE_ENV=development), where requests may
+# act for any user_id; elsewhere notifications belong to the session user.
+
+SUBSCRIBERS = 50
+ROUNDS = 5
+MAX_P95_MS = 1000
+# Longer than the server's 15 s heartbeat, so an idle stream never times out
+STREAM_READ_TIMEOUT = 20
+# Kept in step with REPLAY_LIMIT in notifications/stream/route.js
+REPLAY_LIMIT = 100
+
+
+def read_events(response):
+    """Yield ``(event, id, data)`` for each server-sent event on ``response``."""
+    event, event_id, data = "message", None, []
+    for line in response.iter_lines(decode_unicode=True):
+        if line.startswith("event:"):
+            event = line[6:].strip()
+        elif line.startswith("id:"):
+            event_id = line[3:].strip()
+        elif line.startswith("data:"):
+            data.append(line[5:].strip())
+        elif not line and data:
+            yield event, event_id, json.loads("\n".join(data))
+            event, event_id, data = "message", None, []
+
+
+def open_stream(session, user_id, last_event_id=None):
+    headers = auth_headers({"Accept": "text/event-stream"})
+    if last_event_id:
+        headers["Last-Event-ID"] = last_event_id
+    response = session.get(
+        f"{BASE_URL}/api/notifications/stream",
+        params={"user_id": user_id},
+        headers=headers,
+        stream=True,
+        timeout=(TIMEOUT, STREAM_READ_TIMEOUT),
+    )
+    assert response.status_code == 200, f"Stream failed with status {response.status_code}"
+    assert response.headers.get("Content-Type", "").startswith("text/event-stream"), "Stream is not text/event-stream"
+    return response
+
+
+def subscriber(user_id, ready, received, errors):
+    # One connection per subscriber, as separate browser tabs would have
+    session = new_session()
+    try:
+        with open_stream(session, user_id) as response:
+            for event, event_id, data in read_events(response):
+                if event == "unread" and not ready.is_set():
+                    ready.set()
+                elif event == "notification":
+                    received[data["notification"]["id"]] = (time.perf_counter(), event_id)
+                    if len(received) == ROUNDS:
+                        return
+    except Exception as e:
+        errors.append(repr(e))
+    finally:
+        ready.set()
+        session.close()
+
+
+def test_notifications_sse_delivery_latency():
+    session = get_session()
+    headers = auth_headers({"Content-Type": "application/json"})
+    user_id = str(uuid.uuid4())
+    notifications_url = f"{BASE_URL}/api/notifications"
+
+    try:
+        # Many subscribers for the same user, all connected before anything is sent
+        readies = [threading.Event() for _ in range(SUBSCRIBERS)]
+        received = [{} for _ in range(SUBSCRIBERS)]
+        errors = []
+        threads = [
+            threading.Thread(target=recorded(subscriber), args=(user_id, readies[i], received[i], errors), daemon=True)
+            for i in range(SUBSCRIBERS)
+        ]
+        for thread in threads:
+            thread.start()
+        for ready in readies:
+            assert ready.wait(TIMEOUT), "A subscriber never received its initial unread event"
+        assert not errors, f"Subscribers failed to connect: {errors[:3]}"
+
+        sent = {}
+        for i in range(ROUNDS):
+            started = time.perf_counter()
+            response = session.post(notifications_url, json={
+                "user_id": user_id,
+                "type": "market_alert",
+                "title": f"Delivery check {i}",
+                "message": "Sent by TC019",
+                "data": {"round": i},
+            }, headers=headers, timeout=TIMEOUT)
+            assert response.status_code == 200, f"Notification create failed with status {response.status_code}"
+            body = response.json()
+            assert body["unread_count"] == i + 1, f"Expected unread_count {i + 1}, got {body['unread_count']}"
+            sent[body["notification"]["id"]] = started
+            time.sleep(0.1)
+
+        for thread in threads:
+            thread.join(STREAM_READ_TIMEOUT)
+        assert not errors, f"Subscribers failed: {errors[:3]}"
+
+        latencies = []
+        for i, seen in enumerate(received):
+            missing = set(sent) - set(seen)
+            assert not missing, f"Subscriber {i} missed {len(missing)} notifications"
+            latencies.extend((seen[notification_id][0] - sent_at) * 1000 for notification_id, sent_at in sent.items())
+        stats = summarize(latencies)
+        print(f"SSE delivery to {SUBSCRIBERS} subscribers x {ROUNDS} notifications: {stats}")
+        assert stats["p95_ms"] <= MAX_P95_MS, f"p95 delivery {stats['p95_ms']:.1f} ms exceeds {MAX_P95_MS} ms"
+
+        # The list is served from the table, newest first, with the counters alongside
+        ids = list(sent)
+        response = session.get(notifications_url, params={"user_id": user_id}, headers=headers, timeout=TIMEOUT)
+        assert response.status_code == 200, f"Notifications fetch failed with status {response.status_code}"
+        data = response.json()
+        assert data["total"] == ROUNDS and data["unread_count"] == ROUNDS, f"Unexpected counters {data['total']}/{data['unread_count']}"
+        assert [n["id"] for n in data["notifications"]] == ids[::-1], "Notifications are not newest first"
+        assert data["notifications"][0]["type"] == "market_alert" and data["notifications"][0]["data"] == {"round": ROUNDS - 1}
+        pages = iter_pages("/api/notifications", "notifications", params={"user_id": user_id}, limit=2)
+        assert check_keyset_pages(pages, 2) == ROUNDS, "Paging did not return every notification once"
+        # The original offset contract still works alongside the cursor
+        response = session.get(notifications_url, params={"user_id": user_id, "limit": 2, "offset": 2}, headers=headers, timeout=TIMEOUT)
+        assert response.status_code == 200, f"Offset fetch failed with status {response.status_code}"
+        data = response.json()
+        assert [n["id"] for n in data["notifications"]] == ids[::-1][2:4], "offset did not skip the newest notifications"
+        assert data["total"] == ROUNDS and data["has_more"], "Offset page lost total or has_more"
+
+        # Marking read moves the counter once; repeating it is a no-op
+        for expected_updated in (1, 0):
+            response = session.put(notifications_url, json={
+                "user_id": user_id, "notification_ids": [ids[0]], "mark_as_read": True,
+            }, headers=headers, timeout=TIMEOUT)
+            assert response.status_code == 200, f"Mark as read failed with status {response.status_code}"
+            body = response.json()
+            assert body["updated"] == expected_updated, f"Expected {expected_updated} rows updated, got {body['updated']}"
+            assert body["unread_count"] == ROUNDS - 1, f"Expected unread_count {ROUNDS - 1}, got {body['unread_count']}"
+        response = session.get(notifications_url, params={"user_id": user_id, "unread_only": "true"}, headers=headers, timeout=TIMEOUT)
+        assert len(response.json()["notifications"]) == ROUNDS - 1, "unread_only still lists the read notification"
+
+        # A reconnecting client gets what it missed after its Last-Event-ID
+        first_event_id = received[0][ids[0]][1]
+        assert first_event_id, "Notification events carry no id"
+        stream_session = new_session()
+        replayed = []
+        with open_stream(stream_session, user_id, last_event_id=first_event_id) as response:
+            for event, _, data in read_events(response):
+                if event == "unread":
+                    assert data["unread_count"] == ROUNDS - 1, f"Stream reported unread_count {data['unread_count']}"
+                    break
+                replayed.append(data["notification"]["id"])
+        stream_session.close()
+        assert replayed == ids[1:], f"Expected {len(ids) - 1} replayed notifications in order, got {len(replayed)}"
+
+        response = session.put(notifications_url, json={"user_id": user_id, "mark_all": True}, headers=headers, timeout=TIMEOUT)
+        assert response.json()["unread_count"] == 0, "mark_all left unread notifications"
+
+        # A client that missed more than can be replayed is told to refetch instead
+        for i in range(REPLAY_LIMIT + 1):
+            response = session.post(notifications_url, json={
+                "user_id": user_id, "type": "market_alert", "title": f"Backlog {i}", "message": "Sent by TC019",
+            }, headers=headers, timeout=TIMEOUT)
+            assert response.status_code == 200, f"Backlog notification failed with status {response.status_code}"
+        stream_session = new_session()
+        with open_stream(stream_session, user_id, last_event_id=first_event_id) as response:
+            event, reset_id, _ = next(read_events(response))
+        stream_session.close()
+        assert event == "reset", f"Expected a reset event for an overlong backlog, got {event}"
+        assert reset_id, "The reset event carries no id to resume from"
+    except requests.RequestException as e:
+        assert False, f"Request failed: {e}"
+
+test_notifications_sse_delivery_latency()
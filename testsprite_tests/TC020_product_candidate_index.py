@@ -0,0 +1,115 @@
+import uuid
+
+import requests
+
+from api_client import BASE_URL, TIMEOUT, get_company_id, get_jwt_token, get_session, parse_server_timing
+from perf_stats import summarize
+from products_bulk import import_products
+from stub_ai import configure, ensure_stub
+
+# Requires apps/web to be started with NEXT_PUBLIC_CREATE_BASE_URL pointing at the
+# AI stub for the matching step at the end.
+
+# Sets the shared AI stub's delay.
+SERIAL = True
+ROUNDS = 30
+K = 10
+MAX_INDEX_P95_MS = 50
+# Kept in step with CANDIDATE_PRODUCTS / CANDIDATE_MARKETS in product-matching/route.js
+CANDIDATE_PRODUCTS = 8
+CANDIDATE_MARKETS = 8
+
+
+def test_product_candidate_index():
+    ensure_stub()
+    configure(delay=0.05)
+    session = get_session()
+    headers = {
+        "Authorization": f"Bearer {get_jwt_token()}",
+        "Content-Type": "application/json"
+    }
+    company_id = get_company_id()
+    run_id = uuid.uuid4().hex[:8]
+    tag = f"idx{run_id}"
+    candidates_url = f"{BASE_URL}/api/product-matching/candidates"
+
+    def create_product(name, hs_code, category, material):
+        response = session.post(f"{BASE_URL}/api/products", json={
+            "company_id": company_id,
+            "product_name": name,
+            "hs_code": hs_code,
+            "category": category,
+            "material": material,
+            "unit_price": 10,
+            "currency": "USD",
+            "description": f"Created by TC020 {tag}",
+        }, headers=headers, timeout=TIMEOUT)
+        assert response.status_code == 200, f"Product create failed with status {response.status_code}"
+        return response.json()["product"]
+
+    try:
+        # A catalogue where only a quarter of the rows are knitted cotton shirts;
+        # every row shares the run tag, so it alone cannot rank them
+        rows = [
+            {"product_name": f"Cotton knit t-shirt {tag} #{i}", "hs_code": "610910", "category": "Apparel", "material": "Cotton", "description": tag}
+            for i in range(10)
+        ]
+        for hs_code, name, category, material in (
+            ("847130", "Portable laptop computer", "Electronics", "Aluminium"),
+            ("731815", "Hex head steel bolt", "Hardware", "Steel"),
+            ("940360", "Oak dining table", "Furniture", "Wood"),
+        ):
+            rows.extend(
+                {"product_name": f"{name} {tag} #{i}", "hs_code": hs_code, "category": category, "material": material, "description": tag}
+                for i in range(10)
+            )
+        response = import_products(rows, company_id, fmt="ndjson")
+        assert response.status_code == 200, f"Bulk import failed with status {response.status_code}"
+        assert response.json()["inserted"] == len(rows), "Not every catalogue row was imported"
+
+        probe = create_product(f"Organic cotton t-shirt {tag}", "61091000", "Apparel", "Cotton")
+
+        # The nearest products share the probe's HS heading, best first
+        latencies = []
+        index_ms = []
+        for _ in range(ROUNDS):
+            response = session.get(candidates_url, params={"company_id": company_id, "product_id": probe["id"], "k": K}, headers=headers, timeout=TIMEOUT)
+            assert response.status_code == 200, f"Candidates failed with status {response.status_code}"
+            latencies.append(response.elapsed.total_seconds() * 1000)
+            index_ms.append(parse_server_timing(response.headers.get("Server-Timing")).get("index", 0.0))
+        candidates = response.json()["candidates"]
+        assert len(candidates) == K, f"Expected {K} candidates, got {len(candidates)}"
+        assert probe["id"] not in [c["id"] for c in candidates], "The probe product ranked itself"
+        assert all(c["hs_code"].startswith("6109") for c in candidates), f"Unrelated products ranked: {[c['product_name'] for c in candidates]}"
+        scores = [c["similarity"] for c in candidates]
+        assert scores == sorted(scores, reverse=True), "Candidates are not ranked by similarity"
+
+        stats = summarize(index_ms)
+        print(f"Candidate ranking: request {summarize(latencies)}, index phase {stats}")
+        assert stats["p95_ms"] <= MAX_INDEX_P95_MS, f"Index p95 {stats['p95_ms']:.1f} ms exceeds {MAX_INDEX_P95_MS} ms"
+
+        # A product is searchable as soon as it is created
+        teapot = create_product(f"Ceramic teapot {tag} glaze{run_id}", "691200", "Homeware", "Ceramic")
+        response = session.get(candidates_url, params={"company_id": company_id, "q": f"teapot glaze{run_id}", "k": 3}, headers=headers, timeout=TIMEOUT)
+        assert response.status_code == 200, f"Candidate search failed with status {response.status_code}"
+        assert response.json()["candidates"][0]["id"] == teapot["id"], "A new product was not indexed on insert"
+
+        missing = session.get(candidates_url, params={"company_id": company_id}, headers=headers, timeout=TIMEOUT)
+        assert missing.status_code == 400, f"Expected 400 without product_id or q, got {missing.status_code}"
+
+        # The AI step only sees the small candidate set
+        response = session.post(f"{BASE_URL}/api/product-matching", json={
+            "company_id": company_id,
+            "product_id": probe["id"],
+        }, headers=headers, timeout=TIMEOUT)
+        assert response.status_code == 200, f"Product matching failed with status {response.status_code}"
+        sent = response.json()["candidates"]
+        assert 0 < len(sent["products"]) <= CANDIDATE_PRODUCTS, f"Expected at most {CANDIDATE_PRODUCTS} similar products, got {len(sent['products'])}"
+        assert all(p["hs_code"].startswith("6109") for p in sent["products"]), "Unrelated products were sent to the AI"
+        assert len(sent["markets"]) <= CANDIDATE_MARKETS, f"Expected at most {CANDIDATE_MARKETS} markets, got {len(sent['markets'])}"
+    except requests.RequestException as e:
+        assert False, f"Request failed: {e}"
+    finally:
+        configure(delay=1.0)
+
+test_product_candidate_index()
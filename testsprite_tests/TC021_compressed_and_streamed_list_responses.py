@@ -0,0 +1,126 @@
+import gzip
+import json
+import zlib
+
+import requests
+
+from api_client import BASE_URL, TIMEOUT, get_company_id, get_jwt_token, get_session, iter_pages
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+PAGE_LIMIT = 500
+# Kept in step with MIN_COMPRESS_BYTES in apps/web/src/app/api/utils/respond.js
+MIN_COMPRESS_BYTES = 1024
+
+
+def test_compressed_and_streamed_list_responses():
+    session = get_session()
+    token = get_jwt_token()
+    company_id = get_company_id()
+    wire_bytes = []
+
+    def fetch(path, params=None, encoding="identity", accept="application/json", headers=None):
+        """Return ``(response, body as sent on the wire)`` without letting requests decode it."""
+        response = session.get(f"{BASE_URL}{path}", params=params, headers={
+            "Authorization": f"Bearer {token}",
+            "Accept": accept,
+            "Accept-Encoding": encoding,
+            **(headers or {}),
+        }, stream=True, timeout=TIMEOUT)
+        body = response.raw.read(decode_content=False)
+        assert response.status_code in (200, 304), f"{path} failed with status {response.status_code}"
+        return response, body
+
+    def decode(response, body):
+        encoding = response.headers.get("Content-Encoding")
+        if encoding == "gzip":
+            return gzip.decompress(body)
+        if encoding == "br":
+            return brotli.decompress(body)
+        assert encoding is None, f"Unexpected Content-Encoding {encoding}"
+        return body
+
+    def compare_encodings(label, path, params=None):
+        plain_response, plain = fetch(path, params)
+        assert plain_response.headers.get("Content-Encoding") is None, f"{label}: identity request got an encoded body"
+        expected = json.loads(plain)
+        sizes = {"identity": len(plain)}
+        for encoding in ("gzip", "br"):
+            response, body = fetch(path, params, encoding=encoding)
+            assert response.headers.get("Content-Encoding") == encoding, f"{label}: expected {encoding}, got {response.headers.get('Content-Encoding')}"
+            assert "accept-encoding" in response.headers.get("Vary", "").lower(), f"{label}: missing Vary: Accept-Encoding"
+            if len(plain) >= MIN_COMPRESS_BYTES:
+                assert len(body) < len(plain), f"{label}: {encoding} body ({len(body)} B) is not smaller than identity ({len(plain)} B)"
+            if encoding == "gzip" or brotli:
+                assert json.loads(decode(response, body)) == expected, f"{label}: {encoding} body does not decode to the identity body"
+            sizes[encoding] = len(body)
+        wire_bytes.append((label, sizes))
+        return expected
+
+    def ndjson_rows(path, params):
+        """Decode a gzip NDJSON stream chunk by chunk, as a client on a slow link would."""
+        response = session.get(f"{BASE_URL}{path}", params=dict(params, format="ndjson"), headers={
+            "Authorization": f"Bearer {token}",
+            "Accept-Encoding": "gzip",
+        }, stream=True, timeout=TIMEOUT)
+        assert response.status_code == 200, f"{path} NDJSON failed with status {response.status_code}"
+        assert response.headers.get("Content-Type", "").startswith("application/x-ndjson"), "NDJSON mode has the wrong Content-Type"
+        assert response.headers.get("Content-Encoding") == "gzip", "NDJSON stream was not compressed"
+        decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        buffered = b""
+        rows = []
+        received = 0
+        for chunk in response.raw.stream(64 * 1024, decode_content=False):
+            received += len(chunk)
+            buffered += decompressor.decompress(chunk)
+            *lines, buffered = buffered.split(b"\n")
+            rows.extend(json.loads(line) for line in lines if line)
+        buffered += decompressor.flush()
+        assert not buffered.strip(), "NDJSON stream ended mid-line"
+        return rows, received
+
+    try:
+        params = {"company_id": company_id, "limit": PAGE_LIMIT}
+
+        # JSON pages: byte-identical content whichever encoding is negotiated
+        products = compare_encodings("products page", "/api/products", params)
+        assert isinstance(products["products"], list) and "has_more" in products, "Products page lost its shape"
+        compare_encodings("ai-predictions page", "/api/ai-predictions", params)
+        tree = compare_encodings("gtip-codes tree", "/api/gtip-codes")
+
+        # NDJSON streams every row once, across all pages
+        for path, key in (("/api/products", "products"), ("/api/ai-predictions", "predictions")):
+            rows, received = ndjson_rows(path, {"company_id": company_id})
+            paged = sum(len(page) for page in iter_pages(path, key, params={"company_id": company_id}, limit=PAGE_LIMIT))
+            assert len(rows) == paged, f"{path}: NDJSON returned {len(rows)} rows, paging returned {paged}"
+            assert len({row["id"] for row in rows}) == len(rows), f"{path}: NDJSON repeated rows"
+            wire_bytes.append((f"{key} ndjson (all rows)", {"gzip": received}))
+
+        chapters, _ = fetch("/api/gtip-codes", {"format": "ndjson"})
+        lines = [json.loads(line) for line in chapters.splitlines() if line]
+        assert len(lines) == len(tree["gtipCodes"]), "NDJSON tree does not have one line per chapter"
+
+        # Compressed variants revalidate against their (weak) ETag
+        response, _ = fetch("/api/gtip-codes", encoding="gzip")
+        etag = response.headers.get("ETag")
+        assert etag and etag.startswith("W/"), f"Compressed tree should carry a weak ETag, got {etag}"
+        response, body = fetch("/api/gtip-codes", encoding="gzip", headers={"If-None-Match": etag})
+        assert response.status_code == 304 and not body, "Revalidating the compressed tree did not return 304"
+
+        # Tiny bodies are not worth compressing
+        response, body = fetch("/api/gtip-codes", {"code": "84713000"}, encoding="gzip")
+        assert response.headers.get("Content-Encoding") is None, "A small response was compressed"
+        assert json.loads(body)["valid"], "84713000 should resolve to a known subheading"
+
+        print("Bytes on the wire:")
+        for label, sizes in wire_bytes:
+            print(f"  {label:<28} " + "  ".join(f"{encoding} {size:>9,} B" for encoding, size in sizes.items()))
+        if brotli is None:
+            print("  (brotli module not installed; br bodies were size-checked but not decoded)")
+    except requests.RequestException as e:
+        assert False, f"Request failed: {e}"
+
+test_compressed_and_streamed_list_responses()
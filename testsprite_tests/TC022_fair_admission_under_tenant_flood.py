@@ -0,0 +1,123 @@
+import time
+import uuid
+
+import requests
+
+from api_client import BASE_URL, TIMEOUT, get_jwt_token, get_session, thread_pool
+from perf_stats import summarize
+from stub_ai import configure, ensure_stub
+
+# Requires apps/web in development (so /api/metrics is open) with
+# NEXT_PUBLIC_CREATE_BASE_URL pointing at the AI stub so every generation has a
+# fixed cost.
+
+# Sets the shared AI stub's delay and fills the admission queues.
+SERIAL = True
+STUB_DELAY = 0.5
+ROUNDS = 6
+# Flood requests beyond what the flooding company may run and queue
+EXTRA_FLOOD = 10
+# A quiet company's p50 under the flood may be at most this much worse than alone
+MAX_SLOWDOWN = 1.5
+
+
+def test_fair_admission_under_tenant_flood():
+    ensure_stub()
+    configure(STUB_DELAY)
+    session = get_session()
+    headers = {
+        "Authorization": f"Bearer {get_jwt_token()}",
+        "Content-Type": "application/json"
+    }
+    run_id = uuid.uuid4().hex[:8]
+
+    def create_company(name):
+        response = session.post(f"{BASE_URL}/api/companies", json={
+            "company_name": f"{name} {run_id}",
+            "industry": "Textiles",
+            "country": "Turkey",
+        }, headers=headers, timeout=TIMEOUT)
+        assert response.status_code == 201, f"Company create failed with status {response.status_code}"
+        return response.json()["id"]
+
+    def admission():
+        response = session.get(f"{BASE_URL}/api/metrics", timeout=TIMEOUT)
+        assert response.status_code == 200, f"Metrics failed with status {response.status_code}"
+        return response.json()["ai_admission"]
+
+    def predict(company_id):
+        # A fresh run id keeps every request out of the generation cache
+        started = time.perf_counter()
+        response = session.post(f"{BASE_URL}/api/ai-predictions", json={
+            "company_id": company_id,
+            "prediction_type": "market_forecast",
+            "period": "3_months",
+            "target_market": "Germany",
+            "product_category": "Textiles",
+            "hs_code": "610910",
+            "market_data": {"run": str(uuid.uuid4())},
+        }, headers=headers, timeout=TIMEOUT)
+        return response, (time.perf_counter() - started) * 1000
+
+    def sequential(company_id):
+        latencies = []
+        for _ in range(ROUNDS):
+            response, elapsed_ms = predict(company_id)
+            assert response.status_code == 200, f"Quiet company request failed with status {response.status_code}"
+            latencies.append(elapsed_ms)
+        return latencies
+
+    try:
+        flooder = create_company("TC022 flooder")
+        quiet = [create_company(f"TC022 quiet {i}") for i in range(2)]
+        limits = admission()
+        flood_size = limits["company_limit"] + limits["company_queue_limit"] + EXTRA_FLOOD
+
+        # Baseline: a quiet company on an idle server
+        baseline = summarize(sequential(quiet[0]))
+
+        # One company fires far more generations than it is allowed to run at once
+        with thread_pool(flood_size) as flood_pool:
+            flood = [flood_pool.submit(predict, flooder) for _ in range(flood_size)]
+
+            # Only the flooder can have a queue; metrics report companies in aggregate
+            deadline = time.time() + 10
+            companies = {}
+            while time.time() < deadline:
+                companies = admission()["companies"]
+                if companies["max_queued"] > 0:
+                    break
+                time.sleep(0.05)
+            assert companies.get("max_queued", 0) > 0, "The flood never queued in admission control"
+            assert companies["waiting"] == 1, f"Expected only the flooder to queue, {companies['waiting']} companies are waiting"
+            assert companies["max_running"] <= limits["company_limit"], f"A company runs {companies['max_running']} generations, limit is {limits['company_limit']}"
+
+            # The quiet companies keep working while the flood is queued
+            with thread_pool(len(quiet)) as quiet_pool:
+                under_flood = list(quiet_pool.map(sequential, quiet))
+            flood_results = [future.result() for future in flood]
+
+        statuses = [response.status_code for response, _ in flood_results]
+        assert set(statuses) <= {200, 429}, f"Unexpected flood statuses {sorted(set(statuses))}"
+        rejected = [response for response, _ in flood_results if response.status_code == 429]
+        assert len(rejected) >= EXTRA_FLOOD, f"Expected at least {EXTRA_FLOOD} rejections, got {len(rejected)}"
+        for response in rejected:
+            retry_after = response.headers.get("Retry-After")
+            assert retry_after and int(retry_after) >= 1, f"429 without a usable Retry-After: {retry_after}"
+            assert response.json()["retry_after"] == int(retry_after), "Body and header disagree on retry_after"
+        assert statuses.count(200) >= limits["company_limit"], "The flooding company got no work done"
+
+        print(f"baseline {baseline}")
+        for company_id, latencies in zip(quiet, under_flood):
+            stats = summarize(latencies)
+            print(f"company {company_id} under flood {stats}")
+            assert stats["p50_ms"] <= baseline["p50_ms"] * MAX_SLOWDOWN, (
+                f"Quiet company p50 {stats['p50_ms']:.0f} ms vs {baseline['p50_ms']:.0f} ms alone"
+            )
+        print(f"flood: {statuses.count(200)} admitted, {len(rejected)} rejected of {flood_size}")
+    except requests.RequestException as e:
+        assert False, f"Request failed: {e}"
+    finally:
+        configure(1.0)
+
+test_fair_admission_under_tenant_flood()
@@ -0,0 +1,282 @@
+"""Shared HTTP client for the TC0xx scripts.
+
+Every script used to open a fresh connection per call and repeat its own
+``/api/auth/token`` and ``/api/companies`` round trips. This module keeps a
+single keep-alive ``requests.Session`` and caches the JWT, the user and the
+resolved company id for the lifetime of the process, so a full run pays for
+those lookups once.
+"""
+import base64
+import functools
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+
+BASE_URL = os.environ.get("TESTSPRITE_BASE_URL", "http://localhost:3000")
+TIMEOUT = 30
+POOL_SIZE = int(os.environ.get("TESTSPRITE_POOL_SIZE", "16"))
+
+# Auth.js tokens are usually encrypted, so their expiry is not always readable.
+# Fall back to a conservative lifetime and refresh a little before it runs out.
+TOKEN_TTL = 300
+TOKEN_REFRESH_MARGIN = 30
+
+_session = None
+_session_lock = threading.Lock()
+
+_auth = None
+_auth_lock = threading.Lock()
+
+_company_id = None
+_company_lock = threading.Lock()
+
+# Per-thread request log, filled by the session response hook while a runner
+# has recording switched on for the current thread. Threads a test starts
+# itself join the test's log through thread_pool() or recorded().
+_recording = threading.local()
+
+
+def parse_server_timing(header):
+    """Return ``{metric: duration_ms}`` from a ``Server-Timing`` header value."""
+    timings = {}
+    for metric in (header or "").split(","):
+        name, *params = [part.strip() for part in metric.split(";")]
+        for param in params:
+            key, _, value = param.partition("=")
+            if name and key.strip() == "dur":
+                try:
+                    timings[name] = float(value)
+                except ValueError:
+                    pass
+    return timings
+
+
+def _record_response(response, *args, **kwargs):
+    records = getattr(_recording, "records", None)
+    if records is not None:
+        records.append({
+            "method": response.request.method,
+            "url": response.url,
+            "status": response.status_code,
+            "latencyMs": round(response.elapsed.total_seconds() * 1000, 2),
+            "serverTiming": parse_server_timing(response.headers.get("Server-Timing")),
+        })
+
+
+def start_recording():
+    _recording.records = []
+
+
+def stop_recording():
+    records = getattr(_recording, "records", None) or []
+    _recording.records = None
+    return records
+
+
+def _join_recording(records):
+    _recording.records = records
+
+
+def thread_pool(max_workers):
+    """A ``ThreadPoolExecutor`` whose workers record into the calling thread's request log."""
+    return ThreadPoolExecutor(
+        max_workers=max_workers,
+        initializer=_join_recording,
+        initargs=(getattr(_recording, "records", None),),
+    )
+
+
+def recorded(fn):
+    """Wrap ``fn`` to run in a new thread with the calling thread's request log."""
+    records = getattr(_recording, "records", None)
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        _join_recording(records)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            _join_recording(None)
+
+    return wrapper
+
+
+def new_session():
+    """A separate ``requests.Session`` (its own connections) whose responses are recorded."""
+    session = requests.Session()
+    session.hooks["response"].append(_record_response)
+    return session
+
+
+def get_session():
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = new_session()
+            adapter = HTTPAdapter(pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _session = session
+        return _session
+
+
+def url(path):
+    return f"{BASE_URL}{path}"
+
+
+def _token_expiry(token):
+    """Return the unix time at which ``token`` should be considered stale."""
+    parts = token.split(".")
+    if len(parts) == 3:
+        try:
+            payload = parts[1] + "=" * (-len(parts[1]) % 4)
+            claims = json.loads(base64.urlsafe_b64decode(payload))
+            if isinstance(claims.get("exp"), (int, float)):
+                return claims["exp"] - TOKEN_REFRESH_MARGIN
+        except ValueError:
+            pass
+    return time.time() + TOKEN_TTL - TOKEN_REFRESH_MARGIN
+
+
+def _fetch_auth():
+    response = get_session().get(url("/api/auth/token"), timeout=TIMEOUT)
+    if response.status_code == 401:
+        raise PermissionError("Unauthorized: Invalid credentials or no credentials provided")
+    assert response.status_code == 200, f"Failed to get token, status code: {response.status_code}"
+    content_type = response.headers.get("Content-Type", "")
+    assert content_type.startswith("application/json"), f"Expected JSON response from auth token endpoint, got Content-Type: {content_type}"
+    data = response.json()
+    token = data.get("jwt")
+    user = data.get("user")
+    assert isinstance(token, str) and token, "JWT token is missing or empty"
+    assert isinstance(user, dict) and "id" in user, "User info is missing or invalid"
+    return {"jwt": token, "user": user, "expires_at": _token_expiry(token)}
+
+
+def get_auth(force_refresh=False):
+    """Return ``(jwt, user)``, fetching a new token only when the cached one is stale."""
+    global _auth
+    with _auth_lock:
+        if force_refresh or _auth is None or time.time() >= _auth["expires_at"]:
+            try:
+                _auth = _fetch_auth()
+            except (requests.RequestException, AssertionError, PermissionError, ValueError) as e:
+                raise RuntimeError(f"Failed to obtain JWT token: {e}")
+        return _auth["jwt"], _auth["user"]
+
+
+def get_jwt_token():
+    return get_auth()[0]
+
+
+def get_user():
+    return get_auth()[1]
+
+
+def auth_headers(extra=None):
+    headers = {"Authorization": f"Bearer {get_jwt_token()}"}
+    if extra:
+        headers.update(extra)
+    return headers
+
+
+def _company_id_from_companies(data):
+    if isinstance(data, dict):
+        if isinstance(data.get("companies"), list):
+            data = data["companies"]
+        elif "id" in data:
+            return data["id"]
+    if isinstance(data, list) and data and isinstance(data[0], dict):
+        return data[0].get("id") or data[0].get("company_id")
+    return None
+
+
+def _company_id_from_profile(data):
+    if isinstance(data, dict) and isinstance(data.get("user"), dict):
+        data = data["user"]
+    if isinstance(data, dict):
+        return data.get("company_id") or data.get("id")
+    return None
+
+
+def get_company_id():
+    """Resolve a usable company id once via ``/api/companies``, falling back to ``/api/profile``.
+
+    ``TESTSPRITE_COMPANY_ID`` pins the company instead, e.g. the largest tenant
+    loaded by synthetic_data.py.
+    """
+    global _company_id
+    with _company_lock:
+        if _company_id is not None:
+            return _company_id
+        if os.environ.get("TESTSPRITE_COMPANY_ID"):
+            _company_id = os.environ["TESTSPRITE_COMPANY_ID"]
+            return _company_id
+        session = get_session()
+        headers = auth_headers()
+        try:
+            response = session.get(url("/api/companies"), headers=headers, timeout=TIMEOUT)
+            assert response.status_code == 200, f"Expected 200 on companies list, got {response.status_code}"
+            company_id = _company_id_from_companies(response.json())
+            if not company_id:
+                response = session.get(url("/api/profile"), headers=headers, timeout=TIMEOUT)
+                assert response.status_code == 200, f"Expected 200 on user profile, got {response.status_code}"
+                company_id = _company_id_from_profile(response.json())
+            assert company_id, "No company_id found from /api/companies or /api/profile"
+        except (requests.RequestException, AssertionError, ValueError) as e:
+            raise RuntimeError(f"Failed to get company_id for test: {e}")
+        _company_id = str(company_id)
+        return _company_id
+
+
+def iter_pages(path, key, params=None, limit=None, headers=None, max_pages=1000):
+    """Yield one list of rows per page from a keyset-paginated list endpoint.
+
+    Follows ``next_cursor`` until ``has_more`` is false. ``key`` is the
+    response field holding the rows (e.g. ``"products"``).
+    """
+    session = get_session()
+    params = dict(params or {})
+    if limit is not None:
+        params["limit"] = limit
+    headers = headers or auth_headers({"Accept": "application/json"})
+    for _ in range(max_pages):
+        response = session.get(url(path), headers=headers, params=params, timeout=TIMEOUT)
+        assert response.status_code == 200, f"Expected 200 on {path} page, got {response.status_code}"
+        data = response.json()
+        assert isinstance(data.get(key), list), f"'{key}' key is not a list on {path} page"
+        yield data[key]
+        if not data.get("has_more"):
+            return
+        assert data.get("next_cursor"), f"{path} reported has_more without a next_cursor"
+        params["cursor"] = data["next_cursor"]
+    raise AssertionError(f"{path} did not finish paginating within {max_pages} pages")
+
+
+def check_keyset_pages(pages, limit):
+    """Assert pages are bounded by ``limit``, newest first and free of duplicate ids. Returns the row count."""
+    seen = set()
+    previous = None
+    for page in pages:
+        assert len(page) <= limit, f"Page of {len(page)} rows exceeds limit {limit}"
+        for row in page:
+            assert row["id"] not in seen, f"Row {row['id']} returned on more than one page"
+            seen.add(row["id"])
+            key = (row["created_at"], str(row["id"]))
+            assert previous is None or key <= previous, "Rows are not ordered by created_at, id descending"
+            previous = key
+    return len(seen)
+
+
+def reset():
+    """Drop cached credentials and the company id, e.g. between runs against different servers."""
+    global _auth, _company_id
+    with _auth_lock:
+        _auth = None
+    with _company_lock:
+        _company_id = None
@@ -0,0 +1,286 @@
+"""Latency regression benchmarks for the API, compared against a stored baseline.
+
+Each benchmark replays one request shape from the TC scripts many times, one
+request at a time, against a server on the local database (local_db.py) with
+the AI stub standing in for the integrations. The run is compared with
+``benchmark_baseline.json``. A benchmark regresses when its latencies are
+significantly slower than the baseline's (two-sided Mann-Whitney U test,
+``--alpha``) and its median is also slower by more than ``--threshold``.
+Requiring both keeps noise and statistically real but tiny shifts from
+failing the run.
+
+    # record a baseline on the reference setup and commit it
+    python benchmarks.py --update-baseline
+    # compare a branch against it; exits 1 on regressions, errors or
+    # benchmarks missing from the baseline, 2 when there is no baseline file
+    python benchmarks.py --report tmp/benchmark_report.md
+
+Benchmarks that write rows or call the AI stub are skipped unless
+``--include-writes`` is given. To benchmark at a data scale loaded by
+synthetic_data.py, pass the same ``--scale``; each scale keeps its own
+baseline file:
+
+    python synthetic_data.py --reset --scale 100
+    TESTSPRITE_COMPANY_ID=<printed id> python benchmarks.py --scale 100
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+import uuid
+from datetime import datetime, timezone
+
+from api_client import TIMEOUT, auth_headers, get_company_id, get_session, parse_server_timing, url
+from perf_stats import mann_whitney_u, summarize
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+# Fixed AI stub delay for the generation benchmarks, so their latency tracks the
+# server's own overhead rather than the stub's default.
+STUB_DELAY = 0.05
+
+# A benchmark without a baseline entry cannot be checked, so it fails the run
+# like a regression until the baseline is recorded with --update-baseline.
+FAILING_VERDICTS = ("regression", "errors", "no baseline")
+
+
+def baseline_path(scale):
+    suffix = "" if scale == 1 else f"_{scale}x"
+    return os.path.join(HERE, f"benchmark_baseline{suffix}.json")
+
+
+def _product_payload(company_id):
+    return {
+        "company_id": company_id,
+        "product_name": f"Benchmark Product {uuid.uuid4()}",
+        "hs_code": "84713000",
+        "category": "Electronics",
+        "material": "Plastic and Metal",
+        "technical_specs": "Specs details here",
+        "unit_price": 199.99,
+        "currency": "USD",
+        "description": "Created by benchmarks.py",
+    }
+
+
+def _prediction_payload(company_id):
+    # A unique period keeps every request out of the generation cache
+    return {
+        "company_id": company_id,
+        "prediction_type": "market_forecast",
+        "period": f"bench-{uuid.uuid4()}",
+        "target_market": "North America",
+        "product_category": "Electronics",
+        "hs_code": "854239",
+    }
+
+
+def build_benchmarks(company_id):
+    """Return ``{name: (method, path, params, body_factory, writes)}``."""
+    return {
+        "products.list": ("GET", "/api/products", {"company_id": company_id}, None, False),
+        "products.list.projected": ("GET", "/api/products", {"company_id": company_id, "fields": "product_name,hs_code"}, None, False),
+        "ai-predictions.list": ("GET", "/api/ai-predictions", {"company_id": company_id}, None, False),
+        "ai-predictions.list.filtered": ("GET", "/api/ai-predictions", {"company_id": company_id, "type": "market_forecast", "period": "2025"}, None, False),
+        "market-reports.list": ("GET", "/api/market-reports", {"company_id": company_id}, None, False),
+        "target-markets.list": ("GET", "/api/target-markets", {"company_id": company_id}, None, False),
+        "risk-assessment.list": ("GET", "/api/risk-assessment", {"company_id": company_id}, None, False),
+        "trend-detection.list": ("GET", "/api/trend-detection", {"company_id": company_id}, None, False),
+        "dashboard.summary": ("GET", "/api/dashboard/summary", {"company_id": company_id}, None, False),
+        "gtip-codes.tree": ("GET", "/api/gtip-codes", None, None, False),
+        "products.create": ("POST", "/api/products", None, lambda: _product_payload(company_id), True),
+        "ai-predictions.create": ("POST", "/api/ai-predictions", None, lambda: _prediction_payload(company_id), True),
+    }
+
+
+def run_benchmark(method, path, params, body_factory, iterations, warmup):
+    """Send the request ``warmup + iterations`` times and return the measured samples."""
+    session = get_session()
+    headers = auth_headers({"Accept": "application/json"})
+    latencies = []
+    phases = {}
+    errors = 0
+    for i in range(warmup + iterations):
+        started = time.perf_counter()
+        response = session.request(
+            method,
+            url(path),
+            params=params,
+            json=body_factory() if body_factory else None,
+            headers=headers,
+            timeout=TIMEOUT,
+        )
+        elapsed_ms = round((time.perf_counter() - started) * 1000, 2)
+        if i < warmup:
+            continue
+        if response.status_code >= 400:
+            errors += 1
+        latencies.append(elapsed_ms)
+        for phase, ms in parse_server_timing(response.headers.get("Server-Timing")).items():
+            phases.setdefault(phase, []).append(ms)
+    return {
+        "samples": latencies,
+        "errors": errors,
+        "latency": summarize(latencies),
+        "phases_p50_ms": {phase: statistics.median(values) for phase, values in phases.items()},
+    }
+
+
+def compare(name, current, baseline, alpha, threshold):
+    """Return a comparison row for one benchmark."""
+    row = {
+        "name": name,
+        "current_p50_ms": current["latency"]["p50_ms"],
+        "current_p95_ms": current["latency"]["p95_ms"],
+        "baseline_p50_ms": baseline["latency"]["p50_ms"] if baseline else None,
+        "baseline_p95_ms": baseline["latency"]["p95_ms"] if baseline else None,
+        "change": None,
+        "p_value": None,
+        "verdict": "ok",
+    }
+    if current["errors"]:
+        row["verdict"] = "errors"
+        return row
+    if baseline is None:
+        row["verdict"] = "no baseline"
+        return row
+
+    base_median = statistics.median(baseline["samples"])
+    change = statistics.median(current["samples"]) / base_median - 1 if base_median else 0.0
+    _, p_value = mann_whitney_u(current["samples"], baseline["samples"])
+    row["change"] = round(change, 4)
+    row["p_value"] = p_value
+    if p_value < alpha and change > threshold:
+        row["verdict"] = "regression"
+    elif p_value < alpha and change < -threshold:
+        row["verdict"] = "improved"
+    return row
+
+
+def _ms(value):
+    return "-" if value is None else f"{value:.1f}"
+
+
+def format_report(rows, current, baseline, alpha, threshold):
+    """Render the comparison as a Markdown table."""
+    lines = [
+        "# Benchmark comparison",
+        "",
+        f"Baseline: {baseline.get('recorded_at', 'none')} ({baseline.get('git_commit') or 'unknown commit'})  ",
+        f"Current: {current['recorded_at']} ({current.get('git_commit') or 'unknown commit'})  ",
+        f"Regression: p < {alpha} and median slower by more than {threshold:.0%}",
+        "",
+        "| benchmark | p50 base | p50 now | change | p95 base | p95 now | p-value | phases now (p50) | verdict |",
+        "|---|---:|---:|---:|---:|---:|---:|---|---|",
+    ]
+    for row in rows:
+        result = current["benchmarks"][row["name"]]
+        phases = ", ".join(f"{phase} {ms:.1f}" for phase, ms in result["phases_p50_ms"].items() if phase != "total")
+        change = "-" if row["change"] is None else f"{row['change']:+.1%}"
+        p_value = "-" if row["p_value"] is None else f"{row['p_value']:.3g}"
+        verdict = f"**{row['verdict']}**" if row["verdict"] in FAILING_VERDICTS else row["verdict"]
+        lines.append(
+            f"| {row['name']} | {_ms(row['baseline_p50_ms'])} | {_ms(row['current_p50_ms'])} | {change} "
+            f"| {_ms(row['baseline_p95_ms'])} | {_ms(row['current_p95_ms'])} | {p_value} | {phases or '-'} | {verdict} |"
+        )
+    return "\n".join(lines) + "\n"
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=HERE, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def load_baseline(path, missing_ok=False):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        if missing_ok:
+            return {"benchmarks": {}}
+        raise
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("benchmarks", nargs="*", help="Benchmark names to run (default: all read-only ones)")
+    parser.add_argument("--iterations", type=int, default=50, help="Measured requests per benchmark")
+    parser.add_argument("--warmup", type=int, default=5, help="Unmeasured requests sent first")
+    parser.add_argument("--include-writes", action="store_true", help="Also run benchmarks that create rows or call the AI stub")
+    parser.add_argument("--alpha", type=float, default=0.01, help="Significance level for the comparison")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Minimum relative median change that counts")
+    parser.add_argument("--scale", type=int, default=1, help="Data scale loaded by synthetic_data.py, recorded with the run")
+    parser.add_argument("--baseline", help="Baseline file to compare with or update (default: one per --scale)")
+    parser.add_argument("--update-baseline", action="store_true", help="Store this run as the baseline instead of comparing")
+    parser.add_argument("--company-id")
+    parser.add_argument("--output", help="Write the run and comparison as JSON to this path")
+    parser.add_argument("--report", help="Write the Markdown comparison to this path")
+    args = parser.parse_args(argv)
+    args.baseline = args.baseline or baseline_path(args.scale)
+    if not args.update_baseline and not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; record one with --update-baseline", file=sys.stderr)
+        return 2
+
+    available = build_benchmarks(args.company_id or get_company_id())
+    unknown = [name for name in args.benchmarks if name not in available]
+    if unknown:
+        print(f"Unknown benchmarks: {', '.join(unknown)}", file=sys.stderr)
+        return 2
+    names = args.benchmarks or [name for name, spec in available.items() if args.include_writes or not spec[4]]
+
+    if any(available[name][1] == "/api/ai-predictions" and available[name][0] == "POST" for name in names):
+        from stub_ai import configure, ensure_stub
+
+        ensure_stub()
+        configure(delay=STUB_DELAY)
+
+    current = {
+        "recorded_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "git_commit": git_commit(),
+        "iterations": args.iterations,
+        "scale": args.scale,
+        "benchmarks": {},
+    }
+    for name in names:
+        method, path, params, body_factory, _ = available[name]
+        result = run_benchmark(method, path, params, body_factory, args.iterations, args.warmup)
+        current["benchmarks"][name] = result
+        print(f"{name:<32} p50 {_ms(result['latency']['p50_ms']):>8} ms  p95 {_ms(result['latency']['p95_ms']):>8} ms  errors {result['errors']}")
+
+    if args.update_baseline:
+        baseline = load_baseline(args.baseline, missing_ok=True)
+        baseline.update({key: current[key] for key in ("recorded_at", "git_commit", "iterations", "scale")})
+        baseline["benchmarks"].update(current["benchmarks"])
+        with open(args.baseline, "w") as f:
+            json.dump(baseline, f, indent=2)
+            f.write("\n")
+        print(f"\nBaseline updated for {len(names)} benchmarks -> {args.baseline}")
+        return 0
+
+    baseline = load_baseline(args.baseline)
+    rows = [compare(name, current["benchmarks"][name], baseline["benchmarks"].get(name), args.alpha, args.threshold) for name in names]
+    report = format_report(rows, current, baseline, args.alpha, args.threshold)
+    print("\n" + report)
+    if args.report:
+        with open(args.report, "w") as f:
+            f.write(report)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"run": current, "comparison": rows}, f, indent=2)
+
+    failed = [row["name"] for row in rows if row["verdict"] in FAILING_VERDICTS]
+    if failed:
+        print(f"Failed: {', '.join(failed)}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,122 @@
+"""Measure database connection churn and latency of the hot read paths.
+
+Runs the products and ai-predictions list queries against a server backed by
+the local database (local_db.py) and reads ``pg_stat_database`` before and
+after to count how many Postgres sessions were opened per request.
+
+These are sessions opened by the local Neon-compatible proxy, which is what
+the app's driver talks to in local mode. They show how each driver setting
+behaves against that proxy; they are not a measurement of connection churn
+behind Neon's production proxy and pooler. Run it once per server
+configuration and compare the two reports:
+
+    # apps/web started with the default HTTP driver
+    python connection_churn.py --label http --output tmp/churn-http.json
+    # apps/web restarted with DATABASE_POOL_SIZE=10
+    python connection_churn.py --label pooled --output tmp/churn-pooled.json
+    python connection_churn.py --compare tmp/churn-http.json tmp/churn-pooled.json
+"""
+import argparse
+import json
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import local_db
+from api_client import BASE_URL, TIMEOUT, auth_headers, get_company_id, get_session
+from perf_stats import summarize
+
+STATS_SQL = "SELECT sessions, numbackends, xact_commit FROM pg_stat_database WHERE datname = current_database()"
+# Each stats read is its own psql session: the "before" probe has ended and is
+# counted in the "after" sessions, and the "after" probe is one of its backends.
+PROBE_SESSIONS = 1
+PROBE_BACKENDS = 1
+
+
+def hot_requests(company_id):
+    return [
+        ("/api/products", {"company_id": company_id}),
+        ("/api/ai-predictions", {"company_id": company_id}),
+        ("/api/ai-predictions", {"company_id": company_id, "type": "market_forecast"}),
+        ("/api/ai-predictions", {"company_id": company_id, "type": "price_trend", "period": "2025"}),
+    ]
+
+
+def db_stats():
+    sessions, backends, commits = (int(v) for v in local_db.query(STATS_SQL)[0])
+    return {"sessions": sessions, "backends": backends, "xact_commit": commits}
+
+
+def measure(total, concurrency):
+    session = get_session()
+    headers = auth_headers({"Accept": "application/json"})
+    requests_ = hot_requests(get_company_id())
+
+    def send(i):
+        path, params = requests_[i % len(requests_)]
+        started = time.perf_counter()
+        response = session.get(f"{BASE_URL}{path}", params=params, headers=headers, timeout=TIMEOUT)
+        return path, (time.perf_counter() - started) * 1000, response.ok
+
+    before = db_stats()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        samples = list(executor.map(send, range(total)))
+    after = db_stats()
+
+    by_path = {}
+    for path, latency, _ in samples:
+        by_path.setdefault(path, []).append(latency)
+    opened = after["sessions"] - before["sessions"] - PROBE_SESSIONS
+    return {
+        "requests": total,
+        "concurrency": concurrency,
+        "errors": sum(1 for _, _, ok in samples if not ok),
+        "proxy_sessions_opened": opened,
+        "proxy_sessions_per_request": round(opened / total, 3),
+        "proxy_backends_after": after["backends"] - PROBE_BACKENDS,
+        "latency": summarize([latency for _, latency, _ in samples]),
+        "latency_by_path": {path: summarize(values) for path, values in by_path.items()},
+    }
+
+
+def compare(before_path, after_path):
+    with open(before_path) as f:
+        before = json.load(f)
+    with open(after_path) as f:
+        after = json.load(f)
+    print("Postgres sessions opened by the local Neon proxy, not production figures")
+    print(f"{'metric':<24} {before['label']:>12} {after['label']:>12}")
+    rows = [
+        ("proxy sessions/request", before["proxy_sessions_per_request"], after["proxy_sessions_per_request"]),
+        ("proxy backends after", before["proxy_backends_after"], after["proxy_backends_after"]),
+        ("errors", before["errors"], after["errors"]),
+    ]
+    for key in ("mean_ms", "p50_ms", "p95_ms", "p99_ms"):
+        rows.append((f"latency {key}", before["latency"][key], after["latency"][key]))
+    for name, a, b in rows:
+        print(f"{name:<24} {a:>12} {b:>12}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--label", default="run", help="Name of the server configuration being measured")
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--output", help="Write the JSON report to this path")
+    parser.add_argument("--compare", nargs=2, metavar=("BEFORE", "AFTER"), help="Compare two saved reports")
+    args = parser.parse_args(argv)
+
+    if args.compare:
+        compare(*args.compare)
+        return 0
+
+    report = {"label": args.label, **measure(args.requests, args.concurrency)}
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
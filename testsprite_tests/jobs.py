@@ -0,0 +1,84 @@
+"""Client helpers for the async mode of the AI-backed POST endpoints.
+
+``submit`` sends a POST with ``Prefer: respond-async`` and returns the queued
+job; ``wait`` polls ``/api/jobs/<id>`` until it finishes and ``stream`` follows
+its server-sent status events instead. ``run`` submits and waits in one call,
+so a test can exercise an endpoint without holding a request open for the
+whole generation.
+"""
+import json
+import time
+
+from api_client import TIMEOUT, auth_headers, get_session, url
+
+TERMINAL_STATUSES = {"succeeded", "failed", "cancelled"}
+
+
+class JobFailed(Exception):
+    def __init__(self, job):
+        super().__init__(f"Job {job['id']} {job['status']}: {job.get('error')}")
+        self.job = job
+
+
+def submit(path, payload):
+    """POST ``payload`` to ``path`` in async mode and return the queued job."""
+    response = get_session().post(
+        url(path),
+        json=payload,
+        headers=auth_headers({"Content-Type": "application/json", "Prefer": "respond-async"}),
+        timeout=TIMEOUT,
+    )
+    assert response.status_code == 202, f"Expected 202 from async {path}, got {response.status_code}"
+    job = response.json()["job"]
+    assert response.headers.get("Location") == f"/api/jobs/{job['id']}", "Missing job Location header"
+    return job
+
+
+def get(job_id):
+    response = get_session().get(url(f"/api/jobs/{job_id}"), headers=auth_headers(), timeout=TIMEOUT)
+    assert response.status_code == 200, f"Expected 200 for job {job_id}, got {response.status_code}"
+    return response.json()["job"]
+
+
+def cancel(job_id):
+    """Cancel a job; returns the response so callers can check 200 vs 409."""
+    return get_session().delete(url(f"/api/jobs/{job_id}"), headers=auth_headers(), timeout=TIMEOUT)
+
+
+def wait(job_id, timeout=120, poll_interval=0.25):
+    """Poll until the job reaches a terminal status and return it."""
+    deadline = time.monotonic() + timeout
+    while True:
+        job = get(job_id)
+        if job["status"] in TERMINAL_STATUSES:
+            return job
+        if time.monotonic() >= deadline:
+            raise TimeoutError(f"Job {job_id} still {job['status']} after {timeout}s")
+        time.sleep(poll_interval)
+
+
+def stream(job_id, timeout=120):
+    """Yield job states from the server-sent event stream until it closes."""
+    response = get_session().get(
+        url(f"/api/jobs/{job_id}"),
+        headers=auth_headers({"Accept": "text/event-stream"}),
+        stream=True,
+        timeout=(TIMEOUT, timeout),
+    )
+    assert response.status_code == 200, f"Expected 200 for job stream {job_id}, got {response.status_code}"
+    with response:
+        data = []
+        for line in response.iter_lines(decode_unicode=True):
+            if line.startswith("data:"):
+                data.append(line[5:].strip())
+            elif not line and data:
+                yield json.loads("\n".join(data))
+                data = []
+
+
+def run(path, payload, timeout=120):
+    """Submit a job and return its result body, raising ``JobFailed`` if it does not succeed."""
+    job = wait(submit(path, payload)["id"], timeout=timeout)
+    if job["status"] != "succeeded":
+        raise JobFailed(job)
+    return job["result"]
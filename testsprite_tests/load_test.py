@@ -0,0 +1,224 @@
+"""Replay the backend test plan as HTTP traffic and report latency per endpoint.
+
+The request shapes come from the TC scripts (the product payload of TC002, the
+``type``/``period`` matrix of TC004, ...) and are selected by the case ids in
+``testsprite_backend_test_plan.json``. Traffic is generated from an asyncio
+client either closed-loop at a fixed concurrency or open-loop at a target
+request rate. ``--ramp`` runs a series of concurrency stages back to back,
+which is the quickest way to find where the Neon-backed routes start to fail.
+
+Usage:
+    python load_test.py --concurrency 16 --duration 30
+    python load_test.py --rate 50 --duration 60 --cases TC003,TC004
+    python load_test.py --ramp 1,2,4,8,16,32,64 --duration 15 --output tmp/load.json
+
+Requires ``aiohttp`` in addition to ``requests``.
+"""
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import sys
+import time
+import uuid
+from urllib.parse import urlsplit
+
+import aiohttp
+
+from api_client import BASE_URL, TIMEOUT, get_auth, get_company_id
+from perf_stats import percentile
+
+TEST_PLAN = os.path.join(os.path.dirname(os.path.abspath(__file__)), "testsprite_backend_test_plan.json")
+
+PREDICTION_TYPES = ["market_forecast", "price_trend", "demand_prediction"]
+PERIODS = ["Q1-2025", "2025"]
+
+
+def _product_payload(company_id):
+    return {
+        "company_id": company_id,
+        "product_name": f"Load Test Product {uuid.uuid4()}",
+        "hs_code": "84713000",
+        "category": "Electronics",
+        "material": "Plastic and Metal",
+        "technical_specs": "Specs details here",
+        "unit_price": 199.99,
+        "currency": "USD",
+        "description": "This is a test product created during load testing.",
+    }
+
+
+def _prediction_payload(company_id):
+    return {
+        "company_id": company_id,
+        "prediction_type": "market_forecast",
+        "period": "2025-Q4",
+        "target_market": "North America",
+        "product_category": "Electronics",
+        "hs_code": "854239",
+        "market_data": {"previous_prices": [100, 105, 110], "market_conditions": "stable"},
+    }
+
+
+def build_scenarios(company_id, user_id, include_writes=False):
+    """Map each test plan case id to the list of requests it replays.
+
+    A request is ``(method, path, params, json_body_factory)``. Write cases are
+    only included on request because they create rows (and AI generations).
+    """
+    scenarios = {
+        "TC003": [("GET", "/api/products", {"company_id": company_id}, None)],
+        "TC004": [
+            ("GET", "/api/ai-predictions", {"company_id": user_id, "type": t, "period": p}, None)
+            for t, p in itertools.product(PREDICTION_TYPES, PERIODS)
+        ],
+        "TC006": [("GET", "/api/market-reports", {"company_id": user_id}, None)],
+        "TC007": [("GET", "/api/target-markets", {"company_id": company_id}, None)],
+        "TC008": [("GET", "/api/risk-assessment", {"company_id": company_id}, None)],
+        "TC009": [("GET", "/api/price-optimization", {"company_id": company_id}, None)],
+        "TC010": [("GET", "/api/trend-detection", {"company_id": company_id}, None)],
+    }
+    if include_writes:
+        scenarios["TC002"] = [("POST", "/api/products", None, lambda: _product_payload(company_id))]
+        scenarios["TC005"] = [("POST", "/api/ai-predictions", None, lambda: _prediction_payload(company_id))]
+    return scenarios
+
+
+def load_plan_ids():
+    with open(TEST_PLAN) as f:
+        return [case["id"] for case in json.load(f)]
+
+
+class Stats:
+    def __init__(self):
+        self.samples = {}
+
+    def record(self, endpoint, latency_ms, ok):
+        self.samples.setdefault(endpoint, []).append((latency_ms, ok))
+
+    def summary(self, elapsed_s):
+        report = {}
+        for endpoint, samples in sorted(self.samples.items()):
+            latencies = sorted(ms for ms, _ in samples)
+            errors = sum(1 for _, ok in samples if not ok)
+            report[endpoint] = {
+                "requests": len(samples),
+                "throughput_rps": round(len(samples) / elapsed_s, 2) if elapsed_s else None,
+                "error_rate": round(errors / len(samples), 4),
+                "p50_ms": percentile(latencies, 50),
+                "p95_ms": percentile(latencies, 95),
+                "p99_ms": percentile(latencies, 99),
+            }
+        return report
+
+
+async def _send(session, headers, request, stats):
+    method, path, params, body_factory = request
+    endpoint = f"{method} {urlsplit(path).path}"
+    started = time.perf_counter()
+    ok = False
+    try:
+        async with session.request(
+            method,
+            f"{BASE_URL}{path}",
+            params=params,
+            json=body_factory() if body_factory else None,
+            headers=headers,
+        ) as response:
+            await response.read()
+            ok = response.status < 400
+    except (aiohttp.ClientError, asyncio.TimeoutError):
+        ok = False
+    stats.record(endpoint, round((time.perf_counter() - started) * 1000, 2), ok)
+
+
+async def run_stage(requests_cycle, headers, duration, concurrency=None, rate=None):
+    """Run one load stage and return ``(stats, elapsed_seconds)``."""
+    stats = Stats()
+    timeout = aiohttp.ClientTimeout(total=TIMEOUT)
+    limit = concurrency or max(1, int(rate * 2))
+    connector = aiohttp.TCPConnector(limit=limit)
+    deadline = time.perf_counter() + duration
+    started = time.perf_counter()
+
+    async with aiohttp.ClientSession(timeout=timeout, connector=connector) as session:
+        if rate:
+            # Open loop: issue requests on a fixed schedule regardless of latency,
+            # bounded by the connector limit so an overloaded server queues client-side.
+            interval = 1.0 / rate
+            tasks = set()
+            next_at = time.perf_counter()
+            while next_at < deadline:
+                task = asyncio.create_task(_send(session, headers, next(requests_cycle), stats))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+                next_at += interval
+                await asyncio.sleep(max(0.0, next_at - time.perf_counter()))
+            if tasks:
+                await asyncio.gather(*tasks)
+        else:
+            async def worker():
+                while time.perf_counter() < deadline:
+                    await _send(session, headers, next(requests_cycle), stats)
+
+            await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+    return stats, time.perf_counter() - started
+
+
+def print_report(label, report):
+    print(f"\n== {label}")
+    print(f"{'endpoint':<32} {'req':>6} {'rps':>8} {'err%':>6} {'p50':>9} {'p95':>9} {'p99':>9}")
+    for endpoint, row in report.items():
+        print(
+            f"{endpoint:<32} {row['requests']:>6} {row['throughput_rps']:>8} "
+            f"{row['error_rate'] * 100:>5.1f}% {row['p50_ms']:>9} {row['p95_ms']:>9} {row['p99_ms']:>9}"
+        )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--concurrency", type=int, help="Closed loop with N concurrent clients")
+    mode.add_argument("--rate", type=float, help="Open loop at R requests per second")
+    mode.add_argument("--ramp", help="Comma separated concurrency stages, e.g. 1,2,4,8,16")
+    parser.add_argument("--duration", type=float, default=30, help="Seconds per stage")
+    parser.add_argument("--cases", help="Comma separated test plan ids to replay (default: all that apply)")
+    parser.add_argument("--include-writes", action="store_true", help="Also replay POST cases (TC002, TC005)")
+    parser.add_argument("--output", help="Write the JSON report to this path")
+    args = parser.parse_args(argv)
+
+    jwt_token, user = get_auth()
+    scenarios = build_scenarios(get_company_id(), user["id"], args.include_writes)
+    wanted = args.cases.upper().split(",") if args.cases else load_plan_ids()
+    selected = [request for case_id in wanted for request in scenarios.get(case_id, [])]
+    if not selected:
+        print("No replayable cases selected", file=sys.stderr)
+        return 2
+
+    headers = {"Authorization": f"Bearer {jwt_token}", "Accept": "application/json"}
+    if args.ramp:
+        stages = [("concurrency", int(c)) for c in args.ramp.split(",")]
+    elif args.rate:
+        stages = [("rate", args.rate)]
+    else:
+        stages = [("concurrency", args.concurrency or 8)]
+
+    results = []
+    for kind, value in stages:
+        stats, elapsed = asyncio.run(
+            run_stage(itertools.cycle(selected), headers, args.duration, **{kind: value})
+        )
+        report = stats.summary(elapsed)
+        print_report(f"{kind}={value} ({elapsed:.1f}s)", report)
+        results.append({kind: value, "elapsed_s": round(elapsed, 2), "endpoints": report})
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
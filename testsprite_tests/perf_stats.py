@@ -0,0 +1,55 @@
+"""Small latency statistics helpers shared by the perf scripts."""
+import math
+import statistics
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def summarize(latencies_ms):
+    """Return count, mean and p50/p95/p99 for a list of latencies in milliseconds."""
+    values = sorted(latencies_ms)
+    return {
+        "count": len(values),
+        "mean_ms": round(statistics.fmean(values), 2) if values else None,
+        "p50_ms": percentile(values, 50),
+        "p95_ms": percentile(values, 95),
+        "p99_ms": percentile(values, 99),
+    }
+
+
+def mann_whitney_u(a, b):
+    """Two-sided Mann-Whitney U test of ``a`` against ``b``.
+
+    Uses the normal approximation with tie and continuity corrections, which is
+    accurate enough from about 20 samples per side. Returns ``(u, p_value)``
+    where ``u`` counts the pairs in which a value of ``a`` is the larger one.
+    """
+    n1, n2 = len(a), len(b)
+    if not n1 or not n2:
+        return None, 1.0
+    combined = sorted([(value, 0) for value in a] + [(value, 1) for value in b])
+    rank_sum = 0.0
+    tie_term = 0
+    i = 0
+    while i < len(combined):
+        j = i
+        while j + 1 < len(combined) and combined[j + 1][0] == combined[i][0]:
+            j += 1
+        rank = (i + j) / 2 + 1
+        rank_sum += rank * sum(1 for _, group in combined[i:j + 1] if group == 0)
+        ties = j - i + 1
+        tie_term += ties ** 3 - ties
+        i = j + 1
+    u = rank_sum - n1 * (n1 + 1) / 2
+    n = n1 + n2
+    sigma = math.sqrt(n1 * n2 / 12 * ((n + 1) - tie_term / (n * (n - 1))))
+    if sigma == 0:
+        return u, 1.0
+    z = max(0.0, abs(u - n1 * n2 / 2) - 0.5) / sigma
+    return u, min(1.0, math.erfc(z / math.sqrt(2)))
@@ -0,0 +1,148 @@
+"""Client for the bulk product import/export endpoints.
+
+``/api/products/bulk`` takes a streamed NDJSON or CSV body and returns a
+summary with per-line errors; ``/api/products/export`` streams a company's
+catalogue back. Both directions are streamed, so catalogues of any size can be
+moved without holding them in memory on either side.
+
+Usage:
+    python products_bulk.py import catalogue.csv [--company-id ID]
+    python products_bulk.py export out.ndjson [--format ndjson|csv] [--company-id ID]
+"""
+import argparse
+import csv
+import io
+import json
+import sys
+
+from api_client import TIMEOUT, auth_headers, get_company_id, get_session, url
+
+IMPORT_COLUMNS = [
+    "product_name",
+    "hs_code",
+    "category",
+    "material",
+    "technical_specs",
+    "unit_price",
+    "currency",
+    "description",
+    "image_url",
+    "min_order_quantity",
+    "production_capacity",
+    "certifications",
+]
+CHUNK_ROWS = 1000
+CONTENT_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+
+def ndjson_chunks(rows, chunk_rows=CHUNK_ROWS):
+    """Encode rows as NDJSON, ``chunk_rows`` lines per chunk."""
+    lines = []
+    for row in rows:
+        lines.append(json.dumps(row))
+        if len(lines) >= chunk_rows:
+            yield ("\n".join(lines) + "\n").encode()
+            lines = []
+    if lines:
+        yield ("\n".join(lines) + "\n").encode()
+
+
+def csv_chunks(rows, chunk_rows=CHUNK_ROWS):
+    """Encode rows as CSV with an ``IMPORT_COLUMNS`` header; lists are joined with ``;``."""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=IMPORT_COLUMNS, extrasaction="ignore")
+    writer.writeheader()
+    for i, row in enumerate(rows, 1):
+        if isinstance(row.get("certifications"), list):
+            row = dict(row, certifications=";".join(row["certifications"]))
+        writer.writerow(row)
+        if i % chunk_rows == 0:
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+    if buffer.getvalue():
+        yield buffer.getvalue().encode()
+
+
+def import_products(rows, company_id=None, fmt="ndjson", timeout=None):
+    """Stream ``rows`` (an iterable of dicts) to the bulk endpoint and return the response."""
+    company_id = company_id or get_company_id()
+    chunks = csv_chunks(rows) if fmt == "csv" else ndjson_chunks(rows)
+    return get_session().post(
+        url("/api/products/bulk"),
+        params={"company_id": company_id},
+        data=chunks,
+        headers=auth_headers({"Content-Type": CONTENT_TYPES[fmt]}),
+        timeout=timeout or TIMEOUT * 20,
+    )
+
+
+def import_file(path, company_id=None):
+    """Upload an NDJSON or CSV file (chosen by extension) without reading it into memory."""
+    fmt = "csv" if path.endswith(".csv") else "ndjson"
+    company_id = company_id or get_company_id()
+    with open(path, "rb") as f:
+        return get_session().post(
+            url("/api/products/bulk"),
+            params={"company_id": company_id},
+            data=iter(lambda: f.read(64 * 1024), b""),
+            headers=auth_headers({"Content-Type": CONTENT_TYPES[fmt]}),
+            timeout=TIMEOUT * 20,
+        )
+
+
+def export_products(company_id=None, fmt="ndjson"):
+    """Yield exported rows as dicts, reading the response as it streams in."""
+    company_id = company_id or get_company_id()
+    response = get_session().get(
+        url("/api/products/export"),
+        params={"company_id": company_id, "format": fmt},
+        headers=auth_headers(),
+        stream=True,
+        timeout=TIMEOUT,
+    )
+    assert response.status_code == 200, f"Expected 200 on product export, got {response.status_code}"
+    with response:
+        if fmt == "csv":
+            # Read the raw stream so quoted cells may contain newlines.
+            response.raw.decode_content = True
+            yield from csv.DictReader(io.TextIOWrapper(response.raw, encoding="utf-8", newline=""))
+        else:
+            for line in response.iter_lines(decode_unicode=True):
+                if line:
+                    yield json.loads(line)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("command", choices=["import", "export"])
+    parser.add_argument("path")
+    parser.add_argument("--company-id")
+    parser.add_argument("--format", choices=["ndjson", "csv"], default="ndjson", help="Export format")
+    args = parser.parse_args(argv)
+
+    if args.command == "import":
+        response = import_file(args.path, args.company_id)
+        print(json.dumps(response.json(), indent=2))
+        return 0 if response.ok else 1
+
+    count = 0
+    with open(args.path, "w", newline="") as f:
+        if args.format == "csv":
+            writer = None
+            for row in export_products(args.company_id, "csv"):
+                writer = writer or csv.DictWriter(f, fieldnames=list(row))
+                if count == 0:
+                    writer.writeheader()
+                writer.writerow(row)
+                count += 1
+        else:
+            for row in export_products(args.company_id):
+                f.write(json.dumps(row) + "\n")
+                count += 1
+    print(f"Exported {count} products to {args.path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,125 @@
+"""Compare catalogue import throughput: one POST /api/products per row versus
+the streamed /api/products/bulk endpoint, plus streamed export throughput.
+
+The per-row path is sampled on a smaller number of rows and extrapolated to
+the bulk row count, since inserting 50k rows one request at a time is exactly
+what this benchmark exists to avoid.
+
+    python products_bulk_benchmark.py --rows 50000 --single-sample 200
+"""
+import argparse
+import json
+import sys
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from api_client import TIMEOUT, auth_headers, get_company_id, get_session, url
+from perf_stats import summarize
+from products_bulk import export_products, import_products
+
+
+def synthetic_products(count, run_id):
+    for i in range(count):
+        yield {
+            "product_name": f"Bench {run_id} #{i}",
+            "hs_code": f"8471{i % 100:02d}00",
+            "category": "Electronics",
+            "material": "Aluminium",
+            "technical_specs": "Benchmark row",
+            "unit_price": round(10 + (i % 500) * 0.37, 2),
+            "currency": "USD",
+            "description": "Generated by products_bulk_benchmark.py",
+            "min_order_quantity": 10 + i % 90,
+            "certifications": ["CE", "ISO 9001"],
+        }
+
+
+def bench_single(rows, company_id, concurrency):
+    session = get_session()
+    headers = auth_headers({"Content-Type": "application/json"})
+
+    def post(row):
+        started = time.perf_counter()
+        response = session.post(url("/api/products"), json=dict(row, company_id=company_id), headers=headers, timeout=TIMEOUT)
+        return (time.perf_counter() - started) * 1000, response.ok
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        samples = list(executor.map(post, rows))
+    elapsed = time.perf_counter() - started
+    return {
+        "rows": len(rows),
+        "concurrency": concurrency,
+        "seconds": round(elapsed, 3),
+        "rows_per_second": round(len(rows) / elapsed, 1),
+        "errors": sum(1 for _, ok in samples if not ok),
+        "latency": summarize([latency for latency, _ in samples]),
+    }
+
+
+def bench_bulk(count, company_id, fmt, run_id):
+    started = time.perf_counter()
+    response = import_products(synthetic_products(count, run_id), company_id, fmt=fmt)
+    elapsed = time.perf_counter() - started
+    assert response.status_code == 200, f"Bulk import failed with status {response.status_code}: {response.text[:200]}"
+    summary = response.json()
+    return {
+        "rows": count,
+        "format": fmt,
+        "seconds": round(elapsed, 3),
+        "rows_per_second": round(summary["inserted"] / elapsed, 1),
+        "inserted": summary["inserted"],
+        "failed": summary["failed"],
+    }
+
+
+def bench_export(company_id, fmt):
+    started = time.perf_counter()
+    first_row_ms = None
+    count = 0
+    for _ in export_products(company_id, fmt):
+        if first_row_ms is None:
+            first_row_ms = round((time.perf_counter() - started) * 1000, 1)
+        count += 1
+    elapsed = time.perf_counter() - started
+    return {
+        "rows": count,
+        "format": fmt,
+        "seconds": round(elapsed, 3),
+        "rows_per_second": round(count / elapsed, 1),
+        "time_to_first_row_ms": first_row_ms,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=50000, help="Rows sent through the bulk endpoint")
+    parser.add_argument("--single-sample", type=int, default=200, help="Rows sent one POST at a time")
+    parser.add_argument("--concurrency", type=int, default=4, help="Parallel requests for the per-row path")
+    parser.add_argument("--format", choices=["ndjson", "csv"], default="ndjson")
+    parser.add_argument("--company-id")
+    parser.add_argument("--output", help="Write the JSON report to this path")
+    args = parser.parse_args(argv)
+
+    company_id = args.company_id or get_company_id()
+    run_id = uuid.uuid4().hex[:8]
+
+    single = bench_single(list(synthetic_products(args.single_sample, f"{run_id}-single")), company_id, args.concurrency)
+    bulk = bench_bulk(args.rows, company_id, args.format, run_id)
+    export = bench_export(company_id, args.format)
+    report = {
+        "single": dict(single, projected_seconds_for_bulk_rows=round(args.rows / single["rows_per_second"], 1)),
+        "bulk": bulk,
+        "export": export,
+        "speedup": round(bulk["rows_per_second"] / single["rows_per_second"], 1),
+    }
+    print(json.dumps(report, indent=2))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,186 @@
+"""Run the TC0xx scripts concurrently and write a timing-annotated results file.
+
+Each TC script calls its test function at import time, so a case is executed by
+running the file's source in a fresh namespace. Cases share the pooled session
+and cached credentials from ``api_client`` and run concurrently, so a sweep
+takes about as long as the slowest case rather than the sum of all of them.
+
+Cases that change or measure server-wide state (the AI stub's delay, responses
+and call counters, the /api/metrics histograms, admission queues) declare
+``SERIAL = True`` at module level. They run one at a time after the concurrent
+cases have finished, so no other case runs alongside them.
+
+Every recorded request keeps the phases from its ``Server-Timing`` header
+(db, ai, json, total), and each result sums them so a failure or a slow case
+shows where the server spent its time. Recording follows the case's thread;
+cases that start their own threads use ``api_client.thread_pool()`` or
+``api_client.recorded()`` so those requests are counted too.
+
+Usage:
+    python run_tests.py [--workers N] [--processes] [--output PATH] [TC002 TC004 ...]
+"""
+import argparse
+import glob
+import json
+import os
+import re
+import sys
+import time
+import traceback
+import uuid
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from datetime import datetime, timezone
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+if HERE not in sys.path:
+    sys.path.insert(0, HERE)
+
+import api_client  # noqa: E402
+
+TEST_PLAN = os.path.join(HERE, "testsprite_backend_test_plan.json")
+DEFAULT_OUTPUT = os.path.join(HERE, "tmp", "local_test_results.json")
+SERIAL_MARKER = re.compile(r"^SERIAL = True\b", re.MULTILINE)
+
+
+def discover(selected=None):
+    paths = sorted(glob.glob(os.path.join(HERE, "TC[0-9][0-9][0-9]_*.py")))
+    if selected:
+        wanted = {s.upper() for s in selected}
+        paths = [p for p in paths if os.path.basename(p).split("_", 1)[0] in wanted]
+    return paths
+
+
+def is_serial(path):
+    with open(path) as f:
+        return bool(SERIAL_MARKER.search(f.read()))
+
+
+def load_plan():
+    try:
+        with open(TEST_PLAN) as f:
+            return {case["id"]: case for case in json.load(f)}
+    except (OSError, ValueError):
+        return {}
+
+
+def _now():
+    return datetime.now(timezone.utc).isoformat(timespec="milliseconds").replace("+00:00", "Z")
+
+
+def run_case(path):
+    """Execute one TC script and return its status, error, wall time and request log."""
+    with open(path) as f:
+        code = f.read()
+    created = _now()
+    api_client.start_recording()
+    started = time.perf_counter()
+    error = None
+    try:
+        exec(compile(code, path, "exec"), {"__name__": "__main__", "__file__": path})
+    except BaseException:
+        error = traceback.format_exc()
+    wall_time_ms = round((time.perf_counter() - started) * 1000, 2)
+    return {
+        "path": path,
+        "code": code,
+        "testStatus": "FAILED" if error else "PASSED",
+        "testError": error or "",
+        "created": created,
+        "modified": _now(),
+        "wallTimeMs": wall_time_ms,
+        "requests": api_client.stop_recording(),
+    }
+
+
+def phase_totals(requests):
+    """Sum each Server-Timing phase over a case's requests."""
+    totals = {}
+    for r in requests:
+        for phase, ms in r.get("serverTiming", {}).items():
+            totals[phase] = round(totals.get(phase, 0) + ms, 2)
+    return totals
+
+
+def format_phases(totals):
+    return ", ".join(f"{phase} {ms:.1f} ms" for phase, ms in totals.items())
+
+
+def to_result(outcome, plan):
+    name = os.path.splitext(os.path.basename(outcome["path"]))[0]
+    test_id, _, slug = name.partition("_")
+    case = plan.get(test_id, {})
+    latencies = [r["latencyMs"] for r in outcome["requests"]]
+    return {
+        "projectId": None,
+        "testId": str(uuid.uuid4()),
+        "userId": None,
+        "title": f"{test_id}-{case.get('title', slug.replace('_', ' '))}",
+        "description": case.get("description", ""),
+        "code": outcome["code"],
+        "testStatus": outcome["testStatus"],
+        "testError": outcome["testError"],
+        "testType": "BACKEND",
+        "createFrom": "local",
+        "created": outcome["created"],
+        "modified": outcome["modified"],
+        "wallTimeMs": outcome["wallTimeMs"],
+        "requestCount": len(latencies),
+        "totalRequestLatencyMs": round(sum(latencies), 2),
+        "serverTimingMs": phase_totals(outcome["requests"]),
+        "requests": outcome["requests"],
+    }
+
+
+def run(paths, workers, use_processes=False):
+    """Run the independent cases concurrently, then the serial ones one by one."""
+    serial = [path for path in paths if is_serial(path)]
+    independent = [path for path in paths if path not in serial]
+    executor_cls = ProcessPoolExecutor if use_processes else ThreadPoolExecutor
+    outcomes = []
+    if independent:
+        with executor_cls(max_workers=workers) as executor:
+            futures = [executor.submit(run_case, path) for path in independent]
+            for future in as_completed(futures):
+                outcomes.append(future.result())
+    outcomes.extend(run_case(path) for path in serial)
+    outcomes.sort(key=lambda o: o["path"])
+    return outcomes
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("tests", nargs="*", help="Test ids to run (e.g. TC002); defaults to all")
+    parser.add_argument("--workers", type=int, default=None, help="Concurrent workers (default: one per independent test)")
+    parser.add_argument("--processes", action="store_true", help="Use a process pool instead of threads")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="Results file path")
+    args = parser.parse_args(argv)
+
+    paths = discover(args.tests)
+    if not paths:
+        print("No TC files matched", file=sys.stderr)
+        return 2
+
+    workers = max(1, args.workers or sum(not is_serial(path) for path in paths))
+    started = time.perf_counter()
+    outcomes = run(paths, workers, args.processes)
+    sweep_ms = round((time.perf_counter() - started) * 1000, 2)
+
+    plan = load_plan()
+    results = [to_result(o, plan) for o in outcomes]
+    os.makedirs(os.path.dirname(os.path.abspath(args.output)), exist_ok=True)
+    with open(args.output, "w") as f:
+        json.dump(results, f, indent=2)
+
+    for r in results:
+        print(f"{r['testStatus']:<7} {r['wallTimeMs']:>10.1f} ms  {r['requestCount']:>3} req  {r['title']}")
+        if r["serverTimingMs"]:
+            print(f"{'':<27}server: {format_phases(r['serverTimingMs'])}")
+    serial_ms = sum(r["wallTimeMs"] for r in results)
+    failed = sum(r["testStatus"] == "FAILED" for r in results)
+    print(f"\n{len(results)} tests, {failed} failed, {workers} workers")
+    print(f"sweep {sweep_ms:.1f} ms (sum of cases {serial_ms:.1f} ms) -> {args.output}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
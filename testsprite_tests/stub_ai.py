@@ -0,0 +1,179 @@
+"""Local stand-in for the ``/integrations/chat-gpt/conversationgpt4`` endpoint.
+
+The API routes send their prompts to ``$NEXT_PUBLIC_CREATE_BASE_URL/integrations/...``.
+Starting apps/web with ``NEXT_PUBLIC_CREATE_BASE_URL=http://localhost:8787``
+points them at this stub, which answers every request with a value built from
+the request's ``json_schema`` after an artificial delay, and counts the calls
+so tests can tell cache hits from fresh generations. Tests can also pin the
+content returned for a schema name (``configure(responses={...})``) or make
+the next calls fail with a 500 (``configure(fail_next=n)``).
+
+Usage:
+    python stub_ai.py [--port 8787] [--delay 1.5]
+"""
+import argparse
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+STUB_PORT = int(os.environ.get("AI_STUB_PORT", "8787"))
+STUB_URL = os.environ.get("AI_STUB_URL", f"http://localhost:{STUB_PORT}")
+STUB_DELAY = float(os.environ.get("AI_STUB_DELAY", "1.0"))
+INTEGRATION_PATH = "/integrations/chat-gpt/conversationgpt4"
+
+
+def sample_from_schema(schema):
+    """Build a minimal value that satisfies a JSON schema."""
+    kind = schema.get("type")
+    if kind == "object":
+        return {key: sample_from_schema(sub) for key, sub in schema.get("properties", {}).items()}
+    if kind == "array":
+        return [sample_from_schema(schema.get("items", {})) for _ in range(2)]
+    if kind in ("number", "integer"):
+        return 50
+    if kind == "boolean":
+        return True
+    return "stub"
+
+
+class StubState:
+    def __init__(self, delay):
+        self.delay = delay
+        self.lock = threading.Lock()
+        self.calls = {}
+        self.responses = {}
+        self.fail_next = 0
+
+    def record(self, name):
+        with self.lock:
+            self.calls[name] = self.calls.get(name, 0) + 1
+
+    def snapshot(self):
+        with self.lock:
+            return {
+                "calls": dict(self.calls),
+                "total": sum(self.calls.values()),
+                "delay": self.delay,
+                "responses": sorted(self.responses),
+                "fail_next": self.fail_next,
+            }
+
+    def take_failure(self):
+        with self.lock:
+            if self.fail_next > 0:
+                self.fail_next -= 1
+                return True
+            return False
+
+    def update_responses(self, responses):
+        """Pin the content returned per schema name; ``None`` restores the generated sample."""
+        with self.lock:
+            for name, content in responses.items():
+                if content is None:
+                    self.responses.pop(name, None)
+                else:
+                    self.responses[name] = content
+
+
+def _make_handler(state):
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def _send_json(self, status, payload):
+            body = json.dumps(payload).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            if self.path == "/__stats":
+                self._send_json(200, state.snapshot())
+            else:
+                self._send_json(404, {"error": "not found"})
+
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length") or 0)
+            payload = json.loads(self.rfile.read(length) or b"{}")
+            if self.path == "/__config":
+                state.delay = float(payload.get("delay", state.delay))
+                state.update_responses(payload.get("responses") or {})
+                state.fail_next = int(payload.get("fail_next", state.fail_next))
+                self._send_json(200, state.snapshot())
+                return
+            if self.path.split("?")[0] != INTEGRATION_PATH:
+                self._send_json(404, {"error": "not found"})
+                return
+
+            schema = payload.get("json_schema") or {}
+            name = schema.get("name", "unnamed")
+            state.record(name)
+            time.sleep(state.delay)
+            if state.take_failure():
+                self._send_json(500, {"error": "stub failure"})
+                return
+            content = state.responses.get(name)
+            if content is None:
+                content = sample_from_schema(schema.get("schema", {}))
+            self._send_json(200, {"choices": [{"message": {"role": "assistant", "content": json.dumps(content)}}]})
+
+    return Handler
+
+
+_server = None
+_server_lock = threading.Lock()
+
+
+def ensure_stub(port=STUB_PORT, delay=STUB_DELAY):
+    """Start the stub in a background thread unless one already answers on ``STUB_URL``."""
+    global _server
+    with _server_lock:
+        if _server is not None:
+            return _server
+        try:
+            requests.get(f"{STUB_URL}/__stats", timeout=2)
+            return None
+        except requests.RequestException:
+            pass
+        _server = ThreadingHTTPServer(("0.0.0.0", port), _make_handler(StubState(delay)))
+        threading.Thread(target=_server.serve_forever, daemon=True).start()
+        return _server
+
+
+def stats():
+    return requests.get(f"{STUB_URL}/__stats", timeout=5).json()
+
+
+def total_calls():
+    return stats()["total"]
+
+
+def configure(delay=None, responses=None, fail_next=None):
+    """Change the stub's response delay in seconds, pin responses by schema name
+    and/or make the next ``fail_next`` generations fail."""
+    payload = {"responses": responses or {}}
+    if delay is not None:
+        payload["delay"] = delay
+    if fail_next is not None:
+        payload["fail_next"] = fail_next
+    return requests.post(f"{STUB_URL}/__config", json=payload, timeout=5).json()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=STUB_PORT)
+    parser.add_argument("--delay", type=float, default=STUB_DELAY)
+    args = parser.parse_args()
+    server = ThreadingHTTPServer(("0.0.0.0", args.port), _make_handler(StubState(args.delay)))
+    print(f"AI integration stub on http://localhost:{args.port}{INTEGRATION_PATH} (delay {args.delay}s)")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,316 @@
+"""Fill the local database with deterministic synthetic data at a chosen scale.
+
+Rows are generated for ``companies``, ``products``, ``ai_predictions``,
+``market_reports``, ``trade_data`` and ``gtip_codes`` from a seeded RNG, so the
+same ``--seed`` and ``--scale`` always produce the same rows. ``--scale 1`` is a
+small but non-empty dataset; ``--scale 100`` and ``--scale 10000`` multiply every
+table (10000x reaches millions of rows in the larger tables).
+
+HS codes come from the GTIP hierarchy the API serves (utils/gtip-hierarchy.js)
+and are drawn by chapter with weights following Turkey's export mix. Countries
+follow its main trading partners. Rows are spread over companies with a Zipf
+distribution, so the first generated company is the largest tenant. Its id is
+printed at the end; export it as ``TESTSPRITE_COMPANY_ID`` so the TC scripts and
+benchmarks read that company instead of whichever one the API lists first.
+
+Data is streamed into Postgres with ``COPY ... FROM STDIN`` (local_db.copy_in).
+The trade rollup trigger is disabled during the load and the rollups are
+rebuilt once at the end.
+
+Usage:
+    python synthetic_data.py --scale 100 --reset
+    python synthetic_data.py --scale 10000 --seed 7 --tables products,trade_data
+"""
+import argparse
+import bisect
+import itertools
+import json
+import os
+import random
+import re
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import local_db
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+GTIP_HIERARCHY = os.path.join(HERE, "..", "apps", "web", "src", "app", "api", "utils", "gtip-hierarchy.js")
+
+# Rows per table at --scale 1
+BASE_ROWS = {
+    "companies": 10,
+    "gtip_codes": 50,
+    "products": 100,
+    "ai_predictions": 200,
+    "market_reports": 50,
+    "trade_data": 500,
+}
+TABLES = list(BASE_ROWS)
+
+# Timestamps are spread over the two years before this fixed date so the same
+# seed gives the same rows whenever it is run.
+END_DATE = datetime(2025, 6, 30, tzinfo=timezone.utc)
+SPAN_SECONDS = 2 * 365 * 24 * 3600
+TRADE_YEARS = list(range(2019, 2025))
+
+# Relative share of each HS chapter in the generated codes (Turkish exports)
+CHAPTER_WEIGHTS = {
+    "84": 90, "85": 70, "61": 40, "62": 30, "08": 30, "63": 15, "07": 15,
+    "03": 10, "15": 10, "04": 7, "02": 5, "06": 1, "01": 0.5, "05": 0.5, "50": 0.2,
+}
+
+# (country, ISO code, relative weight): Turkey's main trading partners
+COUNTRIES = [
+    ("Germany", "DE", 84), ("United States", "US", 66), ("United Kingdom", "GB", 63),
+    ("Iraq", "IQ", 57), ("Italy", "IT", 54), ("France", "FR", 46), ("Spain", "ES", 44),
+    ("Netherlands", "NL", 34), ("Russia", "RU", 33), ("Israel", "IL", 30),
+    ("United Arab Emirates", "AE", 29), ("Romania", "RO", 28), ("Poland", "PL", 26),
+    ("China", "CN", 24), ("Belgium", "BE", 20), ("Bulgaria", "BG", 18),
+    ("Egypt", "EG", 17), ("Greece", "GR", 16), ("Azerbaijan", "AZ", 14),
+    ("Saudi Arabia", "SA", 12), ("Algeria", "DZ", 11), ("Georgia", "GE", 11),
+    ("Morocco", "MA", 10), ("Libya", "LY", 9), ("Japan", "JP", 5), ("Canada", "CA", 5),
+]
+
+CITIES = ["Istanbul", "Ankara", "Izmir", "Bursa", "Kocaeli", "Gaziantep", "Konya", "Kayseri", "Denizli", "Adana"]
+INDUSTRIES = ["Machinery", "Electronics", "Textiles", "Apparel", "Food", "Agriculture", "Chemicals", "Furniture"]
+MATERIALS = ["Steel", "Aluminium", "Cotton", "Polyester", "Plastic", "Glass", "Wood", "Copper"]
+CERTIFICATIONS = ["CE", "ISO 9001", "ISO 14001", "TSE", "OEKO-TEX", "HACCP", "UL", "RoHS"]
+PREDICTION_TYPES = ["market_forecast", "price_trend", "demand_prediction"]
+PERIODS = ["1_month", "3_months", "6_months", "1_year", "Q1-2025", "Q2-2025", "2025"]
+REPORT_TYPES = ["market_overview", "competitor_analysis", "price_analysis", "demand_forecast"]
+TRENDS = ["rising demand", "price pressure", "new entrants", "consolidation", "e-commerce growth", "nearshoring"]
+TAX_RATES = [0, 0, 2, 4, 6.5, 8, 10, 13, 20]
+
+
+def load_hs_codes(path=GTIP_HIERARCHY):
+    """Return ``(subheadings, chapter_names, heading_names)`` from the GTIP hierarchy module."""
+    with open(path, encoding="utf-8") as f:
+        source = f.read()
+    chapter_names = dict(re.findall(r'name: "(\d{2}) - ([^"]+)"', source))
+    heading_names = dict(re.findall(r'name: "(\d{4}) - ([^"]+)"', source))
+    subheadings = sorted(set(re.findall(r'"(\d{6})"', source)))
+    return subheadings, chapter_names, heading_names
+
+
+class Sampler:
+    """Weighted choice over a fixed population by bisecting cumulative weights."""
+
+    def __init__(self, population, weights):
+        self.population = population
+        self.cumulative = list(itertools.accumulate(weights))
+
+    def __call__(self, rng):
+        return self.population[bisect.bisect(self.cumulative, rng.random() * self.cumulative[-1])]
+
+
+def zipf_weights(n, s=1.0):
+    return [1 / (rank ** s) for rank in range(1, n + 1)]
+
+
+def hs_sampler(subheadings):
+    # Chapters by export share, then a Zipf spread over the codes inside each chapter
+    weights = []
+    rank_in_chapter = {}
+    for code in subheadings:
+        chapter = code[:2]
+        rank_in_chapter[chapter] = rank_in_chapter.get(chapter, 0) + 1
+        weights.append(CHAPTER_WEIGHTS.get(chapter, 0.1) / rank_in_chapter[chapter])
+    return Sampler(subheadings, weights)
+
+
+def row_uuid(rng):
+    return str(uuid.UUID(int=rng.getrandbits(128), version=4))
+
+
+def timestamp(rng):
+    return (END_DATE - timedelta(seconds=rng.randrange(SPAN_SECONDS))).isoformat()
+
+
+def pg_array(values):
+    """Render a Python list as a Postgres array literal for CSV COPY."""
+    return "{" + ",".join('"' + str(v).replace("\\", "\\\\").replace('"', '\\"') + '"' for v in values) + "}"
+
+
+class Generator:
+    def __init__(self, seed, scale):
+        self.seed = seed
+        self.scale = scale
+        self.subheadings, self.chapter_names, self.heading_names = load_hs_codes()
+        self.hs_code = hs_sampler(self.subheadings)
+        self.country = Sampler(COUNTRIES, [weight for _, _, weight in COUNTRIES])
+        self.company_ids = [row_uuid(self.rng("company-ids")) for _ in range(self.rows("companies"))]
+        self.company = Sampler(self.company_ids, zipf_weights(len(self.company_ids)))
+
+    def rng(self, name):
+        # One stream per table, so generating a subset of tables gives the same rows
+        return random.Random(f"{self.seed}:{name}")
+
+    def rows(self, table):
+        return BASE_ROWS[table] * self.scale
+
+    def category(self, code):
+        return self.chapter_names.get(code[:2], f"Chapter {code[:2]}")
+
+    def companies(self):
+        rng = self.rng("companies")
+        columns = ["id", "name", "email", "phone", "country", "city", "industry", "website", "description", "created_at", "updated_at"]
+        def rows():
+            for i, company_id in enumerate(self.company_ids):
+                created = timestamp(rng)
+                yield (
+                    company_id, f"Synthetic Exporter {i}", f"contact{i}@exporter{i}.example", f"+90 212 {i % 10000000:07d}",
+                    "Turkey", rng.choice(CITIES), rng.choice(INDUSTRIES), f"https://exporter{i}.example",
+                    f"Synthetic company {i} generated with seed {self.seed}", created, created,
+                )
+        return columns, rows()
+
+    def gtip_codes(self):
+        rng = self.rng("gtip_codes")
+        columns = ["id", "gtip_code", "description_tr", "description_en", "category", "tax_rate", "created_at"]
+        used = {}
+        def rows():
+            for _ in range(self.rows("gtip_codes")):
+                code = self.hs_code(rng)
+                # National extensions are numbered per subheading, which keeps gtip_code unique
+                n = used[code] = used.get(code, -1) + 1
+                gtip = f"{code[:4]}.{code[4:]}.{n // 10000:02d}.{n // 100 % 100:02d}.{n % 100:02d}"
+                heading = self.heading_names.get(code[:4], self.category(code))
+                yield (
+                    row_uuid(rng), gtip, f"{heading} ({gtip})", None, self.category(code),
+                    rng.choice(TAX_RATES), timestamp(rng),
+                )
+        return columns, rows()
+
+    def products(self):
+        rng = self.rng("products")
+        columns = [
+            "id", "company_id", "product_name", "hs_code", "category", "material", "technical_specs", "unit_price",
+            "currency", "description", "min_order_quantity", "production_capacity", "certifications", "created_at", "updated_at",
+        ]
+        def rows():
+            for i in range(self.rows("products")):
+                code = self.hs_code(rng)
+                material = rng.choice(MATERIALS)
+                created = timestamp(rng)
+                yield (
+                    row_uuid(rng), self.company(rng), f"{material} product {i}", f"{code}00", self.category(code), material,
+                    f"{rng.randint(1, 500)} kg, {rng.randint(10, 300)}x{rng.randint(10, 300)} cm",
+                    round(rng.lognormvariate(3.5, 1.2), 2), "USD",
+                    f"{self.heading_names.get(code[:4], self.category(code))}, made of {material.lower()}",
+                    rng.choice([10, 50, 100, 500, 1000]), f"{rng.randint(1, 500) * 100} units/month",
+                    pg_array(rng.sample(CERTIFICATIONS, rng.randint(0, 3))), created, created,
+                )
+        return columns, rows()
+
+    def ai_predictions(self):
+        rng = self.rng("ai_predictions")
+        columns = [
+            "id", "company_id", "prediction_type", "target_market", "product_category", "hs_code", "period",
+            "confidence_score", "prediction_data", "key_insights", "recommendations", "data_sources", "created_at",
+        ]
+        def rows():
+            for _ in range(self.rows("ai_predictions")):
+                code = self.hs_code(rng)
+                country = self.country(rng)[0]
+                growth = round(rng.gauss(4, 6), 1)
+                yield (
+                    row_uuid(rng), self.company(rng), rng.choice(PREDICTION_TYPES), country, self.category(code), code,
+                    rng.choice(PERIODS), round(rng.uniform(0.5, 0.99), 2),
+                    json.dumps({"growth_rate": growth, "market_size": round(rng.lognormvariate(16, 1.5)), "risk_factors": rng.sample(TRENDS, 2)}),
+                    pg_array([f"Demand in {country} is {'growing' if growth > 0 else 'shrinking'}"]),
+                    pg_array([f"Review pricing for {code}"]), "synthetic", timestamp(rng),
+                )
+        return columns, rows()
+
+    def market_reports(self):
+        rng = self.rng("market_reports")
+        columns = [
+            "id", "company_id", "market_name", "country_code", "report_type", "report_period", "report_data",
+            "trade_volume", "growth_rate", "key_competitors", "market_trends", "created_at",
+        ]
+        def rows():
+            for _ in range(self.rows("market_reports")):
+                country, iso, _ = self.country(rng)
+                code = self.hs_code(rng)
+                yield (
+                    row_uuid(rng), self.company(rng), f"{country} {self.category(code)}", iso, rng.choice(REPORT_TYPES),
+                    rng.choice(PERIODS), json.dumps({"hs_code": code, "importers": rng.randint(5, 500)}),
+                    round(rng.lognormvariate(15, 2), 2), round(max(-99, min(99, rng.gauss(3, 8))), 2),
+                    pg_array([f"Competitor {rng.randint(1, 50)}" for _ in range(3)]), pg_array(rng.sample(TRENDS, 2)),
+                    timestamp(rng),
+                )
+        return columns, rows()
+
+    def trade_data(self):
+        rng = self.rng("trade_data")
+        columns = [
+            "id", "hs_code", "country", "year", "product_category", "import_value", "export_value", "import_volume",
+            "growth_rate", "created_at",
+        ]
+        def rows():
+            for _ in range(self.rows("trade_data")):
+                code = self.hs_code(rng)
+                import_value = rng.lognormvariate(13, 2)
+                yield (
+                    row_uuid(rng), code, self.country(rng)[0], rng.choice(TRADE_YEARS), self.category(code),
+                    round(import_value, 2), round(rng.lognormvariate(12.5, 2), 2),
+                    round(import_value / rng.lognormvariate(1.5, 0.8), 2), round(rng.gauss(3, 12), 2), timestamp(rng),
+                )
+        return columns, rows()
+
+
+def load(generator, tables):
+    """COPY the selected tables in dependency order and return ``{table: (rows, seconds)}``."""
+    timings = {}
+    if "trade_data" in tables:
+        local_db.psql("ALTER TABLE trade_data DISABLE TRIGGER maintain_trade_data_rollups;")
+    try:
+        for table in TABLES:
+            if table not in tables:
+                continue
+            started = time.perf_counter()
+            columns, rows = getattr(generator, table)()
+            count = local_db.copy_in(table, columns, rows)
+            timings[table] = (count, time.perf_counter() - started)
+            print(f"{table:<16} {count:>10} rows  {timings[table][1]:>8.1f} s", flush=True)
+    finally:
+        if "trade_data" in tables:
+            local_db.psql("ALTER TABLE trade_data ENABLE TRIGGER maintain_trade_data_rollups;")
+    if "trade_data" in tables:
+        local_db.psql("SELECT refresh_trade_data_rollups();")
+    local_db.psql("ANALYZE;")
+    return timings
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", type=int, default=1, help="Multiplier on the base row counts (e.g. 1, 100, 10000)")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--tables", help=f"Comma separated subset of {','.join(TABLES)}")
+    parser.add_argument("--reset", action="store_true", help="Wipe and re-seed the schema before loading")
+    args = parser.parse_args(argv)
+
+    tables = args.tables.split(",") if args.tables else TABLES
+    unknown = [table for table in tables if table not in TABLES]
+    if unknown:
+        print(f"Unknown tables: {', '.join(unknown)}", file=sys.stderr)
+        return 2
+    if args.scale < 1:
+        print("--scale must be at least 1", file=sys.stderr)
+        return 2
+
+    if args.reset:
+        local_db.reset()
+    generator = Generator(args.seed, args.scale)
+    started = time.perf_counter()
+    timings = load(generator, tables)
+    total = sum(count for count, _ in timings.values())
+    print(f"\nloaded {total} rows at scale {args.scale}x (seed {args.seed}) in {time.perf_counter() - started:.1f} s")
+    print(f'TESTSPRITE_COMPANY_ID="{generator.company_ids[0]}"')
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())